@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark contact-list import memory: streamed chunks vs whole-file parsing.
+
+Writes CSV contact lists of increasing size (with ~3% invalid and ~5%
+duplicate rows) and imports each one with import_contacts() reading the file
+as a stream, as the upload endpoint does. For comparison the same file is
+loaded whole and validated as one inline list, the way JSON recipient arrays
+are handled. Peak traced Python memory is reported for both; the streamed
+import should stay flat as the file grows.
+
+Usage: python benchmarks/bench_contact_import.py [--sizes 10000,100000,1000000]
+"""
+import argparse
+import csv
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import insert
+
+from db import init_db, get_db
+from utils import models
+from utils.models import init_models
+from utils.contact_service import import_contacts, iter_csv_rows
+from utils.validation import validate_recipients
+
+def make_app(path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    init_db(app)
+    return app
+
+def write_csv(path, rows, rng):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['email', 'name', 'phone', 'timezone'])
+        for i in range(rows):
+            roll = rng.random()
+            if roll < 0.03:
+                writer.writerow([f'broken{i}@', 'Broken', '', ''])
+            elif roll < 0.08 and i:
+                j = rng.randrange(i)
+                writer.writerow([f'Person{j}@Example.com', f'Person {j}', '', ''])
+            else:
+                writer.writerow([f'person{i}@example.com', f'Person {i}', f'+1415{i:07d}', 'America/New_York'])
+    return os.path.getsize(path)
+
+def streamed(db, path, user_id):
+    with open(path, 'rb') as f:
+        contact_list, _ = import_contacts(user_id, 'bench', iter_csv_rows(f))
+    return contact_list.contact_count
+
+def whole_file(path):
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    result = validate_recipients(rows, key='email')
+    return len(result.valid)
+
+def peak(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak_bytes / 1e6, elapsed, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='10000,100000,1000000')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    app = make_app(os.path.join(workdir, 'contacts.db'))
+    db = get_db()
+    init_models(db)
+    rng = random.Random(7)
+
+    print(f"{'rows':>9s} {'file':>8s} {'streamed peak':>14s} {'time':>7s} {'stored':>9s} {'whole-file peak':>16s} {'time':>7s}")
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(models.User.__table__), [
+            {'id': 1, 'username': 'bench', 'email': 'bench@example.com', 'password_hash': 'x'}
+        ])
+        db.session.commit()
+        for size in [int(s) for s in args.sizes.split(',')]:
+            path = os.path.join(workdir, f'contacts_{size}.csv')
+            file_size = write_csv(path, size, rng)
+            stream_peak, stream_time, stored = peak(lambda: streamed(db, path, 1))
+            db.session.expunge_all()
+            whole_peak, whole_time, _ = peak(lambda: whole_file(path))
+            print(f"{size:9d} {file_size / 1e6:6.1f}MB {stream_peak:12.1f}MB {stream_time:6.1f}s {stored:9d} "
+                  f"{whole_peak:14.1f}MB {whole_time:6.1f}s")
+
+    shutil.rmtree(workdir)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent reads and writes on SQLite with and without the engine tuning.
+
+Each worker is a separate process with its own engine, like a gunicorn
+worker. For --duration seconds every worker loops over a mix of dashboard
+reads (stats rollup plus the recent-activity join) and writes (a new
+distribution, which also updates the stats rollup through the session
+hooks). The "default" mode uses SQLite's rollback journal with
+synchronous=FULL and the driver's 5 s lock timeout, as before the engine
+layer existed; "tuned" uses the configured pragmas (WAL, synchronous=NORMAL,
+busy_timeout, mmap and cache size). Throughput, p95 latency and
+"database is locked" errors are reported per worker count.
+
+Usage: python benchmarks/bench_db_concurrency.py [--workers 1,4,8] [--duration 5] [--write-ratio 0.2]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+
+from db import init_db, get_db
+from utils import models
+from utils.migrations import run_migrations
+from utils.models import init_models
+from utils.stats_service import get_dashboard_stats, get_recent_activity, init_stats_tracking, rebuild_user_stats
+
+USERS = 20
+TEMPLATES = 200
+
+MODES = {
+    # Pragmas set to None are not issued, leaving SQLite's and the driver's defaults
+    'default': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL', 'SQLITE_BUSY_TIMEOUT': None,
+                'SQLITE_MMAP_SIZE': None, 'SQLITE_CACHE_SIZE': None},
+    'tuned': {},
+}
+
+def make_app(path, overrides):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    app.config.update(overrides)
+    init_db(app)
+    return app
+
+def seed(path, mode, distributions):
+    app = make_app(path, MODES[mode])
+    db = get_db()
+    init_models(db)
+    start = datetime(2025, 1, 1)
+    with app.app_context():
+        db.create_all()
+        run_migrations(db)  # adds the query indexes the dashboard relies on
+        with db.engine.begin() as connection:
+            connection.execute(insert(models.User.__table__), [
+                {'id': i, 'username': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': 'x'}
+                for i in range(1, USERS + 1)
+            ])
+            connection.execute(insert(models.Template.__table__), [
+                {'id': i, 'title': f'Template {i}', 'content': '<p>invitation</p>', 'user_id': i % USERS + 1}
+                for i in range(1, TEMPLATES + 1)
+            ])
+            connection.execute(insert(models.Distribution.__table__), [
+                {'template_id': i % TEMPLATES + 1, 'method': 'gmail', 'recipient_count': 5, 'status': 'sent',
+                 'created_at': start + timedelta(seconds=i), 'user_id': i % USERS + 1}
+                for i in range(distributions)
+            ])
+            rebuild_user_stats(connection)
+        db.engine.dispose()
+
+def worker(path, mode, duration, write_ratio, seed_value, results):
+    app = make_app(path, MODES[mode])
+    db = get_db()
+    init_models(db)
+    init_stats_tracking(db)
+    rng = random.Random(seed_value)
+    reads, writes, locked = [], [], 0
+    with app.app_context():
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            user_id = rng.randint(1, USERS)
+            write = rng.random() < write_ratio
+            start = time.perf_counter()
+            try:
+                if write:
+                    db.session.add(models.Distribution(
+                        template_id=rng.randint(1, TEMPLATES), method='gmail', recipient_count=3,
+                        status='sent', user_id=user_id
+                    ))
+                    db.session.commit()
+                else:
+                    get_dashboard_stats(user_id)
+                    get_recent_activity(user_id)
+                    db.session.rollback()
+            except OperationalError as e:
+                db.session.rollback()
+                if 'locked' not in str(e):
+                    raise
+                locked += 1
+                continue
+            (writes if write else reads).append(time.perf_counter() - start)
+    results.put((reads, writes, locked))
+
+def p95(timings):
+    return statistics.quantiles(timings, n=20)[-1] * 1000 if len(timings) > 1 else 0.0
+
+def run(mode, workers, args):
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, f'{mode}.db')
+    context = multiprocessing.get_context('spawn')
+    seeder = context.Process(target=seed, args=(path, mode, args.distributions))
+    seeder.start()
+    seeder.join()
+
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(path, mode, args.duration, args.write_ratio, i, results))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    reads, writes, locked = [], [], 0
+    for _ in processes:
+        r, w, l = results.get()
+        reads += r
+        writes += w
+        locked += l
+    for process in processes:
+        process.join()
+    shutil.rmtree(workdir)
+    return reads, writes, locked
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', default='1,4,8')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per run')
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--distributions', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'workers':>7s} {'mode':8s} {'reads/s':>9s} {'writes/s':>9s} {'read p95':>9s} {'write p95':>10s} {'locked':>7s}")
+    for workers in [int(w) for w in args.workers.split(',')]:
+        for mode in MODES:
+            reads, writes, locked = run(mode, workers, args)
+            print(f"{workers:7d} {mode:8s} {len(reads) / args.duration:9.0f} {len(writes) / args.duration:9.0f} "
+                  f"{p95(reads):7.1f}ms {p95(writes):8.1f}ms {locked:7d}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark the calendar export: streamed ZIP of per-recipient .ics files vs. a buffered archive.
+
+Seeds a distribution with --recipients rows and exports one .ics invite per
+recipient. "streamed" is what the export endpoint sends: recipient rows read
+in batches, each invite rendered from the shared CalendarInvite and zipped
+by iter_zip as chunks are consumed. "buffered" builds the same archive with
+zipfile in a BytesIO from a fully loaded recipient list, the straightforward
+implementation. Each mode is run once for throughput and once under
+tracemalloc for peak Python memory; the streamed peak should stay flat as the
+recipient count grows.
+
+Usage: python benchmarks/bench_ics_export.py [--recipients 100000]
+"""
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from datetime import date, time as meeting_time
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import insert, select
+
+from db import init_db, get_db
+from utils import models
+from utils.models import init_models
+from utils.calendar_service import CalendarInvite, ics_filename, iter_distribution_ics_zip
+
+def make_app(path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    init_db(app)
+    return app
+
+def seed(db, recipients):
+    db.session.execute(insert(models.User.__table__), [
+        {'id': 1, 'username': 'bench', 'email': 'bench@example.com', 'password_hash': 'x'}
+    ])
+    db.session.execute(insert(models.Template.__table__), [{
+        'id': 1, 'title': 'Quarterly Review', 'content': '', 'meeting_topic': 'Quarterly Review',
+        'speaker_name': 'Alex Morgan', 'meeting_date': date(2026, 1, 15), 'meeting_time': meeting_time(10, 0),
+        'duration': '90 minutes', 'location': 'Conference Room 4', 'meeting_link': 'https://meet.example.com/q4-review',
+        'user_id': 1
+    }])
+    db.session.execute(insert(models.Distribution.__table__), [
+        {'id': 1, 'template_id': 1, 'method': 'calendar', 'recipient_count': recipients, 'status': 'sent', 'user_id': 1}
+    ])
+    rows = ({'distribution_id': 1, 'channel': 'email', 'address': f'person{i}@example.com',
+             'name': f'Person {i}' if i % 3 else None, 'status': 'sent', 'attempts': 1} for i in range(recipients))
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == 10000:
+            db.session.execute(insert(models.DistributionRecipient.__table__), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(models.DistributionRecipient.__table__), batch)
+    db.session.commit()
+
+def streamed(invite):
+    total = 0
+    for chunk in iter_distribution_ics_zip(1, invite):
+        total += len(chunk)  # the response writes each chunk out and drops it
+    return total
+
+def buffered(db, invite):
+    table = models.DistributionRecipient.__table__
+    recipients = db.session.execute(
+        select(table.c.address, table.c.name).where(table.c.distribution_id == 1).order_by(table.c.id)
+    ).all()
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for index, (address, name) in enumerate(recipients, 1):
+            archive.writestr(ics_filename(address, index), invite.render_for(address, name))
+    return len(output.getvalue())
+
+def measure(fn):
+    start = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1e6, size
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--recipients', type=int, default=100000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    app = make_app(os.path.join(workdir, 'ics.db'))
+    db = get_db()
+    init_models(db)
+
+    with app.app_context():
+        db.create_all()
+        seed(db, args.recipients)
+        invite = CalendarInvite(db.session.get(models.Template, 1), organizer='organizer@example.com',
+                                timezone='America/New_York')
+        print(f"{args.recipients} recipients, {len(invite.render_for('person1@example.com', 'Person 1'))} bytes per invite")
+        print(f"{'mode':>9s} {'time':>7s} {'invites/sec':>12s} {'archive':>9s} {'peak memory':>12s}")
+        for label, fn in (('streamed', lambda: streamed(invite)), ('buffered', lambda: buffered(db, invite))):
+            elapsed, peak, size = measure(fn)
+            db.session.expunge_all()
+            print(f"{label:>9s} {elapsed:6.1f}s {args.recipients / elapsed:12.0f} {size / 1e6:7.1f}MB {peak:10.1f}MB")
+
+    shutil.rmtree(workdir)
+
+if __name__ == '__main__':
+    main()
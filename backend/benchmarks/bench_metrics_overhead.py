@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost of the metrics hooks on request handling and scraping.
+
+Builds two identical apps on one SQLite database, one with init_metrics()
+installed (METRICS_ENABLED) and one without, and calls a JSON view that runs
+--queries primary-key lookups (an N+1 pattern) through the test client. The
+per-request time of both is reported, along with the overhead per request
+and per SQL statement. Then --series distinct endpoints are recorded and
+render_metrics() is timed, the cost of one Prometheus scrape.
+
+Usage: python benchmarks/bench_metrics_overhead.py [--requests 5000] [--queries 10] [--series 200]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+from sqlalchemy import insert
+
+from db import init_db, get_db
+from utils import models
+from utils.models import init_models
+from utils.metrics import REQUEST_LATENCY, init_metrics, render_metrics
+
+BATCH = 50
+
+def make_app(path, metrics, queries):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    app.config['METRICS_ENABLED'] = metrics
+    db = init_db(app)
+
+    @app.route('/users')
+    def users():
+        return jsonify([db.session.get(models.User, 1 + i % 50).username for i in range(queries)])
+
+    init_metrics(app, db)
+    return app
+
+def per_request(client, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get('/users')
+    return (time.perf_counter() - start) / requests
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=10)
+    parser.add_argument('--series', type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, 'metrics.db')
+    plain = make_app(path, False, args.queries)
+    instrumented = make_app(path, True, args.queries)
+    db = get_db()
+    init_models(db)
+    with plain.app_context():
+        db.create_all()
+        db.session.execute(insert(models.User.__table__), [
+            {'id': i, 'username': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': 'x'} for i in range(1, 51)
+        ])
+        db.session.commit()
+
+    # Alternate small batches so machine noise and drift affect both apps equally
+    clients = {'disabled': plain.test_client(), 'enabled': instrumented.test_client()}
+    timings = {'disabled': [], 'enabled': []}
+    for client in clients.values():
+        per_request(client, 50)
+    for _ in range(args.requests // BATCH):
+        for label, client in clients.items():
+            timings[label].append(per_request(client, BATCH))
+    disabled, enabled = statistics.median(timings['disabled']), statistics.median(timings['enabled'])
+    print(f"{args.queries} queries per request, median of {args.requests // BATCH} batches of {BATCH} requests")
+    print(f"metrics disabled {disabled * 1e6:8.0f}us/request")
+    print(f"metrics enabled  {enabled * 1e6:8.0f}us/request")
+    print(f"overhead         {(enabled - disabled) * 1e6:8.1f}us/request "
+          f"({(enabled - disabled) / disabled * 100:.1f}%), "
+          f"~{(enabled - disabled) / (args.queries + 1) * 1e6:.1f}us per statement")
+
+    for i in range(args.series):
+        for status in ('200', '404'):
+            REQUEST_LATENCY.observe(f'endpoint_{i}', 'GET', status, 0.01 * (i % 7))
+    start = time.perf_counter()
+    for _ in range(20):
+        text = render_metrics()
+    scrape = (time.perf_counter() - start) / 20
+    print(f"scrape of {len(text.splitlines())} lines ({len(text) / 1e3:.0f}KB): {scrape * 1000:.1f}ms")
+
+    shutil.rmtree(workdir)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Profile the CPU cost of building invitation emails.
+
+Builds N messages for a large HTML body three ways: the previous per-recipient
+MIMEMultipart + as_string() construction, send_many() reusing one prepared
+message, and a prepared message with a different (personalized) body per
+recipient. Messages go to a fake pool that only counts bytes, so only message
+construction is measured. CPU seconds per 10k messages are timed without the
+profiler; a second, cProfile'd run lists the functions the time goes to.
+
+Usage: python benchmarks/bench_mime_reuse.py [--messages 10000] [--body-kb 30] [--top 5]
+"""
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import sys
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.email_service import PreparedMessage, send_many, send_prepared
+
+class CountingPool:
+    """Stands in for SMTPConnectionPool; consumes messages without any network I/O"""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def send_batch(self, messages):
+        results = []
+        for _, _, message in messages:
+            self.bytes += len(message)
+            results.append({'success': True, 'refused': {}, 'error': None})
+        return results
+
+def make_body(kb):
+    row = '<tr><td style="padding: 8px; border-bottom: 1px solid #eee;">Agenda item — détails</td></tr>\n'
+    return '<html><body><table>' + row * (kb * 1024 // len(row.encode('utf-8'))) + '</table></body></html>'
+
+def legacy(recipients, body, pool):
+    # The per-recipient construction used before messages were prepared once
+    for recipient in recipients:
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = 'Meeting Invitation'
+        msg['From'] = 'organizer@example.com'
+        msg['To'] = recipient
+        msg.attach(MIMEText(body, 'html', 'utf-8'))
+        pool.send_batch([('organizer@example.com', [recipient], msg.as_string().encode('ascii'))])
+
+def shared(recipients, body, pool):
+    send_many(recipients, body, 'Meeting Invitation', 'organizer@example.com', None, pool=pool)
+
+def personalized(recipients, body, pool):
+    prepared = PreparedMessage(body, 'Meeting Invitation', 'organizer@example.com')
+    send_prepared(prepared, ((r, body.replace('détails', r, 1)) for r in recipients), 'organizer@example.com', None, pool)
+
+def cpu_time(fn, recipients, body):
+    pool = CountingPool()
+    start = time.process_time()
+    fn(recipients, body, pool)
+    return time.process_time() - start, pool.bytes
+
+def profile(fn, recipients, body, top):
+    profiler = cProfile.Profile()
+    profiler.runcall(fn, recipients, body, CountingPool())
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats('tottime').print_stats(top)
+    return out.getvalue()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=10000)
+    parser.add_argument('--body-kb', type=int, default=30)
+    parser.add_argument('--top', type=int, default=5)
+    args = parser.parse_args()
+
+    body = make_body(args.body_kb)
+    recipients = [f'user{i}@example.com' for i in range(args.messages)]
+    per_10k = 10000 / args.messages
+
+    baseline = None
+    for name, fn in (('legacy MIMEMultipart', legacy), ('send_many (shared body)', shared),
+                     ('prepared, personalized', personalized)):
+        cpu, sent = cpu_time(fn, recipients, body)
+        report = profile(fn, recipients, body, args.top)
+        baseline = baseline or cpu
+        print(f"== {name}: {cpu * per_10k:.2f} CPU s per 10k messages "
+              f"({baseline / cpu:.1f}x vs legacy, {sent / 1e6:.0f} MB built)")
+        print('\n'.join(line for line in report.splitlines()[-args.top - 2:] if line.strip()))
+        print()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared OpenAI client, its timeouts and the circuit breaker.
+
+Runs against a local stand-in for the chat completions endpoint that counts
+the TCP connections it accepts:
+
+1. N generations with a new openai.OpenAI client per call (the old
+   behaviour) vs. the shared client from get_openai_client(); the shared
+   client should open one connection and shave the setup cost off each call.
+2. A hung upstream that never answers: the read timeout bounds the call and
+   the fallback template is returned.
+3. A dead upstream answering 503: after OPENAI_BREAKER_THRESHOLD failures the
+   breaker opens and later calls fall back without touching the server,
+   until a probe after the reset timeout.
+
+The latency histograms collected along the way are printed at the end.
+
+Usage: python benchmarks/bench_openai_client.py [--calls 50] [--latency 0.02] [--read-timeout 0.5]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openai
+from flask import Flask
+
+from utils.openai_client import get_circuit_breaker, get_latency_histogram, get_openai_client
+from utils.template_generator import generate_template_content_with_openai
+
+MEETING = {'meetingTopic': 'Sprint Review', 'speakerName': 'Alex Kim', 'date': '2026-03-10', 'time': '15:00'}
+
+def make_handler(latency, status=200):
+    state = {'connections': 0, 'requests': 0}
+    lock = threading.Lock()
+
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            with lock:
+                state['connections'] += 1
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            with lock:
+                state['requests'] += 1
+            time.sleep(latency)
+            if status == 200:
+                payload = json.dumps({
+                    'id': 'cmpl-fake', 'object': 'chat.completion', 'created': 0, 'model': body['model'],
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': '<div>Generated invitation</div>'}}]
+                }).encode()
+            else:
+                payload = json.dumps({'error': {'message': 'unavailable', 'type': 'server_error'}}).encode()
+            try:
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            except OSError:
+                pass  # the client gave up (timeout)
+
+    return StandInHandler, state
+
+def start_server(handler):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def base_url(server):
+    return f'http://127.0.0.1:{server.server_port}/v1'
+
+def run(calls, client_factory=None):
+    start = time.perf_counter()
+    for _ in range(calls):
+        client = client_factory() if client_factory else None
+        generate_template_content_with_openai(MEETING, 'fake', use_cache=False, client=client)
+        if client is not None:
+            client.close()
+    return (time.perf_counter() - start) / calls
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.02, help='stand-in server latency in seconds')
+    parser.add_argument('--read-timeout', type=float, default=0.5)
+    parser.add_argument('--threshold', type=int, default=5)
+    parser.add_argument('--reset-timeout', type=float, default=1.0)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config.update(
+        TEMPLATE_CACHE_ENABLED=False, OPENAI_MAX_RETRIES=0, OPENAI_CONNECT_TIMEOUT=1.0,
+        OPENAI_READ_TIMEOUT=args.read_timeout, OPENAI_BREAKER_THRESHOLD=args.threshold,
+        OPENAI_BREAKER_RESET_TIMEOUT=args.reset_timeout
+    )
+
+    with app.app_context():
+        # 1. Client per call vs. shared client
+        handler, state = make_handler(args.latency)
+        server = start_server(handler)
+        app.config['OPENAI_BASE_URL'] = base_url(server)
+        fresh = run(args.calls, lambda: openai.OpenAI(api_key='fake', base_url=base_url(server), max_retries=0))
+        fresh_connections = state['connections']
+        state['connections'] = 0
+        get_openai_client('fake')  # construction is a one-off cost, kept out of the timing
+        shared = run(args.calls)
+        server.shutdown()
+        print(f"client per call: {fresh * 1000:7.1f} ms/call, {fresh_connections:3d} connections for {args.calls} calls")
+        print(f"shared client:   {shared * 1000:7.1f} ms/call, {state['connections']:3d} connections for {args.calls} calls")
+
+        # 2. Upstream accepts the request but never answers in time
+        handler, state = make_handler(args.read_timeout * 20)
+        server = start_server(handler)
+        app.config['OPENAI_BASE_URL'] = base_url(server)
+        start = time.perf_counter()
+        content = generate_template_content_with_openai(MEETING, 'fake', use_cache=False)
+        hung = time.perf_counter() - start
+        server.shutdown()
+        print(f"\nhung upstream:   fallback after {hung:.2f}s (read timeout {args.read_timeout}s), "
+              f"fallback returned = {not content.startswith('<div>Generated')}")
+
+        # 3. Dead upstream: the breaker opens and stops sending requests
+        get_circuit_breaker().reset()
+        handler, state = make_handler(0, status=503)
+        server = start_server(handler)
+        app.config['OPENAI_BASE_URL'] = base_url(server)
+        timings = []
+        for _ in range(args.calls):
+            start = time.perf_counter()
+            generate_template_content_with_openai(MEETING, 'fake', use_cache=False)
+            timings.append(time.perf_counter() - start)
+        open_requests = state['requests']
+        time.sleep(args.reset_timeout)
+        generate_template_content_with_openai(MEETING, 'fake', use_cache=False)
+        server.shutdown()
+        tripped = timings[args.threshold:]
+        print(f"dead upstream:   {args.calls} calls sent {open_requests} requests; "
+              f"first {args.threshold} took {sum(timings[:args.threshold]) / args.threshold * 1000:.1f} ms each, "
+              f"short-circuited ones {sum(tripped) / max(len(tripped), 1) * 1000:.2f} ms each")
+        print(f"                 probe after {args.reset_timeout}s reset timeout sent {state['requests'] - open_requests} request, "
+              f"breaker {get_circuit_breaker().state}")
+
+    print("\nlatency histograms (count / mean):")
+    for operation, outcomes in get_latency_histogram().snapshot().items():
+        for outcome, series in outcomes.items():
+            mean = series['sum'] / series['count'] * 1000 if series['count'] else 0
+            print(f"  {operation:12s} {outcome:16s} {series['count']:5d} / {mean:8.1f} ms")
+
+if __name__ == '__main__':
+    main()
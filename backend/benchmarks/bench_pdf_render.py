@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF export throughput across render pool sizes.
+
+Renders --count distinct invitations (styled template, one per meeting) to
+PDF with WeasyPrint. "inline" renders them one after another in the calling
+thread, which is what a request worker would do without the pool; each pool
+size then submits the whole batch to a PdfRenderPool and waits for it.
+Pool processes are warmed up first so the one-off WeasyPrint import is not
+counted. Reported are PDFs per second and the median / p95 time from submit
+to finished PDF. Throughput should scale with workers up to the CPU count.
+
+Requires weasyprint (pinned in requirements.txt).
+
+Usage: python benchmarks/bench_pdf_render.py [--count 40] [--workers 1,2,4]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pdf_service import PdfRenderPool, pdf_available, render_pdf
+from utils.template_renderer import render_invitation
+
+def make_documents(count):
+    return [render_invitation({
+        'meetingTopic': f'Quarterly Review {i}',
+        'speakerName': 'Alex Morgan',
+        'date': '2026-01-15',
+        'time': '10:00',
+        'location': f'Conference Room {i % 7}',
+        'agenda': 'Results, roadmap and open questions. ' * (1 + i % 5),
+        'attendees': [f'Attendee {n}' for n in range(3 + i % 10)],
+        'meetingType': ('Team Meeting', 'Training', 'Client Meeting')[i % 3]
+    }) for i in range(count)]
+
+def inline(documents):
+    latencies = []
+    start = time.perf_counter()
+    for html in documents:
+        render_pdf(html)
+        latencies.append(time.perf_counter() - start)
+    return time.perf_counter() - start, latencies
+
+def pooled(documents, workers):
+    pool = PdfRenderPool(workers=workers, max_pending=len(documents))
+    try:
+        # Start every process and import WeasyPrint in it before timing
+        for future in [pool.submit(documents[0]) for _ in range(workers * 2)]:
+            future.result()
+        start = time.perf_counter()
+        futures = [pool.submit(html) for html in documents]
+        latencies = []
+        for future in futures:
+            future.result()
+            latencies.append(time.perf_counter() - start)
+        return time.perf_counter() - start, latencies
+    finally:
+        pool.shutdown()
+
+def report(label, documents, elapsed, latencies):
+    p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1]
+    print(f"{label:>8s} {len(documents) / elapsed:9.1f} {statistics.median(latencies) * 1000:10.0f}ms {p95 * 1000:8.0f}ms {elapsed:7.2f}s")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=40)
+    parser.add_argument('--workers', default='1,2,4')
+    args = parser.parse_args()
+
+    if not pdf_available():
+        sys.exit('weasyprint is not installed (pip install -r requirements.txt)')
+
+    documents = make_documents(args.count)
+    render_pdf(documents[0])  # import WeasyPrint here too
+    print(f"{os.cpu_count()} CPUs, {args.count} documents, {len(render_pdf(documents[0])) / 1e3:.0f}KB per PDF")
+    print(f"{'workers':>8s} {'PDFs/sec':>9s} {'median':>12s} {'p95':>10s} {'total':>8s}")
+    report('inline', documents, *inline(documents))
+    for workers in [int(w) for w in args.workers.split(',')]:
+        report(str(workers), documents, *pooled(documents, workers))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-recipient personalization throughput and memory.
+
+Personalizes one generated invitation for many recipients three ways: the
+precompiled skeleton pipeline used by Gmail jobs, a Jinja2 template compiled
+once and rendered per recipient, and naive per-recipient str.replace calls.
+Each run streams the messages into a sink that only counts bytes, the way
+the sender consumes them; the peak traced memory of the pipeline is shown
+next to that of materializing every message in a list.
+
+Usage: python benchmarks/bench_personalization.py [--recipients 50000]
+"""
+import argparse
+import html
+import os
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import date, datetime, time as dtime
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jinja2 import Environment
+
+from utils.personalization import MeetingContext, PersonalizedTemplate, PLACEHOLDER_PATTERN, get_timezone, personalize
+from utils.template_renderer import render_invitation
+
+Recipient = namedtuple('Recipient', 'id address name timezone')
+Template = namedtuple('Template', 'meeting_date meeting_time meeting_topic meeting_link')
+
+TIMEZONES = [None, 'Europe/Paris', 'America/New_York', 'Asia/Kolkata', 'Australia/Sydney', 'America/Los_Angeles']
+MEETING = {
+    'meetingTopic': 'Quarterly Business Review', 'speakerName': 'Alex Morgan', 'date': '2026-03-10',
+    'time': '09:30', 'duration': '90 minutes', 'location': 'Board Room 4', 'meetingType': 'Review',
+    'priority': 'High', 'agenda': 'Results, pipeline, hiring plan', 'attendees': ['finance@example.com'],
+}
+
+def recipients(count):
+    for i in range(count):
+        yield Recipient(i, f'first.last{i}@example.com', f'Person {i}' if i % 3 else None, TIMEZONES[i % len(TIMEZONES)])
+
+def make_context():
+    template = Template(date(2026, 3, 10), dtime(9, 30), MEETING['meetingTopic'], 'https://meet.example.com/qbr')
+    return MeetingContext.for_template(template, distribution_id=1, timezone='UTC',
+                                       rsvp_url_template='https://example.com/rsvp?d={distribution_id}&r={recipient_id}')
+
+def drain(messages):
+    total = 0
+    for _, body in messages:
+        total += len(body)
+    return total
+
+def skeleton_pipeline(content, count):
+    return personalize(PersonalizedTemplate(content), recipients(count), make_context())
+
+def jinja_pipeline(content, count):
+    # Same placeholders, as Jinja expressions; CSS braces are protected with {% raw %}
+    source = '{% raw %}' + PLACEHOLDER_PATTERN.sub(r'{% endraw %}{{ \1 }}{% raw %}', content) + '{% endraw %}'
+    template = Environment(autoescape=True).from_string(source)
+    start = datetime(2026, 3, 10, 9, 30, tzinfo=get_timezone('UTC'))
+    for recipient in recipients(count):
+        zone = get_timezone(recipient.timezone) or get_timezone('UTC')
+        yield recipient, template.render(
+            recipient_name=recipient.name or recipient.address.split('@')[0],
+            recipient_email=recipient.address,
+            rsvp_link=f'https://example.com/rsvp?d=1&r={recipient.id}',
+            local_time=f"{start.astimezone(zone).strftime('%A, %B %d, %Y at %H:%M')} ({zone.key})"
+        )
+
+def replace_pipeline(content, count):
+    start = datetime(2026, 3, 10, 9, 30, tzinfo=get_timezone('UTC'))
+    for recipient in recipients(count):
+        zone = get_timezone(recipient.timezone) or get_timezone('UTC')
+        body = content
+        body = body.replace('{{recipient_name}}', html.escape(recipient.name or recipient.address.split('@')[0]))
+        body = body.replace('{{recipient_email}}', html.escape(recipient.address))
+        body = body.replace('{{rsvp_link}}', f'https://example.com/rsvp?d=1&amp;r={recipient.id}')
+        body = body.replace('{{local_time}}', f"{start.astimezone(zone).strftime('%A, %B %d, %Y at %H:%M')} ({zone.key})")
+        yield recipient, body
+
+def peak_memory(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--recipients', type=int, default=50000)
+    args = parser.parse_args()
+
+    content = PersonalizedTemplate(render_invitation(MEETING, 'styled'), inject=True).content
+    print(f"template: {len(content)} chars, {len(PLACEHOLDER_PATTERN.findall(content))} placeholders, "
+          f"{args.recipients} recipients")
+
+    for name, pipeline in (('skeleton', skeleton_pipeline), ('jinja2', jinja_pipeline), ('str.replace', replace_pipeline)):
+        start = time.perf_counter()
+        total = drain(pipeline(content, args.recipients))
+        elapsed = time.perf_counter() - start
+        print(f"{name:12s} {args.recipients / elapsed:10.0f} messages/s  ({total / elapsed / 1e6:.0f} MB/s of HTML)")
+
+    streamed = peak_memory(lambda: drain(skeleton_pipeline(content, args.recipients)))
+    materialized = peak_memory(lambda: list(skeleton_pipeline(content, args.recipients)))
+    print(f"peak memory: streamed {streamed:.1f} MB, materialized list {materialized:.1f} MB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmark the user-scoped queries with and without the composite indexes.
+
+Seeds a throwaway SQLite database with users, templates, distributions and
+distribution jobs, then times the queries behind each endpoint twice: once
+with only the primary keys, and once after migration 4 created the indexes
+in QUERY_INDEXES. The SQLite query plan of each query is printed alongside.
+
+Usage: python benchmarks/bench_query_indexes.py [--distributions 1000000] [--users 1000] [--repeat 50]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import and_, insert, or_
+
+from db import init_db
+from utils import models
+from utils.models import init_models
+from utils.migrations import create_query_indexes, drop_query_indexes
+from utils.stats_service import get_recent_activity, _aggregate_user_stats
+
+SEED_BATCH = 20000
+
+def seed(db, users, templates_per_user, distributions, jobs):
+    """Bulk insert synthetic rows with Core executemany"""
+    start = datetime(2025, 1, 1)
+    with db.engine.begin() as connection:
+        connection.execute(insert(models.User.__table__), [
+            {'id': i, 'username': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': 'x', 'created_at': start}
+            for i in range(1, users + 1)
+        ])
+        template_count = users * templates_per_user
+        connection.execute(insert(models.Template.__table__), [
+            {'id': i, 'title': f'Template {i}', 'content': '<p>invitation</p>', 'meeting_topic': f'Topic {i}',
+             'user_id': (i % users) + 1, 'created_at': start + timedelta(minutes=i)}
+            for i in range(1, template_count + 1)
+        ])
+
+        methods = ('gmail', 'gmail', 'whatsapp', 'calendar')
+        statuses = ('sent', 'sent', 'sent', 'failed', 'pending')
+        for offset in range(0, distributions, SEED_BATCH):
+            connection.execute(insert(models.Distribution.__table__), [{
+                'id': i,
+                'template_id': (i % template_count) + 1,
+                'method': methods[i % len(methods)],
+                'recipient_count': i % 7 + 1,
+                'status': statuses[i % len(statuses)],
+                'created_at': start + timedelta(seconds=i * 30),
+                'user_id': (i % users) + 1
+            } for i in range(offset + 1, min(offset + SEED_BATCH, distributions) + 1)])
+
+        for offset in range(0, jobs, SEED_BATCH):
+            connection.execute(insert(models.DistributionJob.__table__), [{
+                'id': f'job-{i}',
+                'distribution_id': i,
+                'kind': 'gmail',
+                'status': 'queued' if i > jobs - 5 else 'completed',
+                'created_at': start + timedelta(seconds=i * 30),
+                'user_id': (i % users) + 1
+            } for i in range(offset + 1, min(offset + SEED_BATCH, jobs) + 1)])
+
+def endpoint_queries(db):
+    """(name, fn(user_id), sql for EXPLAIN) for each hot query"""
+    Template = models.Template
+    Distribution = models.Distribution
+    DistributionJob = models.DistributionJob
+
+    def distribution_page(user_id):
+        return Template.query.filter_by(user_id=user_id).order_by(Template.created_at.desc()).all()
+
+    def sent_count(user_id):
+        return Distribution.query.filter_by(user_id=user_id, status='sent').count()
+
+    def recent_activity(user_id):
+        return get_recent_activity(user_id)
+
+    def stats_rebuild(user_id):
+        return _aggregate_user_stats(db.session.connection(), user_id)
+
+    def job_claim(user_id):
+        return DistributionJob.query.filter(or_(
+            DistributionJob.status == 'queued',
+            and_(DistributionJob.status == 'running', DistributionJob.heartbeat_at < datetime.utcnow())
+        )).order_by(DistributionJob.created_at).first()
+
+    return [
+        ('distribution page templates', distribution_page,
+         'SELECT * FROM template WHERE user_id = 1 ORDER BY created_at DESC'),
+        ('sent distributions count', sent_count,
+         "SELECT count(*) FROM distribution WHERE user_id = 1 AND status = 'sent'"),
+        ('dashboard recent activity', recent_activity,
+         'SELECT * FROM distribution WHERE user_id = 1 ORDER BY created_at DESC LIMIT 5'),
+        ('stats rebuild (one user)', stats_rebuild,
+         "SELECT count(*), sum(recipient_count) FROM distribution WHERE user_id = 1 GROUP BY user_id"),
+        ('job worker claim', job_claim,
+         "SELECT * FROM distribution_job WHERE status = 'queued' OR (status = 'running' AND heartbeat_at < 0)"
+         " ORDER BY created_at LIMIT 1"),
+    ]
+
+def measure(db, queries, users, repeat):
+    results = {}
+    for name, fn, sql in queries:
+        timings = []
+        for _ in range(repeat):
+            user_id = random.randint(1, users)
+            start = time.perf_counter()
+            fn(user_id)
+            timings.append(time.perf_counter() - start)
+            db.session.rollback()
+        results[name] = statistics.median(timings) * 1000
+    return results
+
+def query_plans(path, queries):
+    # A fresh connection, so no cached statement hides a schema change
+    connection = sqlite3.connect(path)
+    plans = {
+        name: '; '.join(row[-1] for row in connection.execute(f'EXPLAIN QUERY PLAN {sql}'))
+        for name, _, sql in queries
+    }
+    connection.close()
+    return plans
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--distributions', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--templates-per-user', type=int, default=20)
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_indexes.db')
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    db = init_db(app)
+    init_models(db)
+
+    with app.app_context():
+        db.create_all()
+        start = time.perf_counter()
+        seed(db, args.users, args.templates_per_user, args.distributions, min(args.jobs, args.distributions))
+        print(f"seeded {args.distributions} distributions in {time.perf_counter() - start:.1f}s ({path})")
+
+        queries = endpoint_queries(db)
+        with db.engine.begin() as connection:
+            drop_query_indexes(connection)
+        without = measure(db, queries, args.users, args.repeat)
+        plans_without = query_plans(path, queries)
+
+        start = time.perf_counter()
+        with db.engine.begin() as connection:
+            create_query_indexes(connection)
+        print(f"created indexes in {time.perf_counter() - start:.1f}s")
+        with_indexes = measure(db, queries, args.users, args.repeat)
+        plans_with = query_plans(path, queries)
+
+    print(f"\n{'query':30s} {'no index':>12s} {'indexed':>12s} {'speedup':>9s}")
+    for name, _, _ in queries:
+        before, after = without[name], with_indexes[name]
+        print(f"{name:30s} {before:10.2f}ms {after:10.2f}ms {before / after:8.1f}x")
+    print()
+    for name, _, _ in queries:
+        print(f"{name}:\n  without: {plans_without[name]}\n  with:    {plans_with[name]}")
+
+    os.remove(path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk recipient validation on pasted contact lists.
+
+Generates email and phone lists with messy whitespace, mixed-case domains,
+about 5% malformed entries and 10% duplicates, then validates them the
+previous way (one uncompiled re.match / re.sub call per entry, no
+normalization or de-duplication) and with the one-pass bulk validators.
+The per-entry column does the same normalization and de-duplication with
+one normalize_email/normalize_phone call per entry. An MX check through
+MXCache with a fake 5ms resolver shows the cost of the hook when most
+domains repeat. Timings are the best of --repeat runs.
+
+Usage: python benchmarks/bench_recipient_validation.py [--sizes 1000,100000,1000000] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.validation import MXCache, normalize_email, normalize_phone, validate_emails, validate_phones
+
+DOMAINS = ['example.com', 'Example.COM', 'mail.example.org', 'corp.example.net', 'gmail.com', 'Outlook.com']
+
+def legacy_validate_email(email):
+    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    return re.match(pattern, email) is not None
+
+def legacy_validate_phone(phone):
+    digits_only = re.sub(r'\D', '', phone)
+    return 7 <= len(digits_only) <= 15
+
+def make_emails(count, rng):
+    emails = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.05:
+            emails.append(f'broken{i}@@example')
+        elif roll < 0.15 and emails:
+            emails.append(rng.choice(emails).upper())
+        else:
+            emails.append(f'  first.last{i}@{rng.choice(DOMAINS)} ' if i % 7 == 0 else f'user{i}@{rng.choice(DOMAINS)}')
+    return emails
+
+def make_phones(count, rng):
+    phones = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.05:
+            phones.append(f'call me {i}')
+        elif roll < 0.15 and phones:
+            phones.append(rng.choice(phones))
+        else:
+            number = 4155550000 + i
+            phones.append(f'+1 ({str(number)[:3]}) {str(number)[3:6]}-{str(number)[6:]}' if i % 2 else f'+1{number}')
+    return phones
+
+def per_entry(values, normalize):
+    valid, invalid, duplicates, seen = [], [], [], set()
+    for value in values:
+        normalized = normalize(value)
+        if normalized is None:
+            invalid.append(value)
+        elif normalized.lower() in seen:
+            duplicates.append(value)
+        else:
+            seen.add(normalized.lower())
+            valid.append(normalized)
+    return valid, invalid, duplicates
+
+def timed(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='1000,100000,1000000')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    rng = random.Random(42)
+    mx_check = MXCache(resolver=lambda domain: (time.sleep(0.005), True)[1])
+    repeat = args.repeat
+
+    print(f"{'size':>9s} {'kind':6s} {'legacy':>9s} {'per-entry':>10s} {'bulk':>9s} {'bulk+MX':>9s} "
+          f"{'valid':>9s} {'invalid':>8s} {'dupes':>8s}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        emails = make_emails(size, rng)
+        phones = make_phones(size, rng)
+
+        legacy, _ = timed(lambda: [e for e in emails if legacy_validate_email(e)], repeat)
+        entry, _ = timed(lambda: per_entry(emails, normalize_email), repeat)
+        bulk, result = timed(lambda: validate_emails(emails), repeat)
+        with_mx, _ = timed(lambda: validate_emails(emails, mx_check=mx_check), 1)
+        print(f"{size:9d} {'email':6s} {legacy * 1e3:7.0f}ms {entry * 1e3:8.0f}ms {bulk * 1e3:7.0f}ms {with_mx * 1e3:7.0f}ms "
+              f"{len(result.valid):9d} {len(result.invalid):8d} {len(result.duplicates):8d}")
+
+        legacy, _ = timed(lambda: [p for p in phones if legacy_validate_phone(p)], repeat)
+        entry, _ = timed(lambda: per_entry(phones, normalize_phone), repeat)
+        bulk, result = timed(lambda: validate_phones(phones), repeat)
+        print(f"{size:9d} {'phone':6s} {legacy * 1e3:7.0f}ms {entry * 1e3:8.0f}ms {bulk * 1e3:7.0f}ms {'-':>9s} "
+              f"{len(result.valid):9d} {len(result.invalid):8d} {len(result.duplicates):8d}")
+    print("\nlegacy = format check only; per-entry and bulk also strip, case-fold domains, canonicalize to E.164 and de-duplicate")
+
+if __name__ == '__main__':
+    main()
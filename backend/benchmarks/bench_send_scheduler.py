@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark the send scheduler against fake providers: throughput versus limit.
+
+A fake provider sleeps for a jittered latency per send and fails a share of
+sends with transient (retried) or permanent (dead-lettered) errors. For each
+configured rate limit the scheduler sends N messages; the achieved rate is
+compared with the limit, next to the retries and dead letters it produced.
+The unlimited row shows the ceiling set by concurrency and provider latency.
+
+Usage: python benchmarks/bench_send_scheduler.py [--messages 2000] [--concurrency 8] [--latency-ms 20]
+                                                 [--transient 0.05] [--permanent 0.01] [--limits 50,100,200,400]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.send_scheduler import PermanentSendError, SendScheduler, TokenBucket, TransientSendError
+
+class FakeProvider:
+    """Injects latency and errors; counts provider calls"""
+
+    def __init__(self, latency, transient, permanent, seed=0):
+        self.latency = latency
+        self.transient = transient
+        self.permanent = permanent
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def send(self, payload):
+        with self._lock:
+            self.calls += 1
+            roll = self._rng.random()
+            latency = self.latency * self._rng.uniform(0.5, 1.5)
+        time.sleep(latency)
+        if roll < self.permanent:
+            raise PermanentSendError('550 no such user')
+        if roll < self.permanent + self.transient:
+            raise TransientSendError('451 try again later')
+        return {'message_id': payload}
+
+def run(limit, args):
+    provider = FakeProvider(args.latency_ms / 1000, args.transient, args.permanent)
+    scheduler = SendScheduler(
+        provider.send,
+        limiter=TokenBucket(limit, args.burst) if limit else None,
+        concurrency=args.concurrency,
+        max_attempts=args.max_attempts,
+        backoff_base=args.backoff_ms / 1000,
+        backoff_max=1.0
+    )
+    start = time.perf_counter()
+    results = list(scheduler.run((i, i) for i in range(args.messages)))
+    elapsed = time.perf_counter() - start
+    return {
+        'rate': provider.calls / elapsed,
+        'delivered': sum(1 for r in results if r.success) / elapsed,
+        'retries': provider.calls - len(results),
+        'dead': sum(1 for r in results if not r.success),
+        'elapsed': elapsed
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--transient', type=float, default=0.05)
+    parser.add_argument('--permanent', type=float, default=0.01)
+    parser.add_argument('--limits', default='50,100,200,400')
+    parser.add_argument('--burst', type=int, default=10)
+    parser.add_argument('--max-attempts', type=int, default=4)
+    parser.add_argument('--backoff-ms', type=float, default=50)
+    args = parser.parse_args()
+
+    print(f"{args.messages} messages, concurrency {args.concurrency}, latency {args.latency_ms:.0f}ms, "
+          f"{args.transient:.0%} transient / {args.permanent:.0%} permanent errors")
+    print(f"\n{'limit/s':>8s} {'calls/s':>9s} {'of limit':>9s} {'delivered/s':>12s} {'retries':>8s} {'dead':>5s} {'time':>7s}")
+    for limit in [float(l) for l in args.limits.split(',')] + [0]:
+        r = run(limit, args)
+        share = f"{r['rate'] / limit:8.0%}" if limit else f"{'-':>8s}"
+        label = f"{limit:8.0f}" if limit else f"{'none':>8s}"
+        print(f"{label} {r['rate']:9.0f} {share} {r['delivered']:12.0f} {r['retries']:8d} {r['dead']:5d} {r['elapsed']:6.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark pooled SMTP sending against a local aiosmtpd stand-in.
+
+Compares the old connect/send/quit-per-message approach with the shared
+connection pool and reports messages per second for each recipient count.
+
+Requires aiosmtpd (pip install aiosmtpd).
+
+Usage: python benchmarks/bench_smtp_pool.py [--counts 1,100,10000] [--pool-size 4]
+"""
+import argparse
+import os
+import smtplib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Sink
+
+from utils.smtp_pool import SMTPConnectionPool
+
+MESSAGE = "Subject: Meeting Invitation\r\nContent-Type: text/html; charset=utf-8\r\n\r\n" + "<p>Hello</p>\r\n" * 200
+
+def send_unpooled(host, port, recipients):
+    """One TCP connection and SMTP session per message (previous behaviour)"""
+    for email in recipients:
+        server = smtplib.SMTP(host, port)
+        server.sendmail('bench@smartmeeting.ai', email, MESSAGE)
+        server.quit()
+
+def send_pooled(pool, recipients, workers):
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda email: pool.sendmail('bench@smartmeeting.ai', email, MESSAGE), recipients))
+
+def send_batched(pool, recipients):
+    pool.send_batch(('bench@smartmeeting.ai', email, MESSAGE) for email in recipients)
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--counts', default='1,100,10000')
+    parser.add_argument('--pool-size', type=int, default=4)
+    parser.add_argument('--skip-unpooled-above', type=int, default=10000)
+    args = parser.parse_args()
+
+    controller = Controller(Sink(), hostname='127.0.0.1', port=8025)
+    controller.start()
+    try:
+        for count in [int(c) for c in args.counts.split(',')]:
+            recipients = [f'user{i}@example.com' for i in range(count)]
+            print(f"\n{count} recipient(s)")
+
+            if count <= args.skip_unpooled_above:
+                elapsed = timed(send_unpooled, controller.hostname, controller.port, recipients)
+                print(f"  connection per message: {count / elapsed:10.1f} msg/s")
+
+            pool = SMTPConnectionPool(controller.hostname, controller.port, use_tls=False,
+                                      size=args.pool_size, max_messages=0)
+            elapsed = timed(send_pooled, pool, recipients, args.pool_size)
+            print(f"  pooled ({args.pool_size} sessions):   {count / elapsed:10.1f} msg/s")
+            pool.close()
+
+            pool = SMTPConnectionPool(controller.hostname, controller.port, use_tls=False,
+                                      size=1, max_messages=0)
+            elapsed = timed(send_batched, pool, recipients)
+            print(f"  batched (1 session):    {count / elapsed:10.1f} msg/s")
+            pool.close()
+    finally:
+        controller.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold start: time to import main and to serve the first request.
+
+Each run is a fresh interpreter, as for a newly forked gunicorn worker. The
+database is initialized once beforehand (as `flask --app main init-db` does
+at deploy time), then every run imports main and sends a first request
+through the test client. The "eager" mode also imports the OpenAI SDK and
+the mail/HTTP modules and creates the schema during import, which is what
+startup cost before those were deferred.
+
+The slowest modules from `python -X importtime -c "import main"` are listed
+at the end.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--top 12]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RUN = r'''
+import json, sys, time
+start = time.perf_counter()
+if sys.argv[1] == 'eager':
+    import openai, requests, smtplib, email.mime.multipart
+    import utils.email_service, utils.whatsapp_service
+import main
+if sys.argv[1] == 'eager':
+    with main.app.app_context():
+        main.init_database()
+imported = time.perf_counter()
+client = main.app.test_client()
+status = client.get('/api/health').status_code
+first_request = time.perf_counter()
+print(json.dumps({'import': imported - start, 'first_request': first_request - start, 'status': status}))
+'''
+
+def run(mode, env):
+    output = subprocess.run(
+        [sys.executable, '-c', RUN, mode], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def import_profile(env, top):
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        if line.endswith('| site'):
+            modules = []  # interpreter startup (site and its .pth hooks), not caused by main
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((int(cumulative_us), int(self_us), name[1:].rstrip()))  # drop the space after '|'
+    # Only top-level imports made by main itself (two spaces of nesting)
+    direct = [m for m in modules if m[2].startswith('  ') and not m[2].startswith('   ')]
+    return sorted(direct, reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=12)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'startup.db')}",
+               TEMPLATE_CACHE_PATH=os.path.join(workdir, 'template_cache.db'))
+    subprocess.run([sys.executable, 'init_db.py'], cwd=BACKEND_DIR, env=env, capture_output=True, check=True)
+
+    print(f"{'mode':8s} {'import main':>12s} {'first request':>14s}   (median of {args.runs} fresh processes)")
+    for mode in ('lazy', 'eager'):
+        results = [run(mode, env) for _ in range(args.runs)]
+        assert all(r['status'] == 200 for r in results)
+        print(f"{mode:8s} {statistics.median(r['import'] for r in results) * 1000:10.0f}ms "
+              f"{statistics.median(r['first_request'] for r in results) * 1000:12.0f}ms")
+
+    print("\nslowest imports made by main (python -X importtime):")
+    print(f"{'cumulative':>11s} {'self':>8s}  module")
+    for cumulative, self_us, name in import_profile(env, args.top):
+        print(f"{cumulative / 1000:9.1f}ms {self_us / 1000:6.1f}ms  {name.strip()}")
+
+    shutil.rmtree(workdir)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch template generation against a fake OpenAI server.
+
+The server answers chat completions after an injected latency (uniform
+between --latency and --latency * 2, so one meeting is always the slowest).
+A recurring series of N meetings, with every fifth one repeated, is
+generated one call after another, as N calls to /api/templates/generate
+would, and then with generate_templates_batch(). The batch should finish in
+about the latency of its slowest call and make one call per distinct meeting.
+A last run makes the server fail every third request to check that those
+meetings still get a fallback template.
+
+Usage: python benchmarks/bench_template_batch.py [--sizes 5,20,50] [--latency 0.5] [--workers 8]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openai
+
+from utils.template_generator import generate_template_content_with_openai, generate_templates_batch
+
+def make_handler(latency, fail_every=None):
+    state = {'calls': 0}
+    lock = threading.Lock()
+    rng = random.Random(3)
+
+    class FakeOpenAIHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            with lock:
+                state['calls'] += 1
+                call = state['calls']
+                delay = latency * (1 + rng.random())
+            time.sleep(delay)
+            if fail_every and call % fail_every == 0:
+                payload = json.dumps({'error': {'message': 'overloaded', 'type': 'server_error'}}).encode()
+                self.send_response(500)
+            else:
+                content = '<div>' + body['messages'][-1]['content'][:200] + '</div>'
+                payload = json.dumps({
+                    'id': 'cmpl-fake', 'object': 'chat.completion', 'created': 0, 'model': body['model'],
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': content}}]
+                }).encode()
+                self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return FakeOpenAIHandler, state
+
+def start_server(handler):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def make_series(count):
+    meetings = []
+    for i in range(count):
+        week = i - 1 if i % 5 == 4 else i  # every fifth meeting repeats the one before it
+        meetings.append({
+            'meetingTopic': 'Weekly Standup', 'speakerName': 'Riley Chen',
+            'date': f'2026-{1 + week // 28:02d}-{1 + week % 28:02d}', 'time': '09:30',
+            'duration': '30 minutes', 'meetingType': 'Standup'
+        })
+    return meetings
+
+def client_for(server):
+    return openai.OpenAI(api_key='fake', base_url=f'http://127.0.0.1:{server.server_port}/v1', max_retries=0)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='5,20,50')
+    parser.add_argument('--latency', type=float, default=0.5, help='minimum fake API latency in seconds')
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'meetings':>8s} {'distinct':>8s} {'sequential':>11s} {'calls':>6s} {'batch':>8s} {'calls':>6s} {'speedup':>8s}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        meetings = make_series(size)
+
+        handler, state = make_handler(args.latency)
+        server = start_server(handler)
+        client = client_for(server)
+        start = time.perf_counter()
+        for meeting in meetings:
+            generate_template_content_with_openai(meeting, 'fake', use_cache=False, client=client)
+        sequential = time.perf_counter() - start
+        sequential_calls = state['calls']
+
+        state['calls'] = 0
+        start = time.perf_counter()
+        contents = generate_templates_batch(meetings, 'fake', use_cache=False, client=client, max_workers=args.workers)
+        batch = time.perf_counter() - start
+        server.shutdown()
+        assert len(contents) == size
+
+        print(f"{size:8d} {state['calls']:8d} {sequential:10.2f}s {sequential_calls:6d} {batch:7.2f}s {state['calls']:6d} "
+              f"{sequential / batch:7.1f}x")
+
+    # Every third call fails; those meetings fall back, the others keep their generated HTML
+    meetings = make_series(12)
+    handler, state = make_handler(args.latency / 5, fail_every=3)
+    server = start_server(handler)
+    contents = generate_templates_batch(meetings, 'fake', use_cache=False, client=client_for(server), max_workers=args.workers)
+    server.shutdown()
+    generated = sum(content.startswith('<div>') for content in contents)
+    print(f"\nfailing server: {len(contents)} templates returned, {generated} generated, {len(contents) - generated} fallbacks")
+    print(f"slowest single call is at most {args.latency * 2:.2f}s; batches above --workers distinct meetings run in waves")
+
+if __name__ == '__main__':
+    main()
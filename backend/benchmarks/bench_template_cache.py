@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark the template generation cache with a stub OpenAI client.
+
+Reports the latency of a cold generation (stubbed API call), a repeat hit
+served from the in-process LRU tier and a hit served from the SQLite tier.
+
+Usage: python benchmarks/bench_template_cache.py [--latency 0.5] [--repeats 1000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from utils import template_generator
+from utils.template_generator import generate_template_content_with_openai, get_template_cache
+
+MEETING = {
+    'meetingTopic': 'Quarterly Planning',
+    'speakerName': 'Jordan Lee',
+    'date': '2026-01-15',
+    'time': '10:00',
+    'duration': '1 hour',
+    'meetingType': 'Planning',
+    'priority': 'High',
+    'attendees': ['a@example.com', 'b@example.com'],
+}
+
+class StubOpenAIClient:
+    """Mimics client.chat.completions.create with a fixed latency"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        content = '<html><body>' + '<p>Generated invitation</p>' * 500 + '</body></html>'
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+def mean_us(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=0.5, help='stubbed API latency in seconds')
+    parser.add_argument('--repeats', type=int, default=1000)
+    args = parser.parse_args()
+
+    client = StubOpenAIClient(args.latency)
+    app = Flask(__name__)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app.config['TEMPLATE_CACHE_PATH'] = os.path.join(tmp, 'template_cache.db')
+        template_generator._template_cache = None
+
+        with app.app_context():
+            generate = lambda: generate_template_content_with_openai(MEETING, 'stub-key', client=client)
+            cache = get_template_cache()
+
+            cold = mean_us(generate, 1)
+            memory = mean_us(generate, args.repeats)
+
+            def disk_hit():
+                cache.clear_memory()
+                generate()
+            disk = mean_us(disk_hit, args.repeats)
+
+            uncached = mean_us(lambda: generate_template_content_with_openai(
+                MEETING, 'stub-key', use_cache=False, client=client), 3)
+
+            print(f"cold generation:    {cold / 1000:10.2f} ms")
+            print(f"opt-out (useCache): {uncached / 1000:10.2f} ms")
+            print(f"memory tier hit:    {memory:10.2f} us")
+            print(f"disk tier hit:      {disk:10.2f} us")
+            print(f"stub API calls:     {client.calls}")
+            print(f"cache stats:        {cache.stats()}")
+            cache.close()
+
+if __name__ == '__main__':
+    main()
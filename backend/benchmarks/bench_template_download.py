@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark template downloads: render-per-request vs. cached export artifacts.
+
+Creates a template with a --size KB body and downloads it through the test
+client. "legacy" rebuilds the HTML document with an f-string and
+datetime.now() and sends it from a BytesIO on every request, as the
+endpoint used to. The artifact endpoint is timed for its first download
+(renders and writes the artifact), repeat downloads (file streamed from
+disk) and conditional requests answered with 304 Not Modified.
+
+Usage: python benchmarks/bench_template_download.py [--size 200] [--repeats 300]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORKDIR = tempfile.mkdtemp()
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(WORKDIR, 'download.db')}",
+    EXPORT_DIR=os.path.join(WORKDIR, 'exports'),
+    TEMPLATE_CACHE_ENABLED='false'
+)
+
+from datetime import datetime
+from flask import send_file
+
+import main
+from utils.export_service import get_export_artifact
+
+STYLE = 'body { font-family: Arial, sans-serif; margin: 20px; line-height: 1.6; }\n' * 40
+
+def legacy_document(template):
+    return f"""
+        <!DOCTYPE html><html><head><meta charset="UTF-8"><title>{template.title}</title>
+        <style>{STYLE}</style></head><body><div class="container">{template.content}
+        <div class="footer"><p>Generated by SmartMeetingAI</p>
+        <p>Date: {datetime.now().strftime('%B %d, %Y')}</p></div></div></body></html>
+        """.encode('utf-8')
+
+@main.app.route('/bench/legacy/<int:template_id>')
+def legacy_download(template_id):
+    template = main.db.session.get(main.Template, template_id)
+    return send_file(BytesIO(legacy_document(template)), mimetype='text/html', as_attachment=True,
+                     download_name=f"{template.title.replace(' ', '_')}_meeting_invitation.html")
+
+def mean_us(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+def handler_us(work, template_id, repeats):
+    """Cost of the endpoint's own work, without the request/session overhead of the test client"""
+    with main.app.test_request_context():
+        def run():
+            main.db.session.expire_all()
+            work(main.db.session.get(main.Template, template_id))
+        return mean_us(run, repeats)
+
+def main_():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=200, help='template body size in KB')
+    parser.add_argument('--repeats', type=int, default=300)
+    args = parser.parse_args()
+
+    with main.app.app_context():
+        main.init_database()
+        user = main.User.query.first()
+        template = main.Template(title='Quarterly Planning', meeting_topic='Quarterly Planning', user_id=user.id)
+        template.content = '<div>' + '<p>Agenda item with details for the meeting.</p>' * (args.size * 1024 // 45) + '</div>'
+        main.db.session.add(template)
+        main.db.session.commit()
+        template_id = template.id
+        email = user.email
+
+    client = main.app.test_client()
+    client.post('/auth', json={'action': 'login', 'email': email, 'password': 'demo123'})
+    url = f'/api/templates/{template_id}/download'
+    exports = os.environ['EXPORT_DIR']
+
+    def first_download():
+        shutil.rmtree(exports, ignore_errors=True)
+        return client.get(url).data
+
+    response = client.get(url)
+    etag = response.headers['ETag']
+    rows = [
+        ('legacy render per request', lambda: client.get(f'/bench/legacy/{template_id}').data,
+         lambda t: legacy_document(t), len(response.data)),
+        ('artifact, first download', first_download,
+         lambda t: (shutil.rmtree(exports, ignore_errors=True), get_export_artifact(t)), len(response.data)),
+        ('artifact, repeat download', lambda: client.get(url).data, get_export_artifact, len(response.data)),
+        ('artifact, 304 revalidate', lambda: client.get(url, headers={'If-None-Match': etag}).status_code,
+         get_export_artifact, 0),
+    ]
+    stable = client.get(url).data == response.data
+
+    print(f"document size: {len(response.data) / 1024:.0f} KB, byte-stable across downloads: {stable}")
+    print(f"{'':28s} {'request':>10s} {'handler work':>13s} {'body sent':>10s}")
+    for name, request, work, sent in rows:
+        repeats = args.repeats if 'first' not in name else max(args.repeats // 10, 1)
+        print(f"{name:28s} {mean_us(request, repeats):8.0f}us {handler_us(work, template_id, repeats):11.0f}us "
+              f"{sent / 1024:8.0f}KB")
+    shutil.rmtree(WORKDIR)
+
+if __name__ == '__main__':
+    main_()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark the fallback invitation renderer.
+
+Reports renders per second for the invitation layouts precompiled from the
+Jinja2 templates, one at a time and through the batch API. Pass --baseline-ref with a git revision from
+before the renderer existed (e.g. the commit preceding it) to also measure the
+old f-string implementation loaded straight from git history.
+
+Usage: python benchmarks/bench_template_renderer.py [--count 5000] [--baseline-ref <rev>]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import types
+
+# Add the backend directory to Python path
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from utils.template_renderer import render_invitation, render_invitations
+
+MEETING = {
+    'meetingTopic': 'Quarterly Business Review',
+    'speakerName': 'Alex Morgan',
+    'date': '2026-03-10',
+    'time': '09:30',
+    'duration': '90 minutes',
+    'location': 'Board Room 4',
+    'meetingLink': 'https://meet.example.com/qbr',
+    'meetingType': 'Review',
+    'priority': 'High',
+    'agenda': 'Results, pipeline, hiring plan',
+    'attendees': ['finance@example.com', 'sales@example.com', 'ops@example.com'],
+    'additionalNotes': 'Please bring Q1 numbers',
+}
+
+def rate(fn, count):
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+def load_baseline(ref):
+    """Import utils/template_generator.py as it was at a git revision"""
+    source = subprocess.check_output(
+        ['git', 'show', f'{ref}:backend/utils/template_generator.py'], cwd=BACKEND_DIR
+    )
+    module = types.ModuleType('baseline_template_generator')
+    exec(compile(source, f'{ref}:template_generator.py', 'exec'), module.__dict__)
+    return module
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=5000)
+    parser.add_argument('--baseline-ref')
+    args = parser.parse_args()
+
+    # Warm the template compilation so only rendering is measured
+    render_invitation(MEETING, 'styled')
+
+    for style in ('styled', 'basic'):
+        single = rate(lambda: [render_invitation(MEETING, style) for _ in range(args.count)], args.count)
+        batch = rate(lambda: render_invitations([MEETING] * args.count, style), args.count)
+        print(f"{style:7s} compiled single: {single:10.0f} renders/s   batch: {batch:10.0f} renders/s")
+
+    if args.baseline_ref:
+        baseline = load_baseline(args.baseline_ref)
+        old_basic = rate(lambda: [baseline.generate_fallback_template(MEETING) for _ in range(args.count)], args.count)
+        print(f"basic   f-string ({args.baseline_ref}): {old_basic:10.0f} renders/s")
+        if hasattr(baseline, 'generate_styled_fallback_template'):
+            old_styled = rate(lambda: [baseline.generate_styled_fallback_template(MEETING) for _ in range(args.count)], args.count)
+            print(f"styled  f-string ({args.baseline_ref}): {old_styled:10.0f} renders/s")
+    else:
+        print("pass --baseline-ref <rev> to compare with the previous f-string renderer")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark template storage: inline HTML rows vs compressed TemplateBody rows.
+
+Seeds a SQLite database with templates whose HTML is stored inline in the
+template row (the legacy layout), copies it, and runs migration 5 on the copy
+to move the bodies into compressed template_body rows. Both files are
+vacuumed and compared by size, then the common template reads are timed on
+each: the ownership-check lookup, a listing page and loading the HTML.
+
+Usage: python benchmarks/bench_template_storage.py [--templates 20000] [--codec zlib] [--repeat 500]
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import insert, select, text
+
+from db import init_db, get_db
+from utils import models
+from utils.models import init_models
+from utils.migrations import create_query_indexes, move_template_bodies
+from utils.template_renderer import render_invitation
+from utils.template_service import list_templates
+
+TOPICS = ['Quarterly Review', 'Design Sync', 'Hiring Panel', 'Launch Retro', 'Budget Planning', 'Security Drill']
+SPEAKERS = ['Alex Morgan', 'Sam Park', 'Riya Shah', 'Jon Bell', 'Mia Chen']
+
+def make_app(path, codec):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    app.config['TEMPLATE_BODY_COMPRESSION'] = codec
+    init_db(app)
+    return app
+
+def seed_inline(db, count):
+    """Insert templates with the HTML inline in template.content"""
+    start = datetime(2025, 1, 1)
+    db.session.execute(insert(models.User.__table__), [
+        {'id': 1, 'username': 'bench', 'email': 'bench@example.com', 'password_hash': 'x'}
+    ])
+    rows = []
+    for i in range(1, count + 1):
+        meeting = {
+            'meetingTopic': f'{random.choice(TOPICS)} #{i}', 'speakerName': random.choice(SPEAKERS),
+            'date': '2026-03-10', 'time': '09:30', 'duration': '60 minutes', 'location': f'Room {i % 40}',
+            'meetingType': 'Review', 'priority': random.choice(['High', 'Medium', 'Low']),
+            'agenda': 'Status, risks, decisions', 'attendees': [f'user{i % 97}@example.com'],
+            'additionalNotes': 'Please review the attached notes beforehand.'
+        }
+        rows.append({
+            'id': i, 'title': meeting['meetingTopic'], 'content': render_invitation(meeting, 'styled'),
+            'meeting_topic': meeting['meetingTopic'], 'speaker_name': meeting['speakerName'],
+            'attendees': '[]', 'additional_notes': meeting['additionalNotes'],
+            'priority': meeting['priority'], 'user_id': 1, 'created_at': start + timedelta(minutes=i)
+        })
+    db.session.execute(insert(models.Template.__table__), rows)
+    db.session.commit()
+
+def vacuum_size(db, path):
+    db.session.remove()
+    with db.engine.connect() as connection:
+        connection.execute(text('VACUUM'))
+        # Databases run in WAL mode: fold the log back into the file before it is measured or copied
+        connection.execute(text('PRAGMA wal_checkpoint(TRUNCATE)'))
+    db.engine.dispose()
+    return os.path.getsize(path)
+
+def timed(db, fn, count, repeat):
+    timings = []
+    for _ in range(repeat):
+        template_id = random.randint(1, count)
+        start = time.perf_counter()
+        fn(template_id)
+        timings.append(time.perf_counter() - start)
+        db.session.rollback()
+        db.session.expunge_all()
+    return statistics.median(timings) * 1e6
+
+def measure(db, count, repeat):
+    table = models.Template.__table__
+    return {
+        'ownership check (title only)': timed(db, lambda tid: db.session.get(models.Template, tid).title, count, repeat),
+        'full row select (pre-deferral)': timed(
+            db, lambda tid: db.session.execute(select(table).where(table.c.id == tid)).one(), count, repeat),
+        'listing page (20 rows)': timed(db, lambda tid: list_templates(1, limit=20), count, repeat),
+        'load HTML content': timed(db, lambda tid: db.session.get(models.Template, tid).content, count, repeat),
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--templates', type=int, default=20000)
+    parser.add_argument('--codec', default='zlib', choices=['zlib', 'zstd', 'none'])
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    inline_path = os.path.join(workdir, 'inline.db')
+    body_path = os.path.join(workdir, 'body.db')
+    inline_app = make_app(inline_path, args.codec)
+    body_app = make_app(body_path, args.codec)
+    db = get_db()
+    init_models(db)
+
+    with inline_app.app_context():
+        db.create_all()
+        with db.engine.begin() as connection:
+            create_query_indexes(connection)
+        seed_inline(db, args.templates)
+        inline_size = vacuum_size(db, inline_path)
+    shutil.copyfile(inline_path, body_path)
+
+    with body_app.app_context():
+        start = time.perf_counter()
+        with db.engine.begin() as connection:
+            move_template_bodies(connection)
+        print(f"migrated {args.templates} bodies ({args.codec}) in {time.perf_counter() - start:.1f}s")
+        body_size = vacuum_size(db, body_path)
+
+    # Warm both databases first so neither run pays for cold caches
+    for app in (inline_app, body_app):
+        with app.app_context():
+            measure(db, args.templates, max(args.repeat // 10, 1))
+    with inline_app.app_context():
+        inline = measure(db, args.templates, args.repeat)
+    with body_app.app_context():
+        body = measure(db, args.templates, args.repeat)
+
+    print(f"database size: inline {inline_size / 1e6:.1f} MB, template_body {body_size / 1e6:.1f} MB "
+          f"({inline_size / body_size:.1f}x smaller)")
+    print(f"\n{'query':32s} {'inline':>10s} {'body':>10s}")
+    for name in inline:
+        print(f"{name:32s} {inline[name]:8.0f}us {body[name]:8.0f}us")
+
+    shutil.rmtree(workdir)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark time-to-first-chunk of streamed template generation.
+
+Starts a local fake OpenAI server that emits chat completion chunks with a
+fixed delay, then compares the blocking generator (first byte = whole
+completion) with the streaming generator. A second run drops the connection
+halfway through to check that the fallback template is still produced.
+
+Usage: python benchmarks/bench_template_stream.py [--chunks 200] [--delay 0.01]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openai
+
+from utils.template_generator import generate_template_content_with_openai, stream_template_content_with_openai
+
+MEETING = {'meetingTopic': 'Design Review', 'speakerName': 'Sam Park', 'date': '2026-02-01', 'time': '14:00'}
+
+def make_handler(chunks, delay, break_after=None):
+    class FakeOpenAIHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            pieces = ['<div>'] + [f'<p>line {i}</p>' for i in range(chunks)] + ['</div>']
+
+            if not body.get('stream'):
+                time.sleep(delay * len(pieces))
+                payload = json.dumps({
+                    'id': 'cmpl-fake', 'object': 'chat.completion', 'created': 0, 'model': body['model'],
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': ''.join(pieces)}}]
+                }).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            for i, piece in enumerate(pieces):
+                if break_after is not None and i == break_after:
+                    self.wfile.flush()
+                    self.connection.close()
+                    return
+                time.sleep(delay)
+                chunk = {'id': 'cmpl-fake', 'object': 'chat.completion.chunk', 'created': 0, 'model': body['model'],
+                         'choices': [{'index': 0, 'delta': {'content': piece}, 'finish_reason': None}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            final = {'id': 'cmpl-fake', 'object': 'chat.completion.chunk', 'created': 0, 'model': body['model'],
+                     'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]}
+            self.wfile.write(f"data: {json.dumps(final)}\n\n".encode())
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+    return FakeOpenAIHandler
+
+def start_server(handler):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--chunks', type=int, default=200)
+    parser.add_argument('--delay', type=float, default=0.01, help='seconds between streamed chunks')
+    args = parser.parse_args()
+
+    server = start_server(make_handler(args.chunks, args.delay))
+    client = openai.OpenAI(api_key='fake', base_url=f'http://127.0.0.1:{server.server_port}/v1', max_retries=0)
+
+    start = time.perf_counter()
+    generate_template_content_with_openai(MEETING, 'fake', use_cache=False, client=client)
+    blocking = time.perf_counter() - start
+
+    start = time.perf_counter()
+    first_chunk = None
+    for kind, _ in stream_template_content_with_openai(MEETING, 'fake', use_cache=False, client=client):
+        if kind == 'chunk' and first_chunk is None:
+            first_chunk = time.perf_counter() - start
+    streamed_total = time.perf_counter() - start
+    server.shutdown()
+
+    print(f"blocking: first byte after   {blocking * 1000:8.1f} ms")
+    print(f"streamed: first chunk after  {first_chunk * 1000:8.1f} ms (complete after {streamed_total * 1000:.1f} ms)")
+
+    # Drop the stream halfway through; the generator must reset and fall back
+    server = start_server(make_handler(args.chunks, args.delay / 10, break_after=args.chunks // 2))
+    client = openai.OpenAI(api_key='fake', base_url=f'http://127.0.0.1:{server.server_port}/v1', max_retries=0)
+    events = [kind for kind, _ in stream_template_content_with_openai(MEETING, 'fake', use_cache=False, client=client)]
+    server.shutdown()
+    print(f"broken stream: reset sent = {'reset' in events}, finished = {events[-1] == 'done'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk WhatsApp sending against a local mock Cloud API server.
+
+The mock server speaks HTTP/1.1 with keep-alive, answers each message after a
+configurable latency and counts the TCP connections it accepted. Messages are
+sent through the send scheduler at several concurrency levels, once with the
+pooled keep-alive session WhatsApp jobs use and once opening a new connection
+per message, and the messages per second are reported for each.
+
+Usage: python benchmarks/bench_whatsapp_bulk.py [--messages 2000] [--latency-ms 10] [--concurrency 1,4,16,32]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.send_scheduler import SendScheduler
+from utils.whatsapp_service import WhatsAppChannel
+
+class MockWhatsAppHandler(BaseHTTPRequestHandler):
+    """POST /<phone_number_id>/messages like the Cloud API; numbers ending in 0000 are rejected"""
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, delayed ACKs stall keep-alive clients
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.requests += 1
+            message_id = f'wamid.{self.server.requests}'
+        if body['to'].endswith('0000'):
+            status, payload = 400, {'error': {'message': 'Recipient phone number not in allowed list', 'code': 131030}}
+        else:
+            status, payload = 200, {'messaging_product': 'whatsapp', 'messages': [{'id': message_id}]}
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+def start_mock_server(latency=0.01, port=0):
+    """Start the mock API on a background thread; returns the server (base URL in server.url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), MockWhatsAppHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.connections = server.requests = 0
+    server.lock = threading.Lock()
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+class NewConnectionPerSend:
+    """requests without connection reuse, the way one-off requests.post calls behave"""
+
+    def post(self, url, **kwargs):
+        with requests.Session() as session:
+            return session.post(url, **kwargs)
+
+def run(server, concurrency, messages, pooled):
+    if pooled:
+        session = requests.Session()
+        session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=concurrency, max_retries=0))
+    else:
+        session = NewConnectionPerSend()
+    channel = WhatsAppChannel('bench-token', '1234567890', server.url, timeout=10, session=session)
+    scheduler = SendScheduler(channel.send, concurrency=concurrency, max_attempts=1)
+    server.connections = 0
+    start = time.perf_counter()
+    results = list(scheduler.run((i, (f'+1415555{i:04d}', 'Team sync at 10:00')) for i in range(messages)))
+    elapsed = time.perf_counter() - start
+    return messages / elapsed, server.connections, sum(1 for r in results if not r.success)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--latency-ms', type=float, default=10)
+    parser.add_argument('--concurrency', default='1,4,16,32')
+    args = parser.parse_args()
+
+    server = start_mock_server(args.latency_ms / 1000)
+    print(f"{args.messages} messages, mock API latency {args.latency_ms:.0f}ms")
+    print(f"\n{'concurrency':>11s} {'pooled msg/s':>13s} {'conns':>6s} {'new-conn msg/s':>15s} {'conns':>6s} {'rejected':>9s}")
+    for concurrency in [int(c) for c in args.concurrency.split(',')]:
+        pooled_rate, pooled_conns, rejected = run(server, concurrency, args.messages, True)
+        fresh_rate, fresh_conns, _ = run(server, concurrency, args.messages, False)
+        print(f"{concurrency:11d} {pooled_rate:13.0f} {pooled_conns:6d} {fresh_rate:15.0f} {fresh_conns:6d} {rejected:9d}")
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
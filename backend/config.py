@@ -7,19 +7,102 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'smartmeeting-ai-production-secret-key-2024')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///smartmeeting.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')  # optional read replica for read-only views
+    
+    # SQLite tuning, applied to every new connection (WAL lets readers run alongside a writer)
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')  # durable with WAL except on power loss
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 10000))  # ms to wait for a lock before 'database is locked'
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))  # bytes
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -64000))  # pages, or KiB when negative
+    
+    # Connection pool for server databases (PostgreSQL, MySQL); set SQLALCHEMY_ENGINE_OPTIONS to override
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))  # seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))  # seconds
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
     UPLOAD_FOLDER = 'uploads'
-    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB max file size (contact list uploads)
     
     # OpenAI Configuration
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', 'OPENAI_API_KEY')
+    OPENAI_BASE_URL = os.environ.get('OPENAI_BASE_URL')  # defaults to the public API
+    OPENAI_CONNECT_TIMEOUT = float(os.environ.get('OPENAI_CONNECT_TIMEOUT', 5))  # seconds
+    OPENAI_READ_TIMEOUT = float(os.environ.get('OPENAI_READ_TIMEOUT', 60))  # seconds; between chunks when streaming
+    OPENAI_MAX_RETRIES = int(os.environ.get('OPENAI_MAX_RETRIES', 1))
+    OPENAI_BREAKER_THRESHOLD = int(os.environ.get('OPENAI_BREAKER_THRESHOLD', 5))  # consecutive failures before falling back
+    OPENAI_BREAKER_RESET_TIMEOUT = float(os.environ.get('OPENAI_BREAKER_RESET_TIMEOUT', 30))  # seconds between probes while open
+    
+    # Generated template cache (in-process LRU in front of a SQLite file)
+    TEMPLATE_CACHE_ENABLED = os.environ.get('TEMPLATE_CACHE_ENABLED', 'true').lower() == 'true'
+    TEMPLATE_CACHE_PATH = os.environ.get('TEMPLATE_CACHE_PATH')  # defaults to instance/template_cache.db
+    TEMPLATE_CACHE_MEMORY_SIZE = int(os.environ.get('TEMPLATE_CACHE_MEMORY_SIZE', 256))  # entries
+    TEMPLATE_CACHE_DISK_SIZE = int(os.environ.get('TEMPLATE_CACHE_DISK_SIZE', 10000))  # entries
+    TEMPLATE_CACHE_TTL = int(os.environ.get('TEMPLATE_CACHE_TTL', 7 * 24 * 3600))  # seconds
+    
+    # Batch template generation (one OpenAI call per distinct meeting, run concurrently)
+    TEMPLATE_BATCH_CONCURRENCY = int(os.environ.get('TEMPLATE_BATCH_CONCURRENCY', 8))
+    TEMPLATE_BATCH_MAX_SIZE = int(os.environ.get('TEMPLATE_BATCH_MAX_SIZE', 50))  # meetings per request
+    
+    # Compression for stored template HTML: 'zlib', 'zstd' (needs the zstandard package) or 'none'
+    TEMPLATE_BODY_COMPRESSION = os.environ.get('TEMPLATE_BODY_COMPRESSION', 'zlib')
+    
+    # Template export artifacts (rendered once per template version, served with ETag / 304)
+    EXPORT_DIR = os.environ.get('EXPORT_DIR')  # defaults to instance/exports
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', 'false').lower() == 'true'  # let the web server stream files
+    
+    # PDF Export (rendered by WeasyPrint in a process pool)
+    PDF_RENDER_WORKERS = int(os.environ.get('PDF_RENDER_WORKERS', 2))  # render processes per app process
+    PDF_RENDER_QUEUE_SIZE = int(os.environ.get('PDF_RENDER_QUEUE_SIZE', 16))  # renders queued or running before new ones are refused
+    PDF_RENDER_QUEUE_WAIT = float(os.environ.get('PDF_RENDER_QUEUE_WAIT', 2))  # seconds to wait for a queue slot
+    PDF_RENDER_TIMEOUT = float(os.environ.get('PDF_RENDER_TIMEOUT', 60))  # seconds
     
     # Gmail Integration
     GMAIL_USER = os.environ.get('GMAIL_USER', 'your-email@gmail.com')
     GMAIL_PASSWORD = os.environ.get('GMAIL_PASSWORD', 'your-app-password')
     
+    # SMTP connection pool (sessions are kept open and reused across sends)
+    SMTP_HOST = os.environ.get('SMTP_HOST', 'smtp.gmail.com')
+    SMTP_PORT = int(os.environ.get('SMTP_PORT', 587))
+    SMTP_USE_TLS = os.environ.get('SMTP_USE_TLS', 'true').lower() == 'true'
+    SMTP_POOL_SIZE = int(os.environ.get('SMTP_POOL_SIZE', 4))
+    SMTP_POOL_IDLE_TIMEOUT = int(os.environ.get('SMTP_POOL_IDLE_TIMEOUT', 60))  # seconds
+    SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.environ.get('SMTP_MAX_MESSAGES_PER_CONNECTION', 100))
+    
+    # Recipient validation
+    VALIDATE_EMAIL_MX = os.environ.get('VALIDATE_EMAIL_MX', 'false').lower() == 'true'  # needs dnspython
+    DEFAULT_PHONE_COUNTRY_CODE = os.environ.get('DEFAULT_PHONE_COUNTRY_CODE')  # e.g. '1'; for numbers without +
+    
+    # Per-recipient personalization
+    MEETING_TIMEZONE = os.environ.get('MEETING_TIMEZONE', 'UTC')  # zone of template date/time unless sent with one
+    RSVP_URL_TEMPLATE = os.environ.get('RSVP_URL_TEMPLATE')  # e.g. https://host/rsvp?d={distribution_id}&r={recipient_id}&e={email}
+    
+    # Metrics (Prometheus text format at /api/metrics)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'  # request timing and SQL hooks are only installed when on
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # optional bearer token required to scrape
+    
+    # Background distribution jobs (queued in the database, no broker needed)
+    DISTRIBUTION_WORKERS = int(os.environ.get('DISTRIBUTION_WORKERS', 2))
+    DISTRIBUTION_POLL_INTERVAL = float(os.environ.get('DISTRIBUTION_POLL_INTERVAL', 1.0))  # seconds
+    DISTRIBUTION_JOB_STALE_AFTER = int(os.environ.get('DISTRIBUTION_JOB_STALE_AFTER', 300))  # seconds
+    
     # WhatsApp Integration
     WHATSAPP_API_KEY = os.environ.get('WHATSAPP_API_KEY', 'your-whatsapp-api-key')
     WHATSAPP_PHONE_NUMBER = os.environ.get('WHATSAPP_PHONE_NUMBER', 'your-whatsapp-phone-number')
+    WHATSAPP_API_URL = os.environ.get('WHATSAPP_API_URL', 'https://graph.facebook.com/v18.0')
+    WHATSAPP_TIMEOUT = float(os.environ.get('WHATSAPP_TIMEOUT', 10))  # seconds
+    
+    # Send scheduling: rate limits are per provider account (messages/second, burst size)
+    GMAIL_RATE_LIMIT = float(os.environ.get('GMAIL_RATE_LIMIT', 5))
+    GMAIL_RATE_BURST = int(os.environ.get('GMAIL_RATE_BURST', 10))
+    GMAIL_SEND_CONCURRENCY = int(os.environ.get('GMAIL_SEND_CONCURRENCY', 4))  # at most SMTP_POOL_SIZE sessions are used
+    WHATSAPP_RATE_LIMIT = float(os.environ.get('WHATSAPP_RATE_LIMIT', 20))
+    WHATSAPP_RATE_BURST = int(os.environ.get('WHATSAPP_RATE_BURST', 20))
+    WHATSAPP_SEND_CONCURRENCY = int(os.environ.get('WHATSAPP_SEND_CONCURRENCY', 8))
+    SEND_MAX_ATTEMPTS = int(os.environ.get('SEND_MAX_ATTEMPTS', 4))  # including the first try
+    SEND_BACKOFF_BASE = float(os.environ.get('SEND_BACKOFF_BASE', 1.0))  # seconds, doubled per retry (full jitter)
+    SEND_BACKOFF_MAX = float(os.environ.get('SEND_BACKOFF_MAX', 60.0))  # seconds
 
 class DevelopmentConfig(Config):
     DEBUG = True
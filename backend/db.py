@@ -1,13 +1,96 @@
+from contextlib import contextmanager
+from functools import wraps
+
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Bind key of the optional read replica (DATABASE_REPLICA_URL)
+REPLICA_BIND = 'replica'
+
+class RoutingSession(Session):
+    """Session that sends reads to the replica inside read_replica views; flushes always go to the primary"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get('use_replica') and not self._flushing:
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
 
 # Initialize SQLAlchemy instance
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+def engine_options(url, config):
+    """Engine options for a database URL: pool sizing for server databases, nothing extra for SQLite"""
+    if make_url(url).get_backend_name() == 'sqlite':
+        # Flask-SQLAlchemy picks the pool; concurrency is tuned with the pragmas below
+        return {}
+    return {
+        'pool_size': config.get('DB_POOL_SIZE', 10),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 20),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 30),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True)
+    }
+
+def sqlite_pragmas(config):
+    """PRAGMA statements run on every new SQLite connection"""
+    pragmas = {
+        'journal_mode': config.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': config.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': config.get('SQLITE_BUSY_TIMEOUT', 10000),
+        'mmap_size': config.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024),
+        'cache_size': config.get('SQLITE_CACHE_SIZE', -64000)
+    }
+    return [f'PRAGMA {name}={value}' for name, value in pragmas.items() if value not in (None, '')]
+
+def _listen_sqlite_pragmas(engine, statements):
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.close()
 
 def init_db(app):
     """Initialize database with Flask app"""
+    config = app.config
+    config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(config['SQLALCHEMY_DATABASE_URI'], config))
+    replica_url = config.get('DATABASE_REPLICA_URL')
+    if replica_url:
+        config.setdefault('SQLALCHEMY_BINDS', {})[REPLICA_BIND] = {
+            'url': replica_url, **engine_options(replica_url, config)
+        }
     db.init_app(app)
+
+    statements = sqlite_pragmas(config)
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                _listen_sqlite_pragmas(engine, statements)
     return db
 
 def get_db():
     """Get database instance"""
-    return db 
\ No newline at end of file
+    return db
+
+@contextmanager
+def use_replica():
+    """Run the block's queries against the read replica, if one is configured"""
+    session = db.session()
+    previous = session.info.get('use_replica', False)
+    session.info['use_replica'] = True
+    try:
+        yield
+    finally:
+        session.info['use_replica'] = previous
+
+def read_replica(view):
+    """Decorator for read-only views that can tolerate replica lag"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with use_replica():
+            return view(*args, **kwargs)
+    return wrapper
@@ -1,26 +1,40 @@
-from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for, flash, session
+from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for, flash, session, Response, stream_with_context
 from flask_login import LoginManager, login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 import os
 import json
+import csv
 import datetime
 from datetime import datetime, timedelta
+import sys
 import uuid
-from dotenv import load_dotenv
+import hmac
+from email.utils import parseaddr
 
-# Load environment variables
-load_dotenv()
-
-# Import configuration and database
+# Import configuration (loads .env) and database
 from config import config
-from db import init_db, get_db
+from db import init_db, get_db, read_replica
 
 # Import utility functions
-from utils.validation import validate_email, validate_phone
-from utils.template_generator import generate_template_content_with_openai
-from utils.email_service import send_gmail_invitation
-from utils.whatsapp_service import send_whatsapp_message
+from utils.validation import get_mx_cache, validate_phones, validate_recipients
+from utils.openai_client import openai_stats
+from utils.template_generator import generate_template_content_with_openai, generate_templates_batch, stream_template_content_with_openai, get_template_cache
+from utils.job_queue import JobWorkerPool
+from utils.distribution_jobs import calendar_invite, distribution_timezone, enqueue_gmail_distribution, enqueue_whatsapp_distribution, process_distribution_job, serialize_job
+from utils.calendar_service import MeetingNotScheduled, iter_distribution_ics_zip
+from utils.contact_service import (
+    ContactImportError, count_contacts, get_contact_list, import_contacts, iter_csv_rows, iter_xlsx_rows,
+    list_contact_lists, serialize_contact_list
+)
+from utils.export_service import EXPORT_FORMATS, export_filename, get_export_artifact
+from utils.pdf_service import PdfQueueFull, PdfUnavailable, pdf_available
+from utils.recipient_service import DETAILS_PAGE_SIZE, get_recipient_details
+from utils.template_service import list_templates, InvalidCursor, DEFAULT_PAGE_SIZE
+from utils.personalization import get_timezone
+from utils.stats_service import get_dashboard_stats, get_recent_activity, init_stats_tracking
+from utils.migrations import run_migrations
+from utils.metrics import init_metrics, render_metrics
 
 app = Flask(__name__, template_folder='../frontend/templates')
 
@@ -39,12 +53,19 @@ db = init_db(app)
 
 # Initialize models with database instance
 from utils.models import init_models
-User, Template, Distribution = init_models(db)
+(User, Template, TemplateBody, Distribution, DistributionRecipient, DistributionJob, UserStats,
+ DeadLetter, ContactList, Contact) = init_models(db)
+init_stats_tracking(db)
+
+# Request timing and per-request SQL counts for /api/metrics (no hooks at all when disabled)
+init_metrics(app, db)
 
-# Create database tables
-with app.app_context():
+def init_database():
+    """Create tables, apply migrations and add the demo user; call inside an app context"""
+    # Not run at import time, so gunicorn workers start without touching the database
     try:
         db.create_all()
+        run_migrations(db)
         print("Database tables created successfully!")
         
         # Create a demo user if none exists
@@ -57,9 +78,32 @@ with app.app_context():
             db.session.add(demo_user)
             db.session.commit()
             print("Demo user created: demo@example.com / demo123")
+        else:
+            print("Demo user already exists")
             
     except Exception as e:
-        print(f"Database initialization warning: {e}")
+        print(f"Database initialization failed: {e}")
+        return False
+    
+    return True
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create or upgrade the database schema: flask --app main init-db"""
+    if not init_database():
+        sys.exit(1)
+
+# Background workers that drain queued distribution jobs (started on first use)
+distribution_workers = JobWorkerPool(
+    app,
+    process_distribution_job,
+    workers=app.config['DISTRIBUTION_WORKERS'],
+    poll_interval=app.config['DISTRIBUTION_POLL_INTERVAL'],
+    stale_after=app.config['DISTRIBUTION_JOB_STALE_AFTER']
+)
+
+# Resume queued work left by a previous process once this worker serves traffic
+app.before_request(distribution_workers.start)
 
 # Initialize login manager
 login_manager = LoginManager()
@@ -73,30 +117,11 @@ def load_user(user_id):
 # Routes
 @app.route('/')
 @login_required
+@read_replica
 def dashboard():
-    # Get statistics
-    stats = {
-        'templates_generated': Template.query.filter_by(user_id=current_user.id).count(),
-        'invitations_sent': Distribution.query.filter_by(user_id=current_user.id, status='sent').count(),
-        'total_recipients': sum(len(json.loads(d.recipients)) for d in Distribution.query.filter_by(user_id=current_user.id)),
-        'calendar_events': Distribution.query.filter_by(user_id=current_user.id, method='calendar').count(),
-        'success_rate': 94.2,  # Mock data
-        'recent_activity': []
-    }
-    
-    # Get recent distributions
-    recent_distributions = Distribution.query.filter_by(user_id=current_user.id).order_by(Distribution.created_at.desc()).limit(5).all()
-    
-    for dist in recent_distributions:
-        template = db.session.get(Template, dist.template_id)
-        stats['recent_activity'].append({
-            'id': dist.id,
-            'type': 'invitation_sent',
-            'title': template.title if template else 'Unknown Template',
-            'description': f'Sent via {dist.method}',
-            'timestamp': dist.created_at,
-            'status': dist.status
-        })
+    # Get statistics (a primary-key lookup on the rollup plus one join for recent activity)
+    stats = get_dashboard_stats(current_user.id)
+    stats['recent_activity'] = get_recent_activity(current_user.id)
     
     return render_template('dashboard.html', stats=stats)
 
@@ -157,6 +182,27 @@ def logout():
 def template_generator():
     return render_template('template_generator.html')
 
+TEMPLATE_REQUIRED_FIELDS = ['meetingTopic', 'speakerName', 'date', 'time']
+
+def build_template(data, template_content):
+    """Create a Template row from the generator form data"""
+    return Template(
+        title=data['meetingTopic'],
+        content=template_content,
+        meeting_topic=data['meetingTopic'],
+        speaker_name=data['speakerName'],
+        meeting_date=datetime.strptime(data['date'], '%Y-%m-%d').date(),
+        meeting_time=datetime.strptime(data['time'], '%H:%M').time(),
+        duration=data.get('duration'),
+        meeting_link=data.get('meetingLink'),
+        location=data.get('location'),
+        attendees=json.dumps(data.get('attendees', [])),
+        additional_notes=data.get('additionalNotes'),
+        meeting_type=data.get('meetingType'),
+        priority=data.get('priority'),
+        user_id=current_user.id
+    )
+
 @app.route('/api/templates/generate', methods=['POST'])
 @login_required
 def generate_template():
@@ -164,32 +210,15 @@ def generate_template():
         data = request.get_json()
         
         # Validate required fields
-        required_fields = ['meetingTopic', 'speakerName', 'date', 'time']
-        for field in required_fields:
+        for field in TEMPLATE_REQUIRED_FIELDS:
             if not data.get(field):
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
         # Generate template content using OpenAI
-        template_content = generate_template_content_with_openai(data, OPENAI_API_KEY)
+        template_content = generate_template_content_with_openai(data, OPENAI_API_KEY, use_cache=data.get('useCache', True))
         
         # Save template to database
-        template = Template(
-            title=data['meetingTopic'],
-            content=template_content,
-            meeting_topic=data['meetingTopic'],
-            speaker_name=data['speakerName'],
-            meeting_date=datetime.strptime(data['date'], '%Y-%m-%d').date(),
-            meeting_time=datetime.strptime(data['time'], '%H:%M').time(),
-            duration=data.get('duration'),
-            meeting_link=data.get('meetingLink'),
-            location=data.get('location'),
-            attendees=json.dumps(data.get('attendees', [])),
-            additional_notes=data.get('additionalNotes'),
-            meeting_type=data.get('meetingType'),
-            priority=data.get('priority'),
-            user_id=current_user.id
-        )
-        
+        template = build_template(data, template_content)
         db.session.add(template)
         db.session.commit()
         
@@ -203,134 +232,410 @@ def generate_template():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/templates/generate/batch', methods=['POST'])
+@login_required
+def generate_templates():
+    """Generate templates for a series of meetings, saved together in one transaction"""
+    try:
+        data = request.get_json() or {}
+        meetings = data.get('meetings')
+        if not isinstance(meetings, list) or not meetings:
+            return jsonify({'error': 'meetings must be a non-empty list'}), 400
+        max_size = app.config['TEMPLATE_BATCH_MAX_SIZE']
+        if len(meetings) > max_size:
+            return jsonify({'error': f'At most {max_size} meetings per batch'}), 400
+        
+        # Validate every meeting up front; the batch is saved all or nothing
+        for index, meeting in enumerate(meetings):
+            if not isinstance(meeting, dict):
+                return jsonify({'error': f'Meeting {index}: must be an object'}), 400
+            for field in TEMPLATE_REQUIRED_FIELDS:
+                if not meeting.get(field):
+                    return jsonify({'error': f'Meeting {index}: missing required field: {field}'}), 400
+            try:
+                datetime.strptime(meeting['date'], '%Y-%m-%d')
+                datetime.strptime(meeting['time'], '%H:%M')
+            except ValueError as e:
+                return jsonify({'error': f'Meeting {index}: {e}'}), 400
+        
+        contents = generate_templates_batch(
+            meetings, OPENAI_API_KEY,
+            use_cache=data.get('useCache', True),
+            max_workers=app.config['TEMPLATE_BATCH_CONCURRENCY']
+        )
+        
+        templates = [build_template(meeting, content) for meeting, content in zip(meetings, contents)]
+        db.session.add_all(templates)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'templates': [
+                {'template_id': template.id, 'template': content}
+                for template, content in zip(templates, contents)
+            ],
+            'message': f'{len(templates)} templates generated successfully using AI'
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/templates/generate/stream', methods=['POST'])
+@login_required
+def generate_template_stream():
+    """Stream the generated template to the browser as Server-Sent Events"""
+    data = request.get_json()
+    
+    # Validate required fields before the stream starts
+    for field in TEMPLATE_REQUIRED_FIELDS:
+        if not data.get(field):
+            return jsonify({'error': f'Missing required field: {field}'}), 400
+    try:
+        datetime.strptime(data['date'], '%Y-%m-%d')
+        datetime.strptime(data['time'], '%H:%M')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    def sse(event, payload):
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    
+    def events():
+        try:
+            for kind, value in stream_template_content_with_openai(data, OPENAI_API_KEY, use_cache=data.get('useCache', True)):
+                if kind == 'chunk':
+                    yield sse('chunk', {'html': value})
+                elif kind == 'reset':
+                    yield sse('reset', {})
+                elif kind == 'done':
+                    # Save template to database once the full content is known
+                    template = build_template(data, value)
+                    db.session.add(template)
+                    db.session.commit()
+                    yield sse('done', {
+                        'success': True,
+                        'template_id': template.id,
+                        'message': 'Template generated successfully using AI'
+                    })
+        except Exception as e:
+            yield sse('error', {'error': str(e)})
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/templates/cache/stats')
+@login_required
+def template_cache_stats():
+    cache = get_template_cache()
+    if cache is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **cache.stats()})
+
+@app.route('/api/templates/openai/stats')
+@login_required
+def template_openai_stats():
+    """Circuit breaker state and latency histograms of OpenAI calls in this process"""
+    return jsonify(openai_stats())
+
+@app.route('/api/templates')
+@login_required
+@read_replica
+def get_templates():
+    """List the user's templates a page at a time (keyset pagination on created_at, id)"""
+    try:
+        limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+        include_content = request.args.get('includeContent', 'false').lower() in ('1', 'true', 'yes')
+        templates, next_cursor = list_templates(
+            current_user.id,
+            limit=limit,
+            cursor=request.args.get('cursor'),
+            search=request.args.get('q'),
+            include_content=include_content
+        )
+        return jsonify({'templates': templates, 'next_cursor': next_cursor})
+    
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/distribution')
 @login_required
 def distribution():
-    templates = Template.query.filter_by(user_id=current_user.id).all()
-    return render_template('distribution.html', templates=templates)
+    # Templates are lazy-loaded from /api/templates by the page
+    return render_template('distribution.html')
+
+def _summarize(values, limit=20):
+    """Comma-separated values for an error message, truncated for very large lists"""
+    shown = ', '.join(values[:limit])
+    return f'{shown} and {len(values) - limit} more' if len(values) > limit else shown
+
+def _skipped(duplicates):
+    return f' ({len(duplicates)} duplicate(s) skipped)' if duplicates else ''
+
+def _email_recipient(entry):
+    """Recipient dict from an {email, name, timezone} object or a "Name <email>" string; None for anything else"""
+    if isinstance(entry, str):
+        name, address = parseaddr(entry)
+        return {'address': address or entry.strip(), 'name': name or None}
+    if not isinstance(entry, dict):
+        return None
+    fields = (entry.get('email', ''), entry.get('name'), entry.get('timezone'))
+    if not isinstance(fields[0], str) or not all(f is None or isinstance(f, str) for f in fields[1:]):
+        return None
+    return {'address': fields[0].strip(), 'name': fields[1], 'timezone': fields[2]}
+
+def _requested_contact_list(data, inline_recipients, channel):
+    """(contact list named by contactListId, error response); both None when none was requested"""
+    list_id = data.get('contactListId')
+    if not list_id:
+        return None, None
+    if inline_recipients:
+        return None, (jsonify({'error': 'Send to either a contact list or inline recipients, not both'}), 400)
+    contact_list = get_contact_list(list_id, current_user.id)
+    if contact_list is None:
+        return None, (jsonify({'error': 'Contact list not found'}), 404)
+    if not count_contacts(contact_list.id, channel):
+        kind = 'email addresses' if channel == 'email' else 'phone numbers'
+        return None, (jsonify({'error': f'Contact list has no {kind}'}), 400)
+    return contact_list, None
+
+@app.route('/api/contact-lists', methods=['GET'])
+@login_required
+@read_replica
+def get_contact_lists():
+    return jsonify({'contact_lists': list_contact_lists(current_user.id)})
+
+@app.route('/api/contact-lists', methods=['POST'])
+@login_required
+def upload_contact_list():
+    """Import a CSV/XLSX contact list, parsed and stored a chunk at a time"""
+    try:
+        upload = request.files.get('file')
+        if upload is not None:
+            # Multipart uploads are spooled to a temporary file by Werkzeug, not held in memory
+            filename = secure_filename(upload.filename or '')
+            stream = upload.stream
+        elif request.mimetype in ('text/csv', 'text/plain'):
+            # Raw CSV bodies are read straight from the request stream
+            filename = secure_filename(request.args.get('filename', 'contacts.csv'))
+            stream = request.stream
+        else:
+            return jsonify({'error': 'Upload a CSV or XLSX file in the "file" field'}), 400
+        
+        if filename.lower().endswith('.xlsx'):
+            rows = iter_xlsx_rows(stream)
+        elif filename.lower().endswith(('.csv', '.txt')) or not filename:
+            rows = iter_csv_rows(stream)
+        else:
+            return jsonify({'error': 'Only .csv and .xlsx contact lists are supported'}), 400
+        
+        name = (request.form.get('name') or request.args.get('name') or filename.rsplit('.', 1)[0] or 'Contacts')[:200]
+        contact_list, invalid_sample = import_contacts(
+            current_user.id, name, rows, default_country_code=app.config['DEFAULT_PHONE_COUNTRY_CODE']
+        )
+        return jsonify({
+            'success': True,
+            'contact_list': serialize_contact_list(contact_list),
+            'invalid_rows': invalid_sample
+        }), 201
+    
+    except (ContactImportError, UnicodeDecodeError, csv.Error) as e:
+        db.session.rollback()
+        return jsonify({'error': f'Could not read contact list: {e}'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/api/distribution/gmail', methods=['POST'])
 @login_required
 def send_gmail():
+    return _queue_email_distribution()
+
+@app.route('/api/distribution/calendar', methods=['POST'])
+@login_required
+def send_calendar():
+    """Email the invitation with a calendar invite (text/calendar) for each recipient"""
+    return _queue_email_distribution(calendar=True)
+
+def _queue_email_distribution(calendar=False):
     try:
         data = request.get_json()
         recipient_emails = data.get('recipientEmails', [])
         recipient_email = data.get('recipientEmail')  # Backward compatibility
         template_id = data.get('templateId')
         subject = data.get('subject', 'Meeting Invitation')
+        personalize = bool(data.get('personalize', False))
+        attach_pdf = bool(data.get('attachPdf', False))
+        timezone = data.get('timezone')
         
         # Handle both single email and multiple emails
         if recipient_email and not recipient_emails:
             recipient_emails = [recipient_email]
         
-        if not recipient_emails or not template_id:
+        # Recipients as objects ({email, name, timezone}) or "Name <email>" strings
+        recipients = [_email_recipient(entry) for entry in [*(data.get('recipients') or []), *recipient_emails]]
+        if None in recipients:
+            return jsonify({'error': 'Recipients must be email strings or objects with an "email" string'}), 400
+        
+        # An uploaded contact list can stand in for inline recipients
+        contact_list, error = _requested_contact_list(data, recipients, 'email')
+        if error:
+            return error
+        
+        if not (recipients or contact_list) or not template_id:
             return jsonify({'error': 'Recipient email(s) and template ID are required'}), 400
         
-        # Validate all emails
-        invalid_emails = [email for email in recipient_emails if not validate_email(email)]
+        if attach_pdf and not pdf_available():
+            return jsonify({'error': 'PDF attachments require the weasyprint package'}), 501
+        
+        # Validate, normalize and de-duplicate the whole list in one pass
+        mx_check = get_mx_cache() if app.config['VALIDATE_EMAIL_MX'] else None
+        recipients, invalid_emails, duplicates = validate_recipients(recipients, mx_check=mx_check)
         if invalid_emails:
-            return jsonify({'error': f'Invalid email format(s): {", ".join(invalid_emails)}'}), 400
+            return jsonify({'error': f'Invalid email format(s): {_summarize(invalid_emails)}'}), 400
+        
+        zones = {timezone} | {r.get('timezone') for r in recipients}
+        invalid_zones = [z for z in zones if z and not get_timezone(z)]
+        if invalid_zones:
+            return jsonify({'error': f'Unknown timezone(s): {", ".join(sorted(invalid_zones))}'}), 400
         
         template = db.session.get(Template, template_id)
         if not template or template.user_id != current_user.id:
             return jsonify({'error': 'Template not found'}), 404
         
-        # Send emails to all recipients
-        results = []
-        successful_sends = 0
+        if calendar and not (template.meeting_date and template.meeting_time):
+            return jsonify({'error': 'Calendar invites need a template with a meeting date and time'}), 400
         
-        for email in recipient_emails:
-            # Customize subject with meeting topic if available
-            custom_subject = f"{subject}: {template.meeting_topic}" if template.meeting_topic else subject
-            
-            result = send_gmail_invitation(
-                email, 
-                template.content, 
-                custom_subject,
-                app.config.get('GMAIL_USER'),
-                app.config.get('GMAIL_PASSWORD')
-            )
-            results.append({
-                'email': email,
-                'success': result['success'],
-                'message': result['message']
-            })
-            
-            if result['success']:
-                successful_sends += 1
-        
-        # Save distribution record
-        distribution = Distribution(
-            template_id=template_id,
-            method='gmail',
-            recipients=json.dumps([{'email': email} for email in recipient_emails]),
-            status='sent' if successful_sends > 0 else 'failed',
-            sent_at=datetime.utcnow(),
-            user_id=current_user.id
+        # Queue the send; background workers deliver it and update the Distribution
+        job = enqueue_gmail_distribution(
+            template, recipients, subject, current_user.id, personalize=personalize, timezone=timezone,
+            contact_list_id=contact_list.id if contact_list else None, attach_pdf=attach_pdf, calendar=calendar
         )
-        db.session.add(distribution)
-        db.session.commit()
+        distribution_workers.notify()
         
-        # Return summary
-        if successful_sends == len(recipient_emails):
-            return jsonify({
-                'success': True,
-                'message': f'Successfully sent {successful_sends} invitation(s)',
-                'details': results
-            })
-        elif successful_sends > 0:
-            return jsonify({
-                'success': True,
-                'message': f'Partially successful: {successful_sends}/{len(recipient_emails)} sent',
-                'details': results
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'message': 'Failed to send any invitations',
-                'details': results
-            })
+        return jsonify({
+            'success': True,
+            'message': f'Queued {job.total} invitation(s) for delivery' + _skipped(duplicates),
+            'duplicates': len(duplicates),
+            'job_id': job.id,
+            'distribution_id': job.distribution_id,
+            'status_url': url_for('distribution_job_status', job_id=job.id)
+        }), 202
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/distribution/<int:distribution_id>/calendar')
+@login_required
+def export_distribution_calendar(distribution_id):
+    """Download a ZIP with one .ics invite per recipient of a distribution"""
+    try:
+        distribution = db.session.get(Distribution, distribution_id)
+        if not distribution or distribution.user_id != current_user.id:
+            return jsonify({'error': 'Distribution not found'}), 404
+        
+        timezone = request.args.get('timezone') or distribution_timezone(distribution.id)
+        if not get_timezone(timezone):
+            return jsonify({'error': f'Unknown timezone: {timezone}'}), 400
+        
+        template = db.session.get(Template, distribution.template_id)
+        if template is None:
+            return jsonify({'error': 'Template not found'}), 404
+        try:
+            invite = calendar_invite(template, app.config.get('GMAIL_USER'), app.config.get('GMAIL_PASSWORD'), timezone)
+        except MeetingNotScheduled as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Recipients are read in batches and zipped as the response is sent; nothing is buffered
+        return Response(
+            stream_with_context(iter_distribution_ics_zip(distribution.id, invite)),
+            mimetype='application/zip',
+            headers={'Content-Disposition': f'attachment; filename=distribution_{distribution.id}_invites.zip'}
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/distribution/jobs/<job_id>')
+@login_required
+def distribution_job_status(job_id):
+    job = db.session.get(DistributionJob, job_id)
+    if not job or job.user_id != current_user.id:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    distribution = db.session.get(Distribution, job.distribution_id)
+    return jsonify(serialize_job(job, distribution))
+
+@app.route('/api/distribution/jobs/<job_id>/recipients')
+@login_required
+def distribution_job_recipients(job_id):
+    """Per-recipient outcomes of a job a page at a time (keyset pagination on recipient id)"""
+    job = db.session.get(DistributionJob, job_id)
+    if not job or job.user_id != current_user.id:
+        return jsonify({'error': 'Job not found'}), 404
+
+    status = request.args.get('status')
+    if status not in (None, 'pending', 'sent', 'failed'):
+        return jsonify({'error': 'status must be pending, sent or failed'}), 400
+    try:
+        details, next_cursor = get_recipient_details(
+            job.distribution_id,
+            status=status,
+            limit=request.args.get('limit', DETAILS_PAGE_SIZE, type=int),
+            cursor=request.args.get('cursor')
+        )
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'recipients': details, 'next_cursor': next_cursor})
+
 @app.route('/api/distribution/whatsapp', methods=['POST'])
 @login_required
 def send_whatsapp():
     try:
         data = request.get_json()
-        phone_number = data.get('phoneNumber')
+        phone_numbers = data.get('phoneNumbers', [])
+        phone_number = data.get('phoneNumber')  # Backward compatibility
         template_id = data.get('templateId')
         
-        if not phone_number or not template_id:
-            return jsonify({'error': 'Phone number and template ID are required'}), 400
+        if phone_number and not phone_numbers:
+            phone_numbers = [phone_number]
+        
+        # An uploaded contact list can stand in for inline numbers
+        contact_list, error = _requested_contact_list(data, phone_numbers, 'phone')
+        if error:
+            return error
         
-        if not validate_phone(phone_number):
-            return jsonify({'error': 'Invalid phone number format'}), 400
+        if not (phone_numbers or contact_list) or not template_id:
+            return jsonify({'error': 'Phone number(s) and template ID are required'}), 400
+        
+        # Canonicalized to E.164 and de-duplicated in one pass
+        phone_numbers, invalid_numbers, duplicates = validate_phones(
+            phone_numbers, app.config['DEFAULT_PHONE_COUNTRY_CODE']
+        )
+        if invalid_numbers:
+            return jsonify({'error': f'Invalid phone number(s): {_summarize(invalid_numbers)}'}), 400
         
         template = db.session.get(Template, template_id)
         if not template or template.user_id != current_user.id:
             return jsonify({'error': 'Template not found'}), 404
         
-        # Send WhatsApp message
-        result = send_whatsapp_message(phone_number, template.content)
-        
-        # Save distribution record
-        distribution = Distribution(
-            template_id=template_id,
-            method='whatsapp',
-            recipients=json.dumps([{'phone': phone_number}]),
-            status='sent' if result['success'] else 'failed',
-            sent_at=datetime.utcnow(),
-            user_id=current_user.id
+        # Queue the send; background workers deliver it over a keep-alive session
+        job = enqueue_whatsapp_distribution(
+            template, phone_numbers, current_user.id, contact_list_id=contact_list.id if contact_list else None
         )
-        db.session.add(distribution)
-        db.session.commit()
+        distribution_workers.notify()
         
         return jsonify({
-            'success': result['success'],
-            'message': result['message']
-        })
+            'success': True,
+            'message': f'Queued {job.total} WhatsApp message(s) for delivery' + _skipped(duplicates),
+            'duplicates': len(duplicates),
+            'job_id': job.id,
+            'distribution_id': job.distribution_id,
+            'status_url': url_for('distribution_job_status', job_id=job.id)
+        }), 202
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -343,95 +648,37 @@ def settings():
 @app.route('/api/templates/<int:template_id>/download')
 @login_required
 def download_template(template_id):
-    """Download template as HTML file"""
+    """Download template as HTML file (or PDF with ?format=pdf)"""
     try:
+        fmt = request.args.get('format', 'html')
+        if fmt not in EXPORT_FORMATS:
+            return jsonify({'error': f'Unsupported format: {fmt}'}), 400
+        
         template = db.session.get(Template, template_id)
         if not template or template.user_id != current_user.id:
             return jsonify({'error': 'Template not found'}), 404
         
-        # Create HTML content with proper styling
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>{template.title}</title>
-            <style>
-                body {{ 
-                    font-family: Arial, sans-serif; 
-                    margin: 20px; 
-                    line-height: 1.6; 
-                    background-color: #f5f5f5;
-                }}
-                .container {{
-                    max-width: 800px;
-                    margin: 0 auto;
-                    background: white;
-                    border-radius: 10px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                    overflow: hidden;
-                }}
-                .header {{ 
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                    color: white; 
-                    padding: 30px; 
-                    text-align: center;
-                }}
-                .content {{ 
-                    padding: 30px; 
-                }}
-                .footer {{ 
-                    margin-top: 20px; 
-                    text-align: center; 
-                    color: #666; 
-                    font-size: 14px; 
-                    padding: 20px;
-                    background: #f8f9fa;
-                }}
-                .meeting-details {{
-                    background: #f8f9fa;
-                    padding: 20px;
-                    border-radius: 8px;
-                    margin: 20px 0;
-                }}
-                .meeting-details h3 {{
-                    color: #667eea;
-                    margin-top: 0;
-                }}
-                table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                }}
-                td {{
-                    padding: 8px 0;
-                }}
-                td:first-child {{
-                    font-weight: bold;
-                    color: #555;
-                    width: 30%;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                {template.content}
-                <div class="footer">
-                    <p>Generated by SmartMeetingAI</p>
-                    <p>Date: {datetime.now().strftime('%B %d, %Y')}</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        # Create response with HTML file
-        from io import BytesIO
+        # Rendered once per template version; repeat downloads are served from the stored artifact
+        try:
+            path, etag = get_export_artifact(template, fmt)
+        except PdfUnavailable as e:
+            return jsonify({'error': str(e)}), 501
+        except (PdfQueueFull, TimeoutError):
+            response = jsonify({'error': 'PDF rendering is busy, please retry shortly'})
+            response.headers['Retry-After'] = '5'
+            return response, 503
+        
+        # send_file streams the file and answers If-None-Match / If-Modified-Since / Range itself
         response = send_file(
-            BytesIO(html_content.encode('utf-8')),
-            mimetype='text/html',
+            path,
+            mimetype=EXPORT_FORMATS[fmt][1],
             as_attachment=True,
-            download_name=f"{template.title.replace(' ', '_')}_meeting_invitation.html"
+            download_name=export_filename(template, fmt),
+            etag=etag,
+            last_modified=template.updated_at or template.created_at,
+            max_age=0
         )
+        response.cache_control.private = True
         
         return response
         
@@ -447,7 +694,18 @@ def health_check():
         'module': 'SmartMeetingAI Flask'
     })
 
+@app.route('/api/metrics')
+def metrics():
+    """Prometheus metrics of this process"""
+    if not app.config['METRICS_ENABLED']:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    token = app.config.get('METRICS_TOKEN')
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'error': 'Unauthorized'}), 401
+    return Response(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        if not init_database():
+            sys.exit(1)
     app.run(debug=False, host='0.0.0.0', port=5001) 
\ No newline at end of file
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Rebuild the per-user statistics rollup from the raw tables.
+
+Use after bulk imports or manual data fixes: python rebuild_stats.py [user_id]
+"""
+import os
+import sys
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import app, db
+from utils.stats_service import rebuild_user_stats
+
+def rebuild(user_id=None):
+    """Recompute UserStats for one user, or for everyone"""
+    with app.app_context():
+        with db.engine.begin() as connection:
+            count = rebuild_user_stats(connection, user_id)
+        print(f"Rebuilt statistics for {count} user(s)")
+
+if __name__ == "__main__":
+    rebuild(int(sys.argv[1]) if len(sys.argv) > 1 else None)
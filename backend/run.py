@@ -8,16 +8,16 @@ import sys
 # Add the backend directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from main import app, db
+from main import app, init_database
 
 if __name__ == '__main__':
     # Set production environment
     os.environ['FLASK_ENV'] = 'production'
     
-    # Create database tables
+    # Create database tables (gunicorn deployments run `flask --app main init-db` instead)
     with app.app_context():
-        db.create_all()
-        print("Database tables created successfully!")
+        if not init_database():
+            sys.exit(1)
     
     # Run the application
     print("Starting SmartMeetingAI in production mode...")
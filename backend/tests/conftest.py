@@ -0,0 +1,99 @@
+import os
+import socket
+import sys
+import tempfile
+
+import pytest
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# main reads DATABASE_URL when imported; keep the tests away from instance/smartmeeting.db
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='smartmeeting-tests-'), 'main.db')}"
+
+from flask import Flask
+
+import main
+from db import init_db
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Build apps on their own SQLite files, sharing main's models and session hooks"""
+    def build(name='test.db'):
+        app = Flask(__name__)
+        app.config.update(main.app.config)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / name}"
+        app.config.pop('SQLALCHEMY_BINDS', None)
+        app.config['TESTING'] = True
+        init_db(app)
+        return app
+    return build
+
+
+@pytest.fixture
+def app(make_app):
+    """App with a fully migrated database and the demo user"""
+    app = make_app()
+    with app.app_context():
+        assert main.init_database()
+        yield app
+        main.db.session.remove()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client for main.app, logged in as the demo user; queued jobs are not picked up"""
+    with main.app.app_context():
+        assert main.init_database()
+    monkeypatch.setattr(main.distribution_workers, 'notify', lambda: None)
+    client = main.app.test_client()
+    response = client.post('/auth', json={'action': 'login', 'email': 'demo@example.com', 'password': 'demo123'})
+    assert response.status_code == 200
+    return client
+
+
+class SMTPRecorder:
+    """aiosmtpd handler recording the client port of each login and delivered message"""
+
+    def __init__(self):
+        self.messages = []
+        self.logins = []
+
+    def authenticate(self, server, session, envelope, mechanism, auth_data):
+        from aiosmtpd.smtp import AuthResult
+        self.logins.append(session.peer[1])
+        return AuthResult(success=auth_data.password != b'wrong', handled=False)
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((session.peer[1], envelope.mail_from, list(envelope.rcpt_tos), envelope.content))
+        return '250 OK'
+
+
+@pytest.fixture
+def smtp_server():
+    """Local SMTP stand-in (no TLS, any password but 'wrong' accepted); restart() drops every open session"""
+    controller_module = pytest.importorskip('aiosmtpd.controller')
+
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    recorder = SMTPRecorder()
+
+    def start():
+        controller = controller_module.Controller(
+            recorder, hostname='127.0.0.1', port=port, auth_require_tls=False, authenticator=recorder.authenticate
+        )
+        controller.start()
+        return controller
+
+    server = {'controller': start()}
+    recorder.host, recorder.port = '127.0.0.1', port
+
+    def restart():
+        server['controller'].stop()
+        server['controller'] = start()
+
+    recorder.restart = restart
+    yield recorder
+    server['controller'].stop()
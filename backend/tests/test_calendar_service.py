@@ -0,0 +1,63 @@
+import io
+import zipfile
+from datetime import date, time
+
+import main
+from utils.calendar_service import CalendarInvite, iter_distribution_ics_zip
+from utils.recipient_service import add_recipients
+
+
+def _properties(ics):
+    """(name, value) pairs of an .ics file, with folded lines joined back up"""
+    lines = ics.decode('utf-8').replace('\r\n ', '').split('\r\n')
+    assert lines.pop() == ''
+    pairs = []
+    for line in lines:
+        head, value = line.split(':', 1)
+        pairs.append((head.split(';', 1)[0], value))
+    return pairs
+
+
+def _template(**fields):
+    user = main.User.query.first()
+    values = {'title': 'Kickoff', 'content': '<p>Kickoff</p>', 'meeting_topic': 'Kickoff, Q3', 'meeting_date': date(2026, 3, 10),
+              'meeting_time': time(9, 30), 'duration': '90 minutes', 'location': 'Room 4', 'user_id': user.id}
+    values.update(fields)
+    template = main.Template(**values)
+    main.db.session.add(template)
+    main.db.session.commit()
+    return template
+
+
+def test_invite_escapes_text_and_cannot_be_split_into_extra_properties(app):
+    template = _template(meeting_link='https://meet.example.com/x\r\nATTENDEE:mailto:evil@example.com')
+    invite = CalendarInvite(template, organizer='host@example.com', timezone='Europe/Paris')
+
+    properties = _properties(invite.render_for('ada@example.com', 'Ada "The Countess" Lovelace'))
+    names = [name for name, _ in properties]
+    values = dict(properties)
+    assert names.count('ATTENDEE') == 1
+    assert values['URL'] == 'https://meet.example.com/x%0D%0AATTENDEE:mailto:evil@example.com'
+    assert values['SUMMARY'] == 'Kickoff\\, Q3'
+    assert values['DTSTART'] == '20260310T083000Z' and values['DTEND'] == '20260310T100000Z'
+    assert values['METHOD'] == 'REQUEST' and values['ORGANIZER'] == 'mailto:host@example.com'
+    assert values['ATTENDEE'] == 'mailto:ada@example.com'
+    assert names[0] == 'BEGIN' and names[-2:] == ['END', 'END']
+
+
+def test_zip_has_one_uniquely_named_invite_per_recipient(app):
+    template = _template()
+    user = main.User.query.first()
+    distribution = main.Distribution(template_id=template.id, method='calendar', status='sent', user_id=user.id)
+    main.db.session.add(distribution)
+    main.db.session.flush()
+    addresses = ['a/b@example.com', 'a_b@example.com', 'grace@example.com']
+    add_recipients(distribution.id, 'email', addresses)
+    main.db.session.commit()
+
+    archive = zipfile.ZipFile(io.BytesIO(b''.join(iter_distribution_ics_zip(distribution.id, CalendarInvite(template)))))
+    assert archive.testzip() is None
+    names = archive.namelist()
+    assert names == ['a_b@example.com-1.ics', 'a_b@example.com-2.ics', 'grace@example.com-3.ics']
+    attendees = [dict(_properties(archive.read(name)))['ATTENDEE'] for name in names]
+    assert attendees == [f'mailto:{address}' for address in addresses]
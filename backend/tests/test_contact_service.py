@@ -0,0 +1,67 @@
+import pytest
+
+import main
+from utils.contact_service import ContactImportError, count_contacts, get_contact_list, import_contacts, list_contact_lists
+
+
+def _user_id():
+    return main.User.query.first().id
+
+
+def test_import_deduplicates_across_chunks(app):
+    rows = [['Name', 'Email']] + [[f'User {i}', f'user{i % 5}@example.com'] for i in range(12)] + [['Bad', 'nope']]
+    contact_list, invalid = import_contacts(_user_id(), 'Team', rows, chunk_size=4)
+
+    assert (contact_list.contact_count, contact_list.duplicate_count, contact_list.invalid_count) == (5, 7, 1)
+    assert invalid == [{'line': 14, 'row': ['Bad', 'nope']}]
+    assert main.Contact.query.filter_by(list_id=contact_list.id).count() == 5
+
+
+def test_failed_import_leaves_no_partial_list(app):
+    def rows():
+        yield ['Email']
+        for i in range(10):
+            yield [f'user{i}@example.com']
+        raise ContactImportError('truncated upload')
+
+    with pytest.raises(ContactImportError):
+        import_contacts(_user_id(), 'Broken', rows(), chunk_size=3)
+    assert main.ContactList.query.count() == 0
+    assert main.Contact.query.count() == 0
+
+
+def test_list_is_hidden_until_the_import_finishes(app):
+    user_id = _user_id()
+    seen_while_importing = []
+
+    def rows():
+        yield ['Email']
+        for i in range(6):
+            if i == 4:
+                importing = main.ContactList.query.filter_by(name='Staff').one()
+                seen_while_importing.append((list_contact_lists(user_id), get_contact_list(importing.id, user_id)))
+            yield [f'user{i}@example.com']
+
+    contact_list, _ = import_contacts(user_id, 'Staff', rows(), chunk_size=2)
+    assert seen_while_importing == [([], None)]
+    assert contact_list.status == 'ready'
+    assert [entry['id'] for entry in list_contact_lists(user_id)] == [contact_list.id]
+    assert get_contact_list(contact_list.id, user_id) is contact_list
+
+
+def test_duplicates_are_found_per_channel(app):
+    rows = [['Name', 'Email', 'Phone'],
+            ['Ada', 'ada@example.com', '+14155550001'],
+            ['Ada (mobile)', 'ADA@example.com', '+14155550002'],
+            ['Ada again', 'ada@example.com', '+14155550001'],
+            ['Grace', 'grace@example.com', '+14155550002']]
+    contact_list, _ = import_contacts(_user_id(), 'Team', rows, chunk_size=2)
+
+    contacts = main.Contact.query.filter_by(list_id=contact_list.id).order_by(main.Contact.id).all()
+    assert [(c.name, c.email, c.phone) for c in contacts] == [
+        ('Ada', 'ada@example.com', '+14155550001'),
+        ('Ada (mobile)', None, '+14155550002'),
+        ('Grace', 'grace@example.com', None),
+    ]
+    assert (contact_list.contact_count, contact_list.duplicate_count) == (3, 1)
+    assert (count_contacts(contact_list.id, 'email'), count_contacts(contact_list.id, 'phone')) == (2, 2)
@@ -0,0 +1,35 @@
+import pytest
+
+import main
+
+
+@pytest.fixture
+def template_id(client):
+    with main.app.app_context():
+        user = main.User.query.filter_by(email='demo@example.com').first()
+        template = main.Template(title='Kickoff', content='<p>Kickoff</p>', user_id=user.id)
+        main.db.session.add(template)
+        main.db.session.commit()
+        return template.id
+
+
+def test_gmail_accepts_string_and_object_recipients(client, template_id):
+    response = client.post('/api/distribution/gmail', json={'templateId': template_id, 'recipients': [
+        'Ada Lovelace <ada@example.com>',
+        {'email': 'grace@example.com', 'name': 'Grace', 'timezone': 'Europe/Paris'},
+    ]})
+    assert response.status_code == 202
+    with main.app.app_context():
+        rows = main.DistributionRecipient.query.filter_by(distribution_id=response.json['distribution_id']).order_by(
+            main.DistributionRecipient.id
+        ).all()
+        assert [(r.address, r.name, r.timezone) for r in rows] == [
+            ('ada@example.com', 'Ada Lovelace', None), ('grace@example.com', 'Grace', 'Europe/Paris')
+        ]
+
+
+@pytest.mark.parametrize('recipients', [[42], [None], [['a@example.com']], [{'email': 7}], [{'email': 'a@example.com', 'name': {}}]])
+def test_gmail_rejects_malformed_recipients(client, template_id, recipients):
+    response = client.post('/api/distribution/gmail', json={'templateId': template_id, 'recipients': recipients})
+    assert response.status_code == 400
+    assert 'Recipients must be' in response.json['error']
@@ -0,0 +1,77 @@
+from email import policy
+from email.parser import BytesParser
+from types import SimpleNamespace
+
+import main
+from utils.distribution_jobs import enqueue_gmail_distribution, process_distribution_job
+from utils.email_service import PreparedMessage, send_many
+from utils.job_queue import JobWorkerPool
+from utils.smtp_pool import SMTPConnectionPool, close_all_pools
+
+
+def test_job_sends_through_the_configured_smtp_host(app, smtp_server):
+    app.config.update(SMTP_HOST=smtp_server.host, SMTP_PORT=smtp_server.port, SMTP_USE_TLS=False,
+                      GMAIL_USER='sender@example.com', GMAIL_PASSWORD='app-password')
+    user = main.User.query.first()
+    template = main.Template(title='Kickoff', content='<p>Kickoff</p>', user_id=user.id)
+    main.db.session.add(template)
+    main.db.session.commit()
+    enqueue_gmail_distribution(template, ['ada@example.com', 'grace@example.com'], 'Kickoff', user.id)
+
+    job_id, token = JobWorkerPool(app, handler=process_distribution_job)._claim()
+    try:
+        # Sends run on scheduler threads without an app context
+        process_distribution_job(job_id, token)
+    finally:
+        close_all_pools()
+
+    job = main.db.session.get(main.DistributionJob, job_id)
+    assert (job.status, job.succeeded, job.failed) == ('completed', 2, 0)
+    assert sorted(rcpt for _, _, rcpts, _ in smtp_server.messages for rcpt in rcpts) == ['ada@example.com', 'grace@example.com']
+    assert {mail_from for _, mail_from, _, _ in smtp_server.messages} == {'sender@example.com'}
+
+
+def _parse(data):
+    return BytesParser(policy=policy.default).parsebytes(data)
+
+
+def test_prepared_message_matches_a_freshly_built_one():
+    body = '<html><body><p>Réunion — ordre du jour</p></body></html>'
+    prepared = PreparedMessage(body, 'Kickoff ✓', 'sender@example.com', [('agenda.pdf', b'%PDF-1.7 agenda', 'application/pdf')])
+    first_id, first = prepared.render('ada@example.com')
+    second_id, second = prepared.render('grace@example.com', '<p>Only for Grace</p>')
+
+    message = _parse(first)
+    assert (message['To'], message['From'], message['Subject']) == ('ada@example.com', 'sender@example.com', 'Kickoff ✓')
+    assert message['Message-ID'] == first_id != second_id
+    assert message.get_body(('html',)).get_content() == body
+    [attachment] = list(message.iter_attachments())
+    assert (attachment.get_filename(), attachment.get_content()) == ('agenda.pdf', b'%PDF-1.7 agenda')
+    assert _parse(second).get_body(('html',)).get_content() == '<p>Only for Grace</p>'
+    assert list(_parse(second).iter_attachments())[0].get_content() == b'%PDF-1.7 agenda'
+
+
+def test_prepared_message_adds_each_recipient_to_the_calendar_part():
+    invite = SimpleNamespace(method='REQUEST', render_for=lambda address, name: f'ATTENDEE;CN={name}:mailto:{address}\r\n'.encode())
+    prepared = PreparedMessage('<p>Kickoff</p>', 'Kickoff', 'sender@example.com', calendar=invite)
+    message = _parse(prepared.render('ada@example.com', name='Ada')[1])
+
+    calendar = next(part for part in message.walk() if part.get_content_type() == 'text/calendar')
+    assert calendar.get_param('method') == 'REQUEST'
+    assert calendar.get_content() == 'ATTENDEE;CN=Ada:mailto:ada@example.com\r\n'
+    assert message.get_body(('html',)).get_content() == '<p>Kickoff</p>'
+
+
+def test_send_many_reuses_one_body_over_one_session(smtp_server):
+    pool = SMTPConnectionPool(smtp_server.host, smtp_server.port, 'sender@example.com', 'app-password', use_tls=False, timeout=5)
+    try:
+        results = send_many(['ada@example.com', 'grace@example.com'], '<p>Kickoff</p>', 'Kickoff',
+                            'sender@example.com', 'app-password', pool=pool)
+    finally:
+        pool.close()
+
+    assert [result['success'] for result in results] == [True, True]
+    messages = [_parse(content) for _, _, _, content in smtp_server.messages]
+    assert [message['To'] for message in messages] == ['ada@example.com', 'grace@example.com']
+    assert {message.get_body(('html',)).get_content() for message in messages} == {'<p>Kickoff</p>'}
+    assert len({port for port, _, _, _ in smtp_server.messages}) == 1
@@ -0,0 +1,88 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import main
+from utils import export_service
+
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setitem(main.app.config, 'EXPORT_DIR', str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+    render = export_service.EXPORT_RENDERERS['html']
+
+    def counting(template, etag=None):
+        calls.append(template.id)
+        return render(template, etag)
+    monkeypatch.setitem(export_service.EXPORT_RENDERERS, 'html', counting)
+    return calls
+
+
+@pytest.fixture
+def template_id(client):
+    with main.app.app_context():
+        user = main.User.query.filter_by(email='demo@example.com').first()
+        template = main.Template(title='Kickoff Review', content='<p>Kickoff agenda</p>', user_id=user.id)
+        main.db.session.add(template)
+        main.db.session.commit()
+        return template.id
+
+
+def _update(template_id, **fields):
+    with main.app.app_context():
+        template = main.db.session.get(main.Template, template_id)
+        for name, value in fields.items():
+            setattr(template, name, value)
+        main.db.session.commit()
+
+
+def test_repeat_downloads_are_served_from_one_artifact(client, export_dir, renders, template_id):
+    first = client.get(f'/api/templates/{template_id}/download')
+    assert first.status_code == 200
+    assert first.headers['Content-Disposition'] == 'attachment; filename=Kickoff_Review_meeting_invitation.html'
+    assert b'<p>Kickoff agenda</p>' in first.data
+    etag = first.headers['ETag']
+
+    second = client.get(f'/api/templates/{template_id}/download')
+    assert (second.status_code, second.headers['ETag'], second.data) == (200, etag, first.data)
+
+    revalidated = client.get(f'/api/templates/{template_id}/download', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304 and revalidated.data == b''
+    assert renders == [template_id]
+    assert len(os.listdir(export_dir)) == 1
+
+
+@pytest.mark.parametrize('change', [
+    {'content': '<p>New agenda</p>'},
+    {'updated_at': datetime.utcnow() + timedelta(hours=1)},
+])
+def test_changed_templates_get_a_new_artifact(client, export_dir, renders, template_id, change):
+    etag = client.get(f'/api/templates/{template_id}/download').headers['ETag']
+    _update(template_id, **change)
+
+    response = client.get(f'/api/templates/{template_id}/download', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.headers['ETag'] != etag
+    if 'content' in change:
+        assert b'<p>New agenda</p>' in response.data
+    assert renders == [template_id, template_id]
+    assert os.listdir(export_dir) == [f"{template_id}-{response.headers['ETag'].strip(chr(34))}.html"]
+
+
+def test_download_checks_format_and_ownership(client, export_dir, template_id):
+    assert client.get(f'/api/templates/{template_id}/download?format=docx').status_code == 400
+    with main.app.app_context():
+        other = main.User(username='export-other', email='export-other@example.com', password_hash='x')
+        main.db.session.add(other)
+        main.db.session.flush()
+        template = main.Template(title='Private', content='<p>x</p>', user_id=other.id)
+        main.db.session.add(template)
+        main.db.session.commit()
+        other_id = template.id
+    assert client.get(f'/api/templates/{other_id}/download').status_code == 404
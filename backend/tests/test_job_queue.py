@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import main
+from utils.job_queue import JobReclaimed, JobWorkerPool, renew_claim
+
+
+@pytest.fixture
+def pool(app):
+    return JobWorkerPool(app, handler=lambda job_id, claim_token: None, stale_after=300)
+
+
+def _job(created_at, status='queued', heartbeat_at=None):
+    user = main.User.query.first()
+    template = main.Template(title='Kickoff', content='<p>Kickoff</p>', user_id=user.id)
+    main.db.session.add(template)
+    main.db.session.flush()
+    distribution = main.Distribution(template_id=template.id, method='gmail', status='sending', user_id=user.id)
+    main.db.session.add(distribution)
+    main.db.session.flush()
+    job = main.DistributionJob(distribution_id=distribution.id, kind='gmail', payload='{}', status=status,
+                               created_at=created_at, heartbeat_at=heartbeat_at, user_id=user.id)
+    main.db.session.add(job)
+    main.db.session.commit()
+    return job.id
+
+
+def _get(job_id):
+    main.db.session.expire_all()
+    return main.db.session.get(main.DistributionJob, job_id)
+
+
+def test_claims_oldest_queued_job_once(pool):
+    now = datetime.utcnow()
+    newer = _job(now)
+    older = _job(now - timedelta(minutes=1))
+
+    first = pool._claim()
+    second = pool._claim()
+    assert [first[0], second[0]] == [older, newer]
+    assert pool._claim() is None
+    assert _get(older).status == 'running' and _get(older).claim_token == first[1]
+    assert first[1] != second[1]
+
+
+def test_running_job_is_reclaimed_only_when_stale(pool):
+    now = datetime.utcnow()
+    fresh = _job(now, status='running', heartbeat_at=now - timedelta(seconds=10))
+    assert pool._claim() is None
+
+    stale = _job(now, status='running', heartbeat_at=now - timedelta(seconds=600))
+    job_id, token = pool._claim()
+    assert job_id == stale
+    assert _get(stale).heartbeat_at > now - timedelta(seconds=1)
+    assert _get(fresh).claim_token is None
+
+
+def test_reclaimed_job_fences_out_the_previous_worker(pool):
+    job_id = _job(datetime.utcnow())
+    _, old_token = pool._claim()
+    renew_claim(job_id, old_token)
+    main.db.session.commit()
+
+    # The first worker stalls past stale_after and a second worker takes the job over
+    main.DistributionJob.query.filter_by(id=job_id).update({'heartbeat_at': datetime.utcnow() - timedelta(seconds=600)})
+    main.db.session.commit()
+    _, new_token = pool._claim()
+
+    with pytest.raises(JobReclaimed):
+        renew_claim(job_id, old_token)
+    renew_claim(job_id, new_token)
+    main.db.session.commit()
+
+    pool._mark_failed(job_id, old_token, 'stale worker crashed')
+    assert _get(job_id).status == 'running'
+    pool._mark_failed(job_id, new_token, 'boom')
+    assert (_get(job_id).status, _get(job_id).error) == ('failed', 'boom')
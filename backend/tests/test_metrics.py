@@ -0,0 +1,102 @@
+import re
+
+import pytest
+
+import main
+from utils import metrics
+from utils.metrics import CallbackMetric, Histogram, init_metrics, render_metrics
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def _samples(text):
+    """(name, labels dict, value) for every sample line; fails on anything not in the text format"""
+    assert text.endswith('\n')
+    samples = []
+    for line in text.splitlines():
+        if line.startswith('# '):
+            assert re.match(r'^# (HELP|TYPE) [a-zA-Z_:][a-zA-Z0-9_:]* ', line), line
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        name, labels, value = match.groups()
+        assert LABEL.sub('', labels or '').replace(',', '') == '', line
+        samples.append((name, dict(LABEL.findall(labels or '')), float(value)))
+    return samples
+
+
+@pytest.fixture
+def request_metrics():
+    histograms = (metrics.REQUEST_LATENCY, metrics.REQUEST_QUERIES, metrics.REQUEST_DB_TIME)
+    for histogram in histograms:
+        histogram.reset()
+    yield
+    for histogram in histograms:
+        histogram.reset()
+
+
+def test_histogram_exposition_is_cumulative_and_escaped():
+    histogram = Histogram('test_seconds', 'Test latency', ('route',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe('a "quoted"\nroute', value)
+
+    samples = _samples('\n'.join(histogram.collect()) + '\n')
+    assert samples == [
+        ('test_seconds_bucket', {'route': 'a \\"quoted\\"\\nroute', 'le': '0.1'}, 1.0),
+        ('test_seconds_bucket', {'route': 'a \\"quoted\\"\\nroute', 'le': '1.0'}, 3.0),
+        ('test_seconds_bucket', {'route': 'a \\"quoted\\"\\nroute', 'le': '+Inf'}, 4.0),
+        ('test_seconds_sum', {'route': 'a \\"quoted\\"\\nroute'}, 4.05),
+        ('test_seconds_count', {'route': 'a \\"quoted\\"\\nroute'}, 4.0),
+    ]
+    assert histogram.snapshot()['a "quoted"\nroute']['buckets'] == {'0.1': 1, '1.0': 3, '+Inf': 4}
+
+
+def test_failing_callback_metrics_are_skipped():
+    assert CallbackMetric('broken', 'Broken', 'gauge', (), lambda: 1 / 0).collect() == []
+    assert CallbackMetric('ok', 'Fine', 'gauge', ('kind',), lambda: {('a',): 2}).collect()[-1] == 'ok{kind="a"} 2'
+
+
+def test_requests_are_timed_per_endpoint_with_query_counts(make_app, request_metrics):
+    app = make_app('metrics.db')
+    app.config['METRICS_ENABLED'] = True
+
+    @app.route('/users/<int:user_id>')
+    def user_page(user_id):
+        main.db.session.execute(main.db.select(main.User).where(main.User.id == user_id)).all()
+        main.db.session.execute(main.db.select(main.User)).all()
+        return 'ok'
+
+    init_metrics(app, main.db)
+    with app.app_context():
+        main.db.create_all()
+    client = app.test_client()
+    for user_id in (1, 2):
+        response = client.get(f'/users/{user_id}')
+        assert re.fullmatch(r'db;dur=[\d.]+;desc="2 queries", app;dur=[\d.]+', response.headers['Server-Timing'])
+    assert client.get('/missing').status_code == 404
+
+    samples = _samples(render_metrics())
+    counts = {(s[1]['endpoint'], s[1].get('status')): s[2] for s in samples
+              if s[0] == 'smartmeeting_http_request_duration_seconds_count'}
+    assert counts == {('user_page', '200'): 2, ('unmatched', '404'): 1}
+    queries = {s[1]['le']: s[2] for s in samples
+               if s[0] == 'smartmeeting_http_request_db_queries_bucket' and s[1]['endpoint'] == 'user_page'}
+    assert (queries['1.0'], queries['2.0'], queries['+Inf']) == (0, 2, 2)
+
+
+def test_metrics_endpoint_checks_config_and_token(client, monkeypatch):
+    monkeypatch.setitem(main.app.config, 'METRICS_ENABLED', False)
+    assert client.get('/api/metrics').status_code == 404
+
+    monkeypatch.setitem(main.app.config, 'METRICS_ENABLED', True)
+    monkeypatch.setitem(main.app.config, 'METRICS_TOKEN', 'scrape-token')
+    assert client.get('/api/metrics').status_code == 401
+    response = client.get('/api/metrics', headers={'Authorization': 'Bearer scrape-token'})
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+    text = response.get_data(as_text=True)
+    assert '# TYPE smartmeeting_http_request_duration_seconds histogram' in text
+    samples = _samples(text)
+    states = {labels['state']: value for name, labels, value in samples if name == 'smartmeeting_openai_circuit_state'}
+    assert sorted(states) == ['closed', 'half_open', 'open'] and sum(states.values()) == 1
@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+import main
+from utils.migrations import MIGRATIONS
+
+# Schema of the first release, before any migration existed
+BASELINE_SCHEMA = (
+    'CREATE TABLE user (id INTEGER PRIMARY KEY, username VARCHAR(80) NOT NULL UNIQUE,'
+    ' email VARCHAR(120) NOT NULL UNIQUE, password_hash VARCHAR(120) NOT NULL, created_at DATETIME)',
+    'CREATE TABLE template (id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL, content TEXT NOT NULL,'
+    ' meeting_topic VARCHAR(200), speaker_name VARCHAR(100), meeting_date DATE, meeting_time TIME,'
+    ' duration VARCHAR(50), meeting_link VARCHAR(500), location VARCHAR(200), attendees TEXT,'
+    ' additional_notes TEXT, meeting_type VARCHAR(50), priority VARCHAR(20), created_at DATETIME,'
+    ' user_id INTEGER NOT NULL REFERENCES user (id))',
+    'CREATE TABLE distribution (id INTEGER PRIMARY KEY, template_id INTEGER NOT NULL REFERENCES template (id),'
+    ' method VARCHAR(20) NOT NULL, recipients TEXT, status VARCHAR(20), sent_at DATETIME, created_at DATETIME,'
+    ' user_id INTEGER NOT NULL REFERENCES user (id))',
+)
+
+
+def _applied_versions():
+    return [row[0] for row in main.db.session.execute(text('SELECT version FROM schema_migrations ORDER BY version'))]
+
+
+def test_fresh_database_applies_every_migration(app):
+    assert _applied_versions() == [version for version, _, _ in MIGRATIONS]
+    columns = {c['name'] for c in inspect(main.db.engine).get_columns('distribution_recipient')}
+    assert {'name', 'timezone', 'attempts'} <= columns
+
+
+def test_upgrade_from_baseline_schema(make_app):
+    app = make_app('baseline.db')
+    created = datetime(2024, 5, 1, 9, 30)
+    with app.app_context():
+        with main.db.engine.begin() as connection:
+            for statement in BASELINE_SCHEMA:
+                connection.execute(text(statement))
+            connection.execute(text(
+                "INSERT INTO user (id, username, email, password_hash, created_at)"
+                " VALUES (1, 'legacy', 'legacy@example.com', 'x', :t)"
+            ), {'t': created})
+            connection.execute(text(
+                "INSERT INTO template (id, title, content, created_at, user_id)"
+                " VALUES (1, 'Kickoff', '<html><body>Kickoff</body></html>', :t, 1)"
+            ), {'t': created})
+            connection.execute(text(
+                "INSERT INTO distribution (id, template_id, method, recipients, status, sent_at, created_at, user_id)"
+                " VALUES (1, 1, 'gmail', :r, 'sent', :t, :t, 1)"
+            ), {'r': '[{"email": "a@example.com"}, {"email": "b@example.com"}]', 't': created})
+
+        assert main.init_database()
+        assert _applied_versions() == [version for version, _, _ in MIGRATIONS]
+
+        recipients = main.db.session.execute(text(
+            'SELECT address, status, attempts FROM distribution_recipient ORDER BY address'
+        )).fetchall()
+        assert [tuple(row) for row in recipients] == [('a@example.com', 'sent', 0), ('b@example.com', 'sent', 0)]
+
+        template = main.db.session.get(main.Template, 1)
+        assert template.content == '<html><body>Kickoff</body></html>'
+        assert template.updated_at == created
+
+        stats = main.db.session.get(main.UserStats, 1)
+        assert (stats.templates_generated, stats.total_recipients, stats.recipients_succeeded) == (1, 2, 2)
+
+        # A second run is a no-op
+        assert main.init_database()
+        main.db.session.remove()
+
+
+def test_failed_migration_reports_failure(make_app, monkeypatch):
+    def broken(connection):
+        raise RuntimeError('boom')
+    monkeypatch.setattr('utils.migrations.MIGRATIONS', MIGRATIONS + [(max(v for v, _, _ in MIGRATIONS) + 1, 'broken', broken)])
+    app = make_app()
+    with app.app_context():
+        assert main.init_database() is False
+        main.db.session.remove()
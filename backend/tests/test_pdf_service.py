@@ -0,0 +1,124 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import main
+from utils import export_service
+from utils.pdf_service import PdfQueueFull, PdfRenderPool, fetch_inline_only
+
+
+@pytest.mark.parametrize('url', [
+    'file:///etc/passwd',
+    'FILE:///etc/passwd',
+    'http://169.254.169.254/latest/meta-data/',
+    'https://example.com/logo.png',
+    '/etc/passwd',
+])
+def test_fetcher_refuses_non_inline_urls(url):
+    with pytest.raises(ValueError):
+        fetch_inline_only(url)
+
+
+class GatedRender:
+    """Render function that records its inputs and blocks until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.rendered = []
+
+    def __call__(self, html):
+        self.rendered.append(html)
+        assert self.release.wait(5)
+        return html.encode('utf-8')
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def build(render, workers=1, max_pending=4):
+        # Threads instead of spawned processes: the queueing logic is the same and the tests stay fast
+        pool = PdfRenderPool(workers=workers, max_pending=max_pending, render=render)
+        pool._executor = ThreadPoolExecutor(workers)
+        pools.append(pool)
+        return pool
+    yield build
+    for pool in pools:
+        pool.shutdown()
+
+
+def test_renders_in_worker_processes():
+    pool = PdfRenderPool(workers=2, render=str.encode)
+    try:
+        futures = [pool.submit(f'<p>{i}</p>') for i in range(4)]
+        assert [future.result(60) for future in futures] == [f'<p>{i}</p>'.encode() for i in range(4)]
+    finally:
+        pool.shutdown()
+
+
+def test_queued_renders_run_in_submission_order(make_pool):
+    render = GatedRender()
+    pool = make_pool(render)
+    futures = [pool.submit(f'<p>{i}</p>') for i in range(3)]
+    render.release.set()
+    assert [future.result(5) for future in futures] == [b'<p>0</p>', b'<p>1</p>', b'<p>2</p>']
+    assert render.rendered == ['<p>0</p>', '<p>1</p>', '<p>2</p>']
+
+
+def test_same_key_shares_the_in_flight_render(make_pool):
+    render = GatedRender()
+    pool = make_pool(render)
+    first = pool.submit('<p>a</p>', key=(1, 'etag'))
+    assert pool.submit('<p>a</p>', key=(1, 'etag')) is first
+    render.release.set()
+    first.result(5)
+    assert pool.submit('<p>a</p>', key=(1, 'etag')).result(5) == b'<p>a</p>'
+    assert (pool.stats()['submitted'], pool.stats()['deduplicated'], pool.stats()['in_flight']) == (2, 1, 0)
+
+
+def test_full_queue_rejects_after_waiting(make_pool):
+    render = GatedRender()
+    pool = make_pool(render, max_pending=1)
+    pool.submit('<p>a</p>')
+    with pytest.raises(PdfQueueFull):
+        pool.submit('<p>b</p>', wait=0.05)
+    assert pool.stats()['rejected'] == 1
+    render.release.set()
+    assert pool.render('<p>c</p>', wait=5, timeout=5) == b'<p>c</p>'
+
+
+def test_render_times_out_while_the_worker_is_busy(make_pool):
+    render = GatedRender()
+    pool = make_pool(render)
+    with pytest.raises(TimeoutError):
+        pool.render('<p>slow</p>', timeout=0.05)
+    render.release.set()
+
+
+@pytest.fixture
+def pdf_template_id(client, tmp_path, monkeypatch):
+    monkeypatch.setitem(main.app.config, 'EXPORT_DIR', str(tmp_path))
+    with main.app.app_context():
+        user = main.User.query.filter_by(email='demo@example.com').first()
+        template = main.Template(title='Kickoff', content='<p>Kickoff</p>', user_id=user.id)
+        main.db.session.add(template)
+        main.db.session.commit()
+        return template.id
+
+
+@pytest.mark.parametrize('error', [PdfQueueFull('busy'), TimeoutError()])
+def test_busy_pdf_downloads_ask_the_client_to_retry(client, pdf_template_id, monkeypatch, error):
+    class BusyPool:
+        def render(self, html, key=None, wait=0, timeout=None):
+            raise error
+
+    monkeypatch.setattr(export_service, 'pdf_available', lambda: True)
+    monkeypatch.setattr(export_service, 'get_pdf_pool', BusyPool)
+    response = client.get(f'/api/templates/{pdf_template_id}/download?format=pdf')
+    assert response.status_code == 503 and response.headers['Retry-After'] == '5'
+
+
+def test_pdf_download_without_weasyprint_is_not_implemented(client, pdf_template_id, monkeypatch):
+    monkeypatch.setattr(export_service, 'pdf_available', lambda: False)
+    assert client.get(f'/api/templates/{pdf_template_id}/download?format=pdf').status_code == 501
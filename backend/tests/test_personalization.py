@@ -0,0 +1,79 @@
+from collections import namedtuple
+from datetime import date, datetime, time
+
+import pytest
+from jinja2 import Environment
+
+from utils.personalization import (
+    PLACEHOLDER_PATTERN, MeetingContext, PersonalizedTemplate, get_timezone, name_from_email, personalize
+)
+
+Recipient = namedtuple('Recipient', 'id address name timezone')
+Template = namedtuple('Template', 'meeting_date meeting_time meeting_topic meeting_link')
+
+RSVP_URL = 'https://example.com/rsvp?d={distribution_id}&r={recipient_id}&e={email}'
+RECIPIENTS = [
+    Recipient(1, 'ada@example.com', 'Ada Lovelace', 'Europe/Paris'),
+    Recipient(2, 'grace.hopper@example.com', None, None),
+    Recipient(3, 'x@example.com', '<b>O\'Brien & "Co"</b>', 'Not/AZone'),
+    Recipient(4, 'jo+news@example.com', '', 'Asia/Kolkata'),
+]
+CONTENTS = [
+    '<html><body><p>Hi {{recipient_name}}, see you at {{local_time}}</p><a href="{{rsvp_link}}">RSVP</a></body></html>',
+    # Placeholders at both ends, back to back, with inner spaces and next to CSS braces
+    '{{recipient_name}}{{ recipient_email }}<style>p {color: red}</style>{{{local_time}}}{{rsvp_link}}',
+    # Near misses are left alone
+    '<p>{{recipient_</p><p>name}} {{ unknown }} {recipient_name}</p>',
+]
+
+
+def _context():
+    template = Template(date(2026, 3, 10), time(9, 30), 'Kickoff & Review', 'https://meet.example.com/k')
+    return MeetingContext.for_template(template, distribution_id=7, timezone='America/New_York', rsvp_url_template=RSVP_URL)
+
+
+def _jinja_renders(content, recipients):
+    """Reference output: the placeholders as Jinja expressions, rendered per recipient with autoescape"""
+    source = '{% raw %}' + PLACEHOLDER_PATTERN.sub(r'{% endraw %}{{ \1 }}{% raw %}', content) + '{% endraw %}'
+    template = Environment(autoescape=True).from_string(source)
+    start = datetime(2026, 3, 10, 9, 30, tzinfo=get_timezone('America/New_York'))
+    for recipient in recipients:
+        zone = get_timezone(recipient.timezone) or start.tzinfo
+        yield template.render(
+            recipient_name=recipient.name or name_from_email(recipient.address),
+            recipient_email=recipient.address,
+            rsvp_link=RSVP_URL.format(distribution_id=7, recipient_id=recipient.id,
+                                      email=recipient.address.replace('@', '%40').replace('+', '%2B')),
+            local_time=f"{start.astimezone(zone).strftime('%A, %B %d, %Y at %H:%M')} ({zone.key})"
+        )
+
+
+def _markupsafe_entities(text):
+    # html.escape and markupsafe spell the quote entities differently
+    return text.replace('&#x27;', '&#39;').replace('&quot;', '&#34;')
+
+
+@pytest.mark.parametrize('content', CONTENTS)
+def test_matches_a_per_recipient_jinja_render(content):
+    personalized = [body for _, body in personalize(PersonalizedTemplate(content), RECIPIENTS, _context())]
+    assert [_markupsafe_entities(body) for body in personalized] == list(_jinja_renders(content, RECIPIENTS))
+
+
+def test_names_are_escaped_and_missing_fields_fall_back():
+    template = PersonalizedTemplate('<p>{{recipient_name}}|{{local_time}}</p>')
+    bodies = [body for _, body in personalize(template, RECIPIENTS, _context())]
+    assert bodies[0] == '<p>Ada Lovelace|Tuesday, March 10, 2026 at 14:30 (Europe/Paris)</p>'
+    assert bodies[1] == '<p>Grace Hopper|Tuesday, March 10, 2026 at 09:30 (America/New_York)</p>'
+    assert bodies[2].startswith('<p>&lt;b&gt;O&#x27;Brien &amp; &quot;Co&quot;&lt;/b&gt;|')
+    assert bodies[2].endswith('(America/New_York)</p>')
+    assert bodies[3].startswith('<p>Jo News|')
+
+
+def test_templates_without_placeholders_are_passed_through_or_injected():
+    content = '<html><body><p>Plain</p></body></html>'
+    assert [body for _, body in personalize(PersonalizedTemplate(content), RECIPIENTS[:2], _context())] == [content] * 2
+
+    injected = PersonalizedTemplate(content, inject=True)
+    assert injected.fields == {'recipient_name', 'local_time', 'rsvp_link'}
+    body = injected.render(_context().values_for(RECIPIENTS[0]))
+    assert body.startswith('<html><body><div') and 'Hi Ada Lovelace,' in body and body.endswith('<p>Plain</p></body></html>')
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+import pytest
+
+import main
+from utils.recipient_service import (
+    add_recipients, count_recipients_by_status, get_recipient_details, iter_recipients, record_outcomes
+)
+from utils.template_service import InvalidCursor
+
+
+@pytest.fixture
+def distribution_id(app):
+    user = main.User.query.first()
+    template = main.Template(title='Kickoff', content='<p>Kickoff</p>', user_id=user.id)
+    main.db.session.add(template)
+    main.db.session.flush()
+    distribution = main.Distribution(template_id=template.id, method='gmail', recipient_count=7, user_id=user.id)
+    main.db.session.add(distribution)
+    main.db.session.flush()
+    add_recipients(distribution.id, 'email', [f'user{i}@example.com' for i in range(7)])
+    main.db.session.commit()
+    return distribution.id
+
+
+def _send(distribution_id, outcomes):
+    rows = {row.address: row.id for row in iter_recipients(distribution_id)}
+    record_outcomes([{
+        'id': rows[address], 'status': status, 'attempts': 1,
+        'sent_at': datetime.utcnow() if status == 'sent' else None
+    } for address, status in outcomes])
+    main.db.session.commit()
+
+
+def test_counts_by_status(distribution_id):
+    assert count_recipients_by_status(distribution_id) == {'pending': 7, 'sent': 0, 'failed': 0}
+    _send(distribution_id, [('user0@example.com', 'sent'), ('user1@example.com', 'failed')])
+    assert count_recipients_by_status(distribution_id) == {'pending': 5, 'sent': 1, 'failed': 1}
+
+
+def test_details_pages_through_processed_recipients(distribution_id):
+    _send(distribution_id, [(f'user{i}@example.com', 'sent' if i % 3 else 'failed') for i in range(6)])
+
+    addresses, cursor = [], None
+    while True:
+        page, cursor = get_recipient_details(distribution_id, limit=4, cursor=cursor)
+        addresses += [entry['address'] for entry in page]
+        if cursor is None:
+            break
+    # user6 is still pending and only listed when asked for
+    assert addresses == [f'user{i}@example.com' for i in range(6)]
+
+    failed, cursor = get_recipient_details(distribution_id, status='failed')
+    assert [entry['address'] for entry in failed] == ['user0@example.com', 'user3@example.com'] and cursor is None
+    pending, _ = get_recipient_details(distribution_id, status='pending')
+    assert [entry['address'] for entry in pending] == ['user6@example.com']
+
+
+def test_details_rejects_invalid_cursor(distribution_id):
+    with pytest.raises(InvalidCursor):
+        get_recipient_details(distribution_id, cursor='not-an-id')
@@ -0,0 +1,88 @@
+import random
+import threading
+
+import pytest
+
+from utils.send_scheduler import PermanentSendError, SendScheduler, TransientSendError
+
+
+class FixedRandom(random.Random):
+    """uniform() always returns the top of the range"""
+
+    def uniform(self, a, b):
+        return b
+
+
+def test_backoff_grows_exponentially_up_to_max():
+    scheduler = SendScheduler(None, backoff_base=1.0, backoff_max=10.0, rng=FixedRandom())
+    assert [scheduler.backoff(attempt) for attempt in range(1, 7)] == [1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+
+
+def test_backoff_honours_retry_after():
+    scheduler = SendScheduler(None, backoff_base=1.0, backoff_max=60.0, rng=FixedRandom())
+    assert scheduler.backoff(1, retry_after=30) == 30
+
+
+def test_backoff_clamps_retry_after_to_max():
+    scheduler = SendScheduler(None, backoff_base=1.0, backoff_max=60.0, rng=FixedRandom())
+    assert scheduler.backoff(1, retry_after=3600) == 60.0
+
+
+def test_deliver_retries_transient_errors():
+    sleeps = []
+    calls = []
+
+    def send(payload):
+        calls.append(payload)
+        if len(calls) < 3:
+            raise TransientSendError('421 try again later', retry_after=5)
+        return 'ok'
+
+    scheduler = SendScheduler(send, max_attempts=4, backoff_max=2.0, sleep=sleeps.append, rng=FixedRandom())
+    result = scheduler.deliver('key', 'payload')
+    assert (result.success, result.attempts, result.detail) == (True, 3, 'ok')
+    assert sleeps == [2.0, 2.0]
+
+
+def test_deliver_stops_on_permanent_error():
+    def send(payload):
+        raise PermanentSendError('550 no such user')
+
+    result = SendScheduler(send, sleep=lambda seconds: None).deliver('key', 'payload')
+    assert (result.success, result.attempts, result.permanent) == (False, 1, True)
+
+
+def test_run_heartbeats_while_sends_wait():
+    release = threading.Event()
+    beats = []
+
+    def send(payload):
+        release.wait(5)
+        return payload
+
+    def heartbeat():
+        beats.append(1)
+        if len(beats) == 3:
+            release.set()
+
+    scheduler = SendScheduler(send, concurrency=2)
+    results = list(scheduler.run([(i, i) for i in range(4)], heartbeat=heartbeat, heartbeat_interval=0.01))
+    assert sorted(result.detail for result in results) == [0, 1, 2, 3]
+    assert len(beats) >= 3
+
+
+def test_run_stops_when_heartbeat_raises():
+    sent = []
+
+    def send(payload):
+        sent.append(payload)
+        threading.Event().wait(0.05)
+        return payload
+
+    def heartbeat():
+        raise RuntimeError('claim lost')
+
+    scheduler = SendScheduler(send, concurrency=1)
+    with pytest.raises(RuntimeError):
+        list(scheduler.run([(i, i) for i in range(20)], heartbeat=heartbeat, heartbeat_interval=0.01))
+    assert len(sent) < 20
@@ -0,0 +1,77 @@
+import smtplib
+
+import pytest
+
+from utils.smtp_pool import SMTPConnectionPool
+
+MESSAGE = b'Subject: Kickoff\r\n\r\nSee you there\r\n'
+
+
+@pytest.fixture
+def make_pool(smtp_server):
+    pools = []
+
+    def build(password='app-password', **options):
+        pool = SMTPConnectionPool(smtp_server.host, smtp_server.port, 'sender@example.com', password,
+                                  use_tls=False, timeout=5, **options)
+        pools.append(pool)
+        return pool
+    yield build
+    for pool in pools:
+        pool.close()
+
+
+def _ports(smtp_server):
+    return [port for port, _, _, _ in smtp_server.messages]
+
+
+def test_sequential_sends_reuse_one_session(make_pool, smtp_server):
+    pool = make_pool()
+    for n in range(3):
+        pool.sendmail('sender@example.com', [f'r{n}@example.com'], MESSAGE)
+
+    assert len(set(_ports(smtp_server))) == 1
+    assert len(set(smtp_server.logins)) == 1
+    assert pool.stats()['idle'] == 1
+
+
+def test_rotates_sessions_after_max_messages(make_pool, smtp_server):
+    pool = make_pool(max_messages=2)
+    for n in range(5):
+        pool.sendmail('sender@example.com', [f'r{n}@example.com'], MESSAGE)
+
+    ports = _ports(smtp_server)
+    assert ports[0] == ports[1] != ports[2] == ports[3] != ports[4]
+    assert len(set(ports)) == 3
+
+
+def test_reconnects_once_when_the_server_drops_idle_sessions(make_pool, smtp_server):
+    pool = make_pool(size=2)
+    # Two idle sessions, both of which go stale when the server restarts
+    first, second = pool._checkout(), pool._checkout()
+    pool._checkin(first)
+    pool._checkin(second)
+    smtp_server.restart()
+
+    pool.sendmail('sender@example.com', ['ada@example.com'], MESSAGE)
+
+    assert [rcpts for _, _, rcpts, _ in smtp_server.messages] == [['ada@example.com']]
+    assert len(set(smtp_server.logins)) == 3
+
+
+def test_batch_sends_on_one_session(make_pool, smtp_server):
+    pool = make_pool()
+    results = pool.send_batch(('sender@example.com', [f'r{n}@example.com'], MESSAGE) for n in range(4))
+
+    assert [result['success'] for result in results] == [True] * 4
+    assert len(set(_ports(smtp_server))) == 1
+
+
+def test_batch_fails_without_retrying_login_for_every_message(make_pool, smtp_server):
+    pool = make_pool(password='wrong')
+    results = pool.send_batch(('sender@example.com', [f'r{n}@example.com'], MESSAGE) for n in range(3))
+
+    assert [result['success'] for result in results] == [False] * 3
+    assert all(isinstance(result['error'], smtplib.SMTPAuthenticationError) for result in results)
+    assert len(set(smtp_server.logins)) == 1
+    assert smtp_server.messages == []
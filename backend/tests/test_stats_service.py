@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+import main
+from utils.stats_service import _apply_deltas, get_dashboard_stats
+
+
+def _new_user(name):
+    user = main.User(username=name, email=f'{name}@example.com', password_hash='x')
+    main.db.session.add(user)
+    main.db.session.commit()
+    return user.id
+
+
+def _apply(deltas):
+    session = main.db.session()
+    session.info['user_stats_deltas'] = deltas
+    _apply_deltas(session, None)
+    main.db.session.commit()
+
+
+def test_first_delta_creates_the_row(app):
+    user_id = _new_user('fresh')
+    assert main.db.session.get(main.UserStats, user_id) is None
+    _apply({user_id: {'templates_generated': 2, 'recipients_failed': 0}})
+    stats = get_dashboard_stats(user_id)
+    assert (stats['templates_generated'], stats['recipients_failed'], stats['invitations_sent']) == (2, 0, 0)
+
+
+def test_deltas_add_to_an_existing_row(app):
+    user_id = _new_user('existing')
+    _apply({user_id: {'templates_generated': 1, 'recipients_succeeded': 5}})
+    _apply({user_id: {'templates_generated': 1, 'recipients_succeeded': -2, 'recipients_failed': 3}})
+    stats = get_dashboard_stats(user_id)
+    assert (stats['templates_generated'], stats['recipients_succeeded'], stats['recipients_failed']) == (2, 3, 3)
+    assert stats['success_rate'] == 50.0
+
+
+def test_template_writes_update_the_rollup(app):
+    user_id = _new_user('writer')
+    for i in range(3):
+        main.db.session.add(main.Template(title=f'T{i}', content='<p>x</p>', user_id=user_id))
+    main.db.session.commit()
+    main.db.session.delete(main.Template.query.filter_by(user_id=user_id).first())
+    main.db.session.commit()
+    assert get_dashboard_stats(user_id)['templates_generated'] == 2
+
+
+def test_failed_flush_leaves_no_deltas_behind(app):
+    user_id = _new_user('failing')
+    main.db.session.add(main.Template(title=None, content='<p>x</p>', user_id=user_id))
+    with pytest.raises(IntegrityError):
+        main.db.session.commit()
+    main.db.session.rollback()
+
+    main.db.session.add(main.User(username='bystander', email='bystander@example.com', password_hash='x'))
+    main.db.session.commit()
+    assert get_dashboard_stats(user_id)['templates_generated'] == 0
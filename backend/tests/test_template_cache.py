@@ -0,0 +1,122 @@
+from types import SimpleNamespace
+
+import pytest
+
+from utils import template_cache, template_generator
+from utils.openai_client import get_circuit_breaker
+from utils.template_cache import TemplateCache, make_cache_key
+
+MEETING = {'meetingTopic': 'Kickoff', 'speakerName': 'Sam', 'date': '2026-01-02', 'time': '10:00'}
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(template_cache.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    caches = []
+
+    def build(**options):
+        cache = TemplateCache(str(tmp_path / 'cache.db'), **options)
+        caches.append(cache)
+        return cache
+    yield build
+    for cache in caches:
+        cache.close()
+
+
+class CountingClient:
+    """Stands in for the OpenAI client, returning one HTML completion per call"""
+
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=f'<html>generation {self.calls}</html>')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_key_ignores_whitespace_and_unrelated_fields():
+    key = make_cache_key(MEETING, 'gpt', 0.7)
+    assert make_cache_key({**MEETING, 'meetingTopic': '  Kickoff ', 'useCache': False, 'agenda': ''}, 'gpt', 0.7) == key
+    assert make_cache_key({**MEETING, 'speakerName': 'Alex'}, 'gpt', 0.7) != key
+    assert make_cache_key(MEETING, 'gpt', 0.2) != key
+    assert make_cache_key(MEETING, 'other', 0.7) != key
+
+
+def test_memory_then_disk_hits(make_cache, clock):
+    cache = make_cache()
+    assert cache.get('k') is None
+    cache.set('k', '<p>x</p>')
+    assert cache.get('k') == '<p>x</p>'
+    cache.clear_memory()
+    assert cache.get('k') == '<p>x</p>'
+    assert cache.get('k') == '<p>x</p>'
+
+    stats = cache.stats()
+    assert (stats['misses'], stats['memory_hits'], stats['disk_hits'], stats['stores']) == (1, 2, 1, 1)
+    assert stats['hit_rate'] == 0.75
+
+
+def test_entries_expire_after_the_ttl(make_cache, clock):
+    cache = make_cache(ttl=60)
+    cache.set('k', '<p>x</p>')
+    clock.now += 61
+    assert cache.get('k') is None
+    assert cache.stats()['disk_entries'] == 0
+
+
+def test_least_recently_used_entries_are_evicted(make_cache, clock):
+    cache = make_cache(memory_size=2, disk_size=2)
+    for key in ('a', 'b'):
+        cache.set(key, key)
+        clock.now += 1
+    # Only disk reads refresh an entry's place in the disk LRU
+    cache.clear_memory()
+    cache.get('a')
+    clock.now += 1
+    cache.set('c', 'c')
+
+    assert cache.stats()['memory_entries'] == 2 and cache.stats()['disk_entries'] == 2
+    cache.clear_memory()
+    assert [cache.get(key) for key in ('a', 'b', 'c')] == ['a', None, 'c']
+
+
+def test_memory_tier_keeps_the_most_recently_used(make_cache, clock):
+    cache = make_cache(memory_size=2)
+    cache.set('a', 'a')
+    cache.set('b', 'b')
+    cache.get('a')
+    cache.set('c', 'c')
+    assert list(cache._memory) == ['a', 'c']
+    assert cache.get('b') == 'b' and cache.stats()['disk_hits'] == 1
+
+
+def test_use_cache_opt_out_skips_lookup_and_store(make_cache, monkeypatch):
+    cache = make_cache()
+    monkeypatch.setattr(template_generator, '_template_cache', cache)
+    get_circuit_breaker().reset()
+    client = CountingClient()
+
+    first = template_generator.generate_template_content_with_openai(MEETING, 'key', client=client)
+    assert template_generator.generate_template_content_with_openai(MEETING, 'key', client=client) == first
+    assert client.calls == 1
+
+    fresh = template_generator.generate_template_content_with_openai(MEETING, 'key', use_cache=False, client=client)
+    assert fresh != first and client.calls == 2
+    assert template_generator.generate_template_content_with_openai(MEETING, 'key', client=client) == first
+    assert cache.stats()['stores'] == 1
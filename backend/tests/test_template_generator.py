@@ -0,0 +1,181 @@
+import json
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import main
+from utils import template_generator
+from utils.openai_client import get_circuit_breaker
+from utils.template_generator import generate_templates_batch, stream_template_content_with_openai
+
+MEETING = {'meetingTopic': 'Kickoff', 'speakerName': 'Sam', 'date': '2026-01-02', 'time': '10:00'}
+
+
+def _event(content=None, finish_reason=None):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content), finish_reason=finish_reason)])
+
+
+class FakeClient:
+    """Stands in for the OpenAI client, streaming a fixed list of events (exceptions in it are raised)"""
+
+    def __init__(self, events=None, error=None):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+        self.events = events or []
+        self.error = error
+
+    def create(self, **kwargs):
+        if self.error is not None:
+            raise self.error
+        return self._iterate()
+
+    def _iterate(self):
+        for event in self.events:
+            if isinstance(event, Exception):
+                raise event
+            yield event
+
+
+@pytest.fixture
+def breaker():
+    breaker = get_circuit_breaker()
+    breaker.reset()
+    yield breaker
+    breaker.reset()
+
+
+def _stream(client):
+    return list(stream_template_content_with_openai(MEETING, 'key', use_cache=False, client=client))
+
+
+def test_streamed_html_is_passed_through(breaker):
+    events = _stream(FakeClient([_event('<html>'), _event('</html>', 'stop')]))
+    assert events == [('chunk', '<html>'), ('chunk', '</html>'), ('done', '<html></html>')]
+
+
+@pytest.mark.parametrize('stream', [
+    [_event('Sorry, I cannot help with that', 'stop')],
+    [_event('', 'stop')],
+    [_event('<html>')],
+])
+def test_unusable_completions_fall_back_without_tripping_the_breaker(breaker, stream):
+    for _ in range(breaker.failure_threshold + 1):
+        events = _stream(FakeClient(stream))
+        assert events[-1][0] == 'done' and 'Meeting Invitation' in events[-1][1]
+    assert breaker.state == 'closed'
+    assert breaker.failures == 0
+
+
+def test_api_errors_trip_the_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        _stream(FakeClient(error=ConnectionError('reset by peer')))
+    assert breaker.state == 'open'
+
+
+def test_broken_stream_resets_to_the_fallback(breaker):
+    events = _stream(FakeClient([_event('<html><body>'), ConnectionError('reset by peer')]))
+    assert [kind for kind, _ in events] == ['chunk', 'reset', 'chunk', 'done']
+    assert events[2][1] == events[3][1] and 'Meeting Invitation' in events[3][1]
+
+
+def _sse(response):
+    """(event, data) pairs of a Server-Sent Events body"""
+    pairs = []
+    for block in response.get_data(as_text=True).strip().split('\n\n'):
+        event, data = block.split('\n')
+        pairs.append((event.removeprefix('event: '), json.loads(data.removeprefix('data: '))))
+    return pairs
+
+
+def test_stream_endpoint_sends_chunks_then_saves_the_template(client, breaker, monkeypatch):
+    fake = FakeClient([_event('<html>'), _event('<p>Kickoff</p></html>', 'stop')])
+    monkeypatch.setattr(template_generator, 'get_openai_client', lambda api_key: fake)
+    response = client.post('/api/templates/generate/stream', json={**MEETING, 'useCache': False})
+
+    assert response.mimetype == 'text/event-stream'
+    events = _sse(response)
+    assert events[:2] == [('chunk', {'html': '<html>'}), ('chunk', {'html': '<p>Kickoff</p></html>'})]
+    assert events[2][0] == 'done' and events[2][1]['success']
+    with main.app.app_context():
+        assert main.db.session.get(main.Template, events[2][1]['template_id']).content == '<html><p>Kickoff</p></html>'
+
+
+def test_stream_endpoint_resets_when_the_stream_breaks(client, breaker, monkeypatch):
+    fake = FakeClient([_event('<html>'), ConnectionError('reset by peer')])
+    monkeypatch.setattr(template_generator, 'get_openai_client', lambda api_key: fake)
+    events = _sse(client.post('/api/templates/generate/stream', json={**MEETING, 'useCache': False}))
+
+    assert [event for event, _ in events] == ['chunk', 'reset', 'chunk', 'done']
+    with main.app.app_context():
+        assert main.db.session.get(main.Template, events[3][1]['template_id']).content == events[2][1]['html']
+
+
+def test_stream_endpoint_validates_before_streaming(client):
+    response = client.post('/api/templates/generate/stream', json={**MEETING, 'time': '10am'})
+    assert response.status_code == 400 and response.mimetype == 'application/json'
+
+
+class TopicClient:
+    """Stands in for the OpenAI client; later topics answer first, and 'Broken' topics fail"""
+
+    def __init__(self):
+        self.topics = []
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, **kwargs):
+        topic = re.search(r'Meeting Topic: (.*)', messages[1]['content']).group(1).strip()
+        with self.lock:
+            self.topics.append(topic)
+        if topic.startswith('Broken'):
+            raise ConnectionError('reset by peer')
+        time.sleep(0.05 / int(topic.rsplit(' ', 1)[1]))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f'<p>{topic}</p>'))])
+
+
+def _meetings(*topics):
+    return [{**MEETING, 'meetingTopic': topic} for topic in topics]
+
+
+def test_batch_keeps_input_order_and_generates_duplicates_once(breaker):
+    client = TopicClient()
+    meetings = _meetings('Topic 1', 'Topic 2', 'Topic 3') + [{**MEETING, 'meetingTopic': ' Topic 1 '}]
+    contents = generate_templates_batch(meetings, 'key', use_cache=False, client=client, max_workers=4)
+
+    assert contents == ['<p>Topic 1</p>', '<p>Topic 2</p>', '<p>Topic 3</p>', '<p>Topic 1</p>']
+    assert sorted(client.topics) == ['Topic 1', 'Topic 2', 'Topic 3']
+
+
+def test_batch_failure_only_affects_its_meeting(breaker):
+    contents = generate_templates_batch(_meetings('Topic 1', 'Broken 2', 'Topic 3'), 'key', use_cache=False,
+                                        client=TopicClient())
+    assert contents[0] == '<p>Topic 1</p>' and contents[2] == '<p>Topic 3</p>'
+    assert 'Meeting Invitation' in contents[1]
+
+
+def test_batch_endpoint_saves_templates_in_request_order(client, breaker, monkeypatch):
+    fake = TopicClient()
+    monkeypatch.setattr(template_generator, 'get_openai_client', lambda api_key: fake)
+    meetings = _meetings('Topic 1', 'Topic 2', 'Topic 1')
+    response = client.post('/api/templates/generate/batch', json={'meetings': meetings, 'useCache': False})
+
+    assert response.status_code == 200
+    templates = response.json['templates']
+    assert [entry['template'] for entry in templates] == ['<p>Topic 1</p>', '<p>Topic 2</p>', '<p>Topic 1</p>']
+    assert len({entry['template_id'] for entry in templates}) == 3
+    assert len(fake.topics) == 2
+    with main.app.app_context():
+        saved = [main.db.session.get(main.Template, entry['template_id']) for entry in templates]
+        assert [(t.meeting_topic, t.content) for t in saved] == [(m['meetingTopic'], f"<p>{m['meetingTopic']}</p>") for m in meetings]
+
+
+def test_batch_endpoint_rejects_the_whole_batch_on_a_bad_meeting(client):
+    with main.app.app_context():
+        before = main.Template.query.count()
+    response = client.post('/api/templates/generate/batch', json={'meetings': _meetings('Topic 1') + [{**MEETING, 'date': 'soon'}]})
+    assert response.status_code == 400 and response.json['error'].startswith('Meeting 1:')
+    with main.app.app_context():
+        assert main.Template.query.count() == before
+
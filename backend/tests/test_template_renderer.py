@@ -0,0 +1,51 @@
+import pytest
+
+from utils import template_renderer
+from utils.template_renderer import render_invitation, render_invitations, resolve_theme
+
+MEETING = {
+    'meetingTopic': 'Q&A <script>alert("x")</script>',
+    'speakerName': "O'Brien {0}",
+    'date': '2026-03-10',
+    'time': '09:30',
+    'meetingType': 'Review',
+    'priority': 'High',
+    'meetingLink': 'https://meet.example.com/?a=1&b=2',
+    'attendees': ['a@example.com', '<b@example.com>'],
+}
+
+
+def _jinja_render(meeting_data, style):
+    template = template_renderer._load_templates()[style]
+    theme = resolve_theme(meeting_data.get('meetingType'), meeting_data.get('priority'))
+    return template.render(template_renderer._meeting_context(meeting_data), **theme)
+
+
+@pytest.mark.parametrize('style', template_renderer.INVITATION_STYLES)
+@pytest.mark.parametrize('meeting_data', [MEETING, {}, {**MEETING, 'attendees': [], 'meetingLink': None, 'agenda': 'Plan'}])
+def test_compiled_layout_matches_jinja_output(meeting_data, style):
+    assert render_invitation(meeting_data, style) == _jinja_render(meeting_data, style)
+
+
+def test_user_fields_are_escaped():
+    html = render_invitation(MEETING)
+    assert '<script>' not in html
+    assert 'Q&amp;A &lt;script&gt;alert(&#34;x&#34;)&lt;/script&gt;' in html
+    assert 'O&#39;Brien {0}' in html
+    assert render_invitations([MEETING], 'basic') == [render_invitation(MEETING, 'basic')]
+
+
+def test_unknown_theme_names_do_not_grow_the_caches():
+    render_invitation(MEETING)
+    before = template_renderer._merge_theme.cache_info().currsize
+    for i in range(50):
+        render_invitation({**MEETING, 'meetingType': f'type {i}', 'priority': f'priority {i}'})
+    assert template_renderer._merge_theme.cache_info().currsize <= before + 1
+    assert resolve_theme('type 1', 'priority 1') == template_renderer.DEFAULT_THEME
+
+
+@pytest.mark.parametrize('meeting_type, priority', [(5, 'High'), ('Review', ['High']), ({'a': 1}, True)])
+def test_non_string_theme_names_fall_back_to_the_default(meeting_type, priority):
+    meeting_data = {**MEETING, 'meetingType': meeting_type, 'priority': priority}
+    assert render_invitation(meeting_data) == _jinja_render(meeting_data, 'styled')
+    assert resolve_theme(7, None) == template_renderer.DEFAULT_THEME
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import main
+from utils.template_service import InvalidCursor, decode_cursor, encode_cursor, list_templates
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 1, 2, 10, 30, 15, 123456)
+    cursor = encode_cursor(created_at, 42)
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize('cursor', ['not a cursor', 'WzFd', encode_cursor(datetime(2026, 1, 1), 1)[:-3]])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_pages_cover_every_template_once(app):
+    user_id = main.User.query.first().id
+    base = datetime(2026, 1, 1)
+    # Several templates share a created_at, so the id tie-breaker matters
+    for i in range(23):
+        main.db.session.add(main.Template(
+            title=f'Meeting {i}', content=f'<p>{i}</p>', user_id=user_id, created_at=base + timedelta(minutes=i // 3)
+        ))
+    main.db.session.commit()
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = list_templates(user_id, limit=5, cursor=cursor)
+        seen += page
+        if cursor is None:
+            break
+    assert len(seen) == 23
+    assert len({item['id'] for item in seen}) == 23
+    order = [(item['created_at'], item['id']) for item in seen]
+    assert order == sorted(order, reverse=True)
+
+    page, _ = list_templates(user_id, limit=2, search='Meeting 1', include_content=True)
+    assert [item['title'] for item in page] == ['Meeting 19', 'Meeting 18']
+    assert page[0]['content'] == '<p>19</p>'
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import insert
+
+import main
+from utils import template_storage
+from utils.template_storage import body_digest, decode_body, encode_body
+
+HTML = '<html><body>' + ''.join(f'<p>Réunion n°{i} — ordre du jour ✓</p>' for i in range(50)) + '</body></html>'
+
+
+@pytest.mark.parametrize('codec, encoding', [('zlib', 'zlib'), ('none', 'identity')])
+def test_codecs_round_trip(codec, encoding):
+    stored_as, data = encode_body(HTML, codec)
+    assert stored_as == encoding
+    assert decode_body(stored_as, data) == HTML
+
+
+def test_zstd_round_trip():
+    pytest.importorskip('zstandard')
+    encoding, data = encode_body(HTML, 'zstd')
+    assert encoding == 'zstd' and len(data) < len(HTML.encode('utf-8'))
+    assert decode_body(encoding, data) == HTML
+
+
+def test_short_bodies_are_not_compressed():
+    assert encode_body('<p>hi</p>', 'zlib') == ('identity', b'<p>hi</p>')
+
+
+def test_zstd_falls_back_to_zlib_when_not_installed(app, monkeypatch):
+    monkeypatch.setattr(template_storage, 'zstandard', None)
+    app.config['TEMPLATE_BODY_COMPRESSION'] = 'zstd'
+    assert template_storage.get_body_codec() == 'zlib'
+
+
+@pytest.mark.parametrize('codec', ['zlib', 'zstd', 'none'])
+def test_content_property_round_trips_through_the_body_row(app, codec):
+    if codec == 'zstd':
+        pytest.importorskip('zstandard')
+    app.config['TEMPLATE_BODY_COMPRESSION'] = codec
+    user_id = main.User.query.first().id
+    template = main.Template(title='Réunion', content=HTML, user_id=user_id)
+    main.db.session.add(template)
+    main.db.session.commit()
+    template_id = template.id
+    main.db.session.remove()
+
+    template = main.db.session.get(main.Template, template_id)
+    assert template.content == HTML
+    assert template.body.encoding == {'none': 'identity'}.get(codec, codec)
+    assert template.body.size == len(HTML) and template.body.digest == body_digest(HTML)
+
+    template.content = '<p>edited</p>'
+    main.db.session.commit()
+    main.db.session.remove()
+    assert main.db.session.get(main.Template, template_id).content == '<p>edited</p>'
+
+
+def test_legacy_inline_content_is_still_read(app):
+    user_id = main.User.query.first().id
+    main.db.session.execute(insert(main.Template.__table__), [{'title': 'Old', 'content': '<p>inline</p>', 'user_id': user_id}])
+    main.db.session.commit()
+    template = main.Template.query.filter_by(title='Old').one()
+    assert template.body is None and template.content == '<p>inline</p>'
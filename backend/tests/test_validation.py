@@ -0,0 +1,73 @@
+import pytest
+
+from utils import validation
+from utils.validation import MXCache, normalize_email, normalize_phone, validate_emails, validate_phones, validate_recipients
+
+EMAILS = ['  Ada@Example.COM ', 'ada@example.com', 'grace@example.org', 'not-an-email', 'grace@EXAMPLE.org',
+          'x@y', '', 'bob.smith+tag@mail.example.co.uk', 'two@example.com three@example.com']
+PHONES = ['+1 (415) 555-0100', '+14155550100', '0044 20 7946 0958', '020 7946 0958', '123', '+0123456789', 'call me']
+
+
+def _reference(values, normalize, fold=lambda value: value):
+    """Item-at-a-time validation the bulk scans must agree with"""
+    valid, invalid, duplicates, seen = [], [], [], set()
+    for value in values:
+        normalized = normalize(value)
+        if normalized is None:
+            invalid.append(value)
+        elif fold(normalized) in seen:
+            duplicates.append(value)
+        else:
+            seen.add(fold(normalized))
+            valid.append(normalized)
+    return valid, invalid, duplicates
+
+
+@pytest.mark.parametrize('emails', [EMAILS, EMAILS + ['multi\nline@example.com']])
+def test_bulk_emails_match_item_at_a_time_validation(emails):
+    result = validate_emails(emails)
+    assert tuple(result) == _reference(emails, normalize_email, str.lower)
+    assert result.valid == ['Ada@example.com', 'grace@example.org', 'bob.smith+tag@mail.example.co.uk']
+
+
+@pytest.mark.parametrize('phones', [PHONES, PHONES + ['+1 415\n555 0199']])
+def test_bulk_phones_match_item_at_a_time_validation(phones):
+    result = validate_phones(phones, default_country_code='44')
+    assert tuple(result) == _reference(phones, lambda phone: normalize_phone(phone, '44'))
+    assert result.valid == ['+14155550100', '+442079460958']
+    assert result.duplicates == ['+14155550100', '020 7946 0958']
+
+
+def test_phones_without_a_default_country_keep_their_digits():
+    assert validate_phones(['14155550100', '020 7946 0958']).valid == ['+14155550100']
+
+
+def test_recipient_dicts_keep_their_fields():
+    result = validate_recipients([{'address': 'Ada@EXAMPLE.com ', 'name': 'Ada'}, {'address': 'ada@example.com'}])
+    assert result.valid == [{'address': 'Ada@example.com', 'name': 'Ada'}]
+    assert result.duplicates == ['ada@example.com']
+
+
+def test_mx_check_runs_once_per_domain():
+    checked = []
+
+    def mx_check(domain):
+        checked.append(domain)
+        return domain != 'nomail.example'
+
+    result = validate_emails(['a@nomail.example', 'b@NoMail.example', 'c@example.com', 'd@example.com'], mx_check=mx_check)
+    assert result.valid == ['c@example.com', 'd@example.com']
+    assert result.invalid == ['a@nomail.example', 'b@NoMail.example']
+    assert checked == ['nomail.example', 'example.com']
+
+
+def test_mx_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(validation.time, 'monotonic', lambda: now[0])
+    lookups = []
+    cache = MXCache(resolver=lambda domain: lookups.append(domain) or True, ttl=60)
+
+    assert cache('example.com') and cache('example.com')
+    now[0] += 61
+    assert cache('example.com')
+    assert lookups == ['example.com', 'example.com']
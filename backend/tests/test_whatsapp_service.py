@@ -0,0 +1,101 @@
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from utils.send_scheduler import PermanentSendError, SendScheduler, TransientSendError
+from utils.whatsapp_service import WhatsAppChannel, close_all_sessions, get_session
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers POSTs with the next scripted (status, headers) reply, 200 once the script runs out"""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with self.server.lock:
+            self.server.received.append((self.client_address[1], self.path, self.headers['Authorization'], body))
+            status, headers = self.server.script.pop(0) if self.server.script else (200, {})
+            count = len(self.server.received)
+        payload = {'messages': [{'id': f'wamid.{count}'}]} if status < 400 else {'error': {'message': 'nope'}}
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in {'Content-Type': 'application/json', 'Content-Length': str(len(data)), **headers}.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ScriptedHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.received, server.script = [], []
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    close_all_sessions()
+
+
+def _channel(api):
+    return WhatsAppChannel('token', '1234567890', api_url=api.url, timeout=5, session=get_session('1234567890', 4))
+
+
+def test_sends_reuse_one_keep_alive_connection(api):
+    channel = _channel(api)
+    results = [channel.send((f'+1415555000{i}', f'Hello {i}')) for i in range(3)]
+
+    assert [result['message_id'] for result in results] == ['wamid.1', 'wamid.2', 'wamid.3']
+    assert len({port for port, _, _, _ in api.received}) == 1
+    _, path, authorization, body = api.received[0]
+    assert (path, authorization) == ('/1234567890/messages', 'Bearer token')
+    assert body == {'messaging_product': 'whatsapp', 'to': '14155550000', 'type': 'text', 'text': {'body': 'Hello 0'}}
+    assert get_session('1234567890') is channel._http
+
+
+@pytest.mark.parametrize('status, headers, retry_after', [(429, {'Retry-After': '7'}, 7.0), (503, {}, None)])
+def test_throttling_and_server_errors_are_transient(api, status, headers, retry_after):
+    api.script.append((status, headers))
+    with pytest.raises(TransientSendError) as error:
+        _channel(api).send(('+14155550000', 'Hello'))
+    assert error.value.retry_after == retry_after
+
+
+def test_client_errors_are_permanent(api):
+    api.script.append((400, {}))
+    with pytest.raises(PermanentSendError):
+        _channel(api).send(('+14155550000', 'Hello'))
+
+
+def test_scheduler_retries_until_the_api_accepts(api):
+    api.script += [(429, {'Retry-After': '3'}), (502, {})]
+    sleeps = []
+    scheduler = SendScheduler(_channel(api).send, max_attempts=4, backoff_base=0.5, backoff_max=60.0, sleep=sleeps.append)
+    result = scheduler.deliver('+14155550000', ('+14155550000', 'Hello'))
+
+    assert (result.success, result.attempts, result.detail['message_id']) == (True, 3, 'wamid.3')
+    assert sleeps[0] == 3.0 and len(sleeps) == 2
+
+
+def test_unreachable_api_is_transient():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    channel = WhatsAppChannel('token', '1234567890', api_url=f'http://127.0.0.1:{port}', timeout=1, session=requests.Session())
+    with pytest.raises(TransientSendError):
+        channel.send(('+14155550000', 'Hello'))
+
+
+def test_demo_credentials_send_nothing(api):
+    result = WhatsAppChannel('your-whatsapp-api-key', 'your-whatsapp-phone-number', api_url=api.url).send(('+1415', 'Hi'))
+    assert 'demo mode' in result['message'] and api.received == []
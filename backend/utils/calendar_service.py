@@ -0,0 +1,141 @@
+import re
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from utils.personalization import get_timezone
+from utils.recipient_service import iter_recipients
+from utils.zip_stream import iter_zip
+
+ICS_PRODID = '-//SmartMeeting AI//Meeting Invitations//EN'
+DEFAULT_DURATION = timedelta(hours=1)
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)\s*(h|hrs?|hours?|m|mins?|minutes?)?\b', re.IGNORECASE)
+_FILENAME_UNSAFE = re.compile(r'[^A-Za-z0-9@._+-]+')
+_PARAM_UNSAFE = re.compile(r'["\r\n]')
+_URI_UNSAFE = re.compile(r'[\x00-\x20\x7f]')
+
+
+class MeetingNotScheduled(ValueError):
+    """The template has no meeting date and time to put in a calendar event"""
+
+
+def parse_duration(text):
+    """Meeting length from free text such as '90', '45 minutes', '1 hour' or '1h 30m'"""
+    total = timedelta()
+    for amount, unit in _DURATION_PART.findall(text or ''):
+        if unit.lower().startswith('h'):
+            total += timedelta(hours=float(amount))
+        else:
+            total += timedelta(minutes=float(amount))
+    return total or DEFAULT_DURATION
+
+
+def escape_text(value):
+    """Escape a TEXT property value (RFC 5545 3.3.11)"""
+    return (value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _param(value):
+    # Parameter values may not contain quotes; quote them when they hold : ; or ,
+    value = _PARAM_UNSAFE.sub('', value)
+    return f'"{value}"' if any(c in value for c in ':;,') else value
+
+
+def escape_uri(value):
+    """Percent-encode spaces and control characters, which may not appear in a URI value (CR/LF would start a new property)"""
+    return _URI_UNSAFE.sub(lambda match: f'%{ord(match.group()):02X}', value)
+
+
+def fold_line(line):
+    """Fold a content line into 75-octet pieces, never splitting a UTF-8 character"""
+    data = line.encode('utf-8')
+    if len(data) <= 75:
+        return data + b'\r\n'
+    pieces, start, limit = [], 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        pieces.append(data[start:end])
+        start, limit = end, 74  # continuation lines start with a space
+    return b'\r\n '.join(pieces) + b'\r\n'
+
+
+def _utc(moment):
+    return moment.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+class CalendarInvite:
+    """A template's meeting as an iCalendar VEVENT, serialized once; each recipient only adds an ATTENDEE line.
+
+    With an organizer the calendar is an iTIP REQUEST (an invitation the
+    recipient can accept); without one it is a PUBLISH (a plain event).
+    """
+
+    def __init__(self, template, organizer=None, timezone='UTC', uid_domain='smartmeeting.ai', stamp=None):
+        if not (template.meeting_date and template.meeting_time):
+            raise MeetingNotScheduled('Template has no meeting date and time')
+        zone = get_timezone(timezone) or ZoneInfo('UTC')
+        start = datetime.combine(template.meeting_date, template.meeting_time).replace(tzinfo=zone)
+        end = start + parse_duration(template.duration)
+        self.method = 'REQUEST' if organizer else 'PUBLISH'
+
+        description = [f'Speaker: {template.speaker_name}'] if template.speaker_name else []
+        if template.meeting_link:
+            description.append(f'Join: {template.meeting_link}')
+
+        lines = [
+            'BEGIN:VCALENDAR',
+            f'PRODID:{ICS_PRODID}',
+            'VERSION:2.0',
+            'CALSCALE:GREGORIAN',
+            f'METHOD:{self.method}',
+            'BEGIN:VEVENT',
+            # Same UID for every recipient (and every resend), so calendars treat it as one event
+            f'UID:template-{template.id}@{uid_domain}',
+            f'DTSTAMP:{_utc(stamp or datetime.now(dt_timezone.utc))}',
+            f'DTSTART:{_utc(start)}',
+            f'DTEND:{_utc(end)}',
+            'SEQUENCE:0',
+            'STATUS:CONFIRMED',
+            f'SUMMARY:{escape_text(template.meeting_topic or template.title)}'
+        ]
+        if template.location or template.meeting_link:
+            lines.append(f'LOCATION:{escape_text(template.location or template.meeting_link)}')
+        if template.meeting_link:
+            lines.append(f'URL:{escape_uri(template.meeting_link)}')
+        if description:
+            lines.append(f"DESCRIPTION:{escape_text(chr(10).join(description))}")
+        if organizer:
+            lines.append(f'ORGANIZER:mailto:{escape_uri(organizer)}')
+        self._head = b''.join(fold_line(line) for line in lines)
+        self._tail = b'END:VEVENT\r\nEND:VCALENDAR\r\n'
+
+    def attendee(self, address, name=None):
+        """Folded ATTENDEE line for one recipient"""
+        params = f';CN={_param(name)}' if name else ''
+        return fold_line(f'ATTENDEE{params};ROLE=REQ-PARTICIPANT;PARTSTAT=NEEDS-ACTION;RSVP=TRUE:mailto:{escape_uri(address)}')
+
+    def render(self, attendees=()):
+        """The .ics bytes with an ATTENDEE for each (address, name) pair"""
+        return b''.join((self._head, *(self.attendee(address, name) for address, name in attendees), self._tail))
+
+    def render_for(self, address, name=None):
+        return self._head + self.attendee(address, name) + self._tail
+
+
+def ics_filename(address, index):
+    # The index keeps names unique when different addresses sanitize to the same text
+    return f"{_FILENAME_UNSAFE.sub('_', address)}-{index}.ics"
+
+
+def iter_distribution_ics(distribution_id, invite):
+    """Lazily yield (filename, .ics bytes) for every recipient of a distribution"""
+    for index, recipient in enumerate(iter_recipients(distribution_id), 1):
+        yield ics_filename(recipient.address, index), invite.render_for(recipient.address, recipient.name)
+
+
+def iter_distribution_ics_zip(distribution_id, invite):
+    """ZIP of per-recipient .ics files, streamed in chunks straight from the recipient rows"""
+    return iter_zip(iter_distribution_ics(distribution_id, invite))
@@ -0,0 +1,261 @@
+import codecs
+import csv
+import zipfile
+from itertools import islice
+
+from sqlalchemy import delete, func, insert, select
+
+from utils import models
+from utils.validation import normalize_email, normalize_phone
+
+try:
+    import openpyxl
+except ImportError:  # optional; only needed for .xlsx uploads
+    openpyxl = None
+
+# Rows validated, de-duplicated and inserted per round trip while importing
+CONTACT_CHUNK_SIZE = 1000
+
+# Rejected rows echoed back to the uploader; the rest are only counted
+INVALID_SAMPLE_SIZE = 20
+
+# Recognized header names (lower-cased) for each contact field
+HEADER_ALIASES = {
+    'email': ('email', 'e-mail', 'email address', 'mail'),
+    'phone': ('phone', 'phone number', 'mobile', 'whatsapp', 'tel'),
+    'name': ('name', 'full name', 'display name'),
+    'timezone': ('timezone', 'time zone', 'tz'),
+}
+
+# What openpyxl raises for a file that is not a readable workbook (missing parts, bad XML, no sheets)
+XLSX_ERRORS = (zipfile.BadZipFile, KeyError, IndexError, SyntaxError)
+
+
+class ContactImportError(ValueError):
+    """The upload is not a contact list we can read"""
+
+
+def iter_csv_rows(stream, encoding='utf-8-sig'):
+    """Yield CSV rows from a binary stream, decoding and parsing it line by line"""
+    lines = codecs.iterdecode(stream, encoding)
+    return csv.reader(lines)
+
+
+def iter_xlsx_rows(stream):
+    """Yield rows of the first worksheet of an .xlsx file, streamed in read-only mode"""
+    if openpyxl is None:
+        raise ContactImportError('XLSX uploads need the openpyxl package; upload a CSV file instead')
+    try:
+        workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+    except XLSX_ERRORS as e:
+        raise ContactImportError('The file is not a valid .xlsx workbook') from e
+    try:
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            yield ['' if cell is None else str(cell) for cell in row]
+    except XLSX_ERRORS as e:
+        raise ContactImportError('The file is not a valid .xlsx workbook') from e
+    finally:
+        workbook.close()
+
+
+def _column_map(header):
+    """Map field -> column index from a header row; None if the row is not a header"""
+    labels = [label.strip().lower() for label in header]
+    columns = {}
+    for field, aliases in HEADER_ALIASES.items():
+        for index, label in enumerate(labels):
+            if label in aliases:
+                columns[field] = index
+                break
+    if 'first name' in labels and 'name' not in columns:
+        columns['first_name'] = labels.index('first name')
+        if 'last name' in labels:
+            columns['last_name'] = labels.index('last name')
+    if 'email' not in columns and 'phone' not in columns:
+        return None
+    return columns
+
+
+def _cell(row, columns, field):
+    index = columns.get(field)
+    return row[index].strip() if index is not None and index < len(row) else ''
+
+
+def _parse_row(row, columns, default_country_code):
+    """Contact dict for a row, or None if it has neither a valid email nor a valid phone"""
+    raw_email = _cell(row, columns, 'email')
+    raw_phone = _cell(row, columns, 'phone')
+    email = normalize_email(raw_email) if raw_email else None
+    phone = normalize_phone(raw_phone, default_country_code) if raw_phone else None
+    if (raw_email and email is None) or (raw_phone and phone is None) or not (email or phone):
+        return None
+    name = _cell(row, columns, 'name')
+    if not name and 'first_name' in columns:
+        name = ' '.join(filter(None, (_cell(row, columns, 'first_name'), _cell(row, columns, 'last_name'))))
+    return {
+        'email': email,
+        'email_key': email.lower() if email else None,
+        'phone': phone,
+        'name': name[:200] or None,
+        'timezone': _cell(row, columns, 'timezone') or None
+    }
+
+
+def _existing_keys(list_id, contacts):
+    """Emails and phones from this chunk already stored in the list (one indexed query each)"""
+    table = models.Contact.__table__
+    emails = [c['email_key'] for c in contacts if c['email_key']]
+    phones = [c['phone'] for c in contacts if c['phone']]
+    seen = set()
+    if emails:
+        seen.update(models.db.session.execute(
+            select(table.c.email_key).where(table.c.list_id == list_id, table.c.email_key.in_(emails))
+        ).scalars())
+    if phones:
+        seen.update(models.db.session.execute(
+            select(table.c.phone).where(table.c.list_id == list_id, table.c.phone.in_(phones))
+        ).scalars())
+    return seen
+
+
+def import_contacts(user_id, name, rows, default_country_code=None, chunk_size=CONTACT_CHUNK_SIZE):
+    """Create a ContactList from parsed rows, streaming them through in chunks.
+
+    Only one chunk is held in memory at a time: duplicates are found with the
+    list's unique indexes rather than an in-memory set of every address. Each
+    chunk is committed on its own, so the database write lock is never held
+    while the upload is read and parsed; the list stays 'importing', hidden
+    from readers, until the last chunk is in, and if the upload fails part-way
+    the partial list is deleted. Returns (contact_list, invalid_sample).
+
+    Emails and phones are de-duplicated separately: a row repeating one
+    address still adds its other one, and only rows that add nothing new
+    count towards duplicate_count.
+    """
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        raise ContactImportError('The file is empty')
+    columns = _column_map(header)
+    line = 1
+    if columns is None:
+        # No header row: a single column of addresses
+        columns = {'email': 0} if '@' in ''.join(header) else {'phone': 0}
+        rows = _prepend(header, rows)
+        line = 0
+
+    db = models.db
+    contact_list = models.ContactList(name=name, user_id=user_id, contact_count=0, invalid_count=0, duplicate_count=0,
+                                      status='importing')
+    db.session.add(contact_list)
+    db.session.commit()
+    try:
+        invalid_sample = _import_chunks(contact_list, rows, columns, line, default_country_code, chunk_size)
+        contact_list.status = 'ready'
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        _discard_contact_list(contact_list.id)
+        raise
+    return contact_list, invalid_sample
+
+
+def _import_chunks(contact_list, rows, columns, line, default_country_code, chunk_size):
+    db = models.db
+    table = models.Contact.__table__
+    invalid_sample = []
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        contacts = []
+        keys = set()
+        for row in chunk:
+            line += 1
+            if not any(cell.strip() for cell in row):
+                continue
+            contact = _parse_row(row, columns, default_country_code)
+            if contact is None:
+                contact_list.invalid_count += 1
+                if len(invalid_sample) < INVALID_SAMPLE_SIZE:
+                    invalid_sample.append({'line': line, 'row': row[:5]})
+                continue
+            # Duplicates within the chunk; earlier chunks are checked against the table below
+            if not _drop_seen(contact, keys):
+                contact_list.duplicate_count += 1
+                continue
+            keys.update(key for key in (contact['email_key'], contact['phone']) if key)
+            contacts.append(contact)
+
+        stored = _existing_keys(contact_list.id, contacts) if contacts else set()
+        new_contacts = []
+        for contact in contacts:
+            if not _drop_seen(contact, stored):
+                contact_list.duplicate_count += 1
+            else:
+                contact['list_id'] = contact_list.id
+                new_contacts.append(contact)
+        if new_contacts:
+            db.session.execute(insert(table), new_contacts)
+            contact_list.contact_count += len(new_contacts)
+        db.session.commit()
+    return invalid_sample
+
+
+def _drop_seen(contact, seen):
+    """Clear the contact's email and phone if already seen; False when neither is left"""
+    if contact['email_key'] in seen:
+        contact['email'] = contact['email_key'] = None
+    if contact['phone'] in seen:
+        contact['phone'] = None
+    return bool(contact['email'] or contact['phone'])
+
+
+def _discard_contact_list(list_id):
+    """Delete a partly imported list and its contacts"""
+    db = models.db
+    db.session.execute(delete(models.Contact.__table__).where(models.Contact.__table__.c.list_id == list_id))
+    db.session.execute(delete(models.ContactList.__table__).where(models.ContactList.__table__.c.id == list_id))
+    db.session.commit()
+
+
+def count_contacts(list_id, channel):
+    """Contacts in a list reachable on a channel ('email' or 'phone')"""
+    table = models.Contact.__table__
+    column = table.c.email if channel == 'email' else table.c.phone
+    return models.db.session.execute(
+        select(func.count()).where(table.c.list_id == list_id, column.isnot(None))
+    ).scalar()
+
+
+def _prepend(first, rows):
+    yield first
+    yield from rows
+
+
+def serialize_contact_list(contact_list):
+    return {
+        'id': contact_list.id,
+        'name': contact_list.name,
+        'contact_count': contact_list.contact_count,
+        'invalid_count': contact_list.invalid_count,
+        'duplicate_count': contact_list.duplicate_count,
+        'created_at': contact_list.created_at.isoformat() if contact_list.created_at else None
+    }
+
+
+def list_contact_lists(user_id):
+    """The user's contact lists, newest first"""
+    ContactList = models.ContactList
+    lists = ContactList.query.filter_by(user_id=user_id, status='ready').order_by(
+        ContactList.created_at.desc(), ContactList.id.desc()
+    ).all()
+    return [serialize_contact_list(contact_list) for contact_list in lists]
+
+
+def get_contact_list(list_id, user_id):
+    """A fully imported contact list owned by user_id, or None"""
+    contact_list = models.db.session.get(models.ContactList, list_id)
+    if contact_list is None or contact_list.user_id != user_id or contact_list.status != 'ready':
+        return None
+    return contact_list
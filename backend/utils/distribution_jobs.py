@@ -0,0 +1,243 @@
+import json
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import select
+
+from utils import models
+from utils.calendar_service import CalendarInvite
+from utils.contact_service import count_contacts
+from utils.export_service import export_filename, get_export_artifact
+from utils.job_queue import renew_claim
+from utils.personalization import MeetingContext, PersonalizedTemplate, personalize
+from utils.recipient_service import (
+    add_dead_letters, add_recipients, add_recipients_from_list, count_recipients_by_status, iter_recipients,
+    record_outcomes
+)
+from utils.send_scheduler import get_scheduler
+
+# Progress is written back after this many send outcomes
+PROGRESS_FLUSH_EVERY = 25
+
+
+def enqueue_gmail_distribution(template, recipients, subject, user_id, personalize=False, timezone=None,
+                               contact_list_id=None, attach_pdf=False, calendar=False):
+    """Create a pending Distribution and a queued job that will send it"""
+    # recipients are email strings or dicts with 'address' and optional 'name' and 'timezone';
+    # with contact_list_id they are taken from that list instead. calendar sends the mail with
+    # a calendar invite as a 'calendar' distribution
+    return _enqueue_distribution(
+        template, 'calendar' if calendar else 'gmail', 'email', recipients, user_id,
+        {'subject': subject, 'personalize': personalize, 'timezone': timezone, 'attach_pdf': attach_pdf},
+        contact_list_id
+    )
+
+
+def enqueue_whatsapp_distribution(template, phone_numbers, user_id, contact_list_id=None):
+    """Create a pending WhatsApp Distribution and a queued job that will send it"""
+    return _enqueue_distribution(template, 'whatsapp', 'phone', phone_numbers, user_id, {}, contact_list_id)
+
+
+def _enqueue_distribution(template, method, channel, recipients, user_id, payload, contact_list_id=None):
+    db = models.db
+    count = count_contacts(contact_list_id, channel) if contact_list_id is not None else len(recipients)
+    distribution = models.Distribution(
+        template_id=template.id,
+        method=method,
+        recipient_count=count,
+        status='pending',
+        user_id=user_id
+    )
+    db.session.add(distribution)
+    db.session.flush()
+    if contact_list_id is not None:
+        # Copied in the database so large lists never pass through memory
+        add_recipients_from_list(distribution.id, channel, contact_list_id)
+        payload['contact_list_id'] = contact_list_id
+    else:
+        add_recipients(distribution.id, channel, recipients)
+
+    job = models.DistributionJob(
+        distribution_id=distribution.id,
+        kind=method,
+        payload=json.dumps(payload),
+        status='queued',
+        total=count,
+        user_id=user_id
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def process_distribution_job(job_id, claim_token):
+    """Run a claimed job inside an app context (called by the worker pool)"""
+    db = models.db
+    job = db.session.get(models.DistributionJob, job_id)
+    if job is None or job.status != 'running' or job.claim_token != claim_token:
+        return
+
+    distribution = db.session.get(models.Distribution, job.distribution_id)
+    template = db.session.get(models.Template, distribution.template_id)
+    if template is None:
+        raise ValueError('Template not found')
+
+    distribution.status = 'sending'
+    renew_claim(job_id, claim_token)
+    db.session.commit()
+
+    if job.kind == 'gmail':
+        run_gmail_job(job, template, claim_token)
+    elif job.kind == 'calendar':
+        run_gmail_job(job, template, claim_token, calendar=True)
+    elif job.kind == 'whatsapp':
+        run_whatsapp_job(job, template, claim_token)
+    else:
+        raise ValueError(f'Unknown distribution job kind: {job.kind}')
+
+    renew_claim(job_id, claim_token)
+    job.status = 'completed'
+    job.finished_at = datetime.utcnow()
+    distribution.status = 'sent' if job.succeeded > 0 else 'failed'
+    distribution.sent_at = job.finished_at
+    db.session.commit()
+
+
+def run_gmail_job(job, template, claim_token, calendar=False):
+    """Send the invitation to every recipient, checkpointing progress as it goes"""
+    # Mail modules are imported by the worker that sends, not by every web process at startup
+    from utils.email_service import GmailChannel, PreparedMessage, has_gmail_credentials
+
+    payload = json.loads(job.payload)
+    subject = payload.get('subject', 'Meeting Invitation')
+    custom_subject = f"{subject}: {template.meeting_topic}" if template.meeting_topic else subject
+
+    gmail_user = current_app.config.get('GMAIL_USER')
+    gmail_password = current_app.config.get('GMAIL_PASSWORD')
+    timezone = payload.get('timezone') or current_app.config.get('MEETING_TIMEZONE', 'UTC')
+
+    # Parse the HTML once; each recipient only fills the placeholder slots
+    personalized = PersonalizedTemplate(template.content, inject=payload.get('personalize', False))
+    context = MeetingContext.for_template(
+        template,
+        distribution_id=job.distribution_id,
+        timezone=timezone,
+        rsvp_url_template=current_app.config.get('RSVP_URL_TEMPLATE'),
+        organizer=gmail_user if has_gmail_credentials(gmail_user, gmail_password) else None
+    )
+
+    # The PDF is rendered (or read from the export cache) once for the whole distribution
+    attachments = None
+    if payload.get('attach_pdf'):
+        path, _ = get_export_artifact(template, 'pdf')
+        with open(path, 'rb') as f:
+            attachments = [(export_filename(template, 'pdf'), f.read(), 'application/pdf')]
+
+    # The MIME message is serialized once; unpersonalized sends reuse the encoded body as-is
+    invite = calendar_invite(template, gmail_user, gmail_password, timezone) if calendar else None
+    prepared = PreparedMessage(personalized.content, custom_subject, gmail_user, attachments, invite)
+    channel = GmailChannel(prepared, gmail_user, gmail_password)
+    scheduler = get_scheduler('gmail', channel.account, channel.send)
+
+    # Only recipients still pending are sent, so a reclaimed job resumes where it stopped
+    pending = iter_recipients(job.distribution_id, 'pending')
+    messages = personalize(personalized, pending, context)
+    payloads = (
+        (recipient, (recipient.address, content if personalized.personalized else None, recipient.name))
+        for recipient, content in messages
+    )
+
+    _run_scheduled(job, claim_token, 'email', scheduler, payloads)
+
+
+def calendar_invite(template, gmail_user, gmail_password, timezone):
+    """CalendarInvite organized by the sending Gmail account (a plain event in demo mode)"""
+    from utils.email_service import has_gmail_credentials
+
+    organizer = gmail_user if has_gmail_credentials(gmail_user, gmail_password) else None
+    return CalendarInvite(template, organizer=organizer, timezone=timezone)
+
+
+def distribution_timezone(distribution_id):
+    """Zone a distribution's meeting times were sent in (MEETING_TIMEZONE unless the sender chose one)"""
+    payload = models.db.session.execute(
+        select(models.DistributionJob.payload).where(models.DistributionJob.distribution_id == distribution_id)
+    ).scalar()
+    timezone = json.loads(payload).get('timezone') if payload else None
+    return timezone or current_app.config.get('MEETING_TIMEZONE', 'UTC')
+
+
+def run_whatsapp_job(job, template, claim_token):
+    """Send the invitation text to every pending phone number over a keep-alive session"""
+    from utils.whatsapp_service import WhatsAppChannel, format_whatsapp_message  # pulls in requests
+
+    channel = WhatsAppChannel()
+    scheduler = get_scheduler('whatsapp', channel.account, channel.send)
+    text = format_whatsapp_message(template)
+
+    pending = iter_recipients(job.distribution_id, 'pending')
+    _run_scheduled(job, claim_token, 'phone', scheduler,
+                   ((recipient, (recipient.address, text)) for recipient in pending))
+
+
+def _run_scheduled(job, claim_token, channel, scheduler, payloads):
+    # Sends run concurrently under the account's rate limit; outcomes are written here, in batches.
+    # The heartbeat keeps the claim fresh while sends wait out long backoffs between flushes
+    def heartbeat():
+        renew_claim(job.id, claim_token)
+        models.db.session.commit()
+
+    interval = current_app.config.get('DISTRIBUTION_JOB_STALE_AFTER', 300) / 5
+    outcomes = []
+    for result in scheduler.run(payloads, heartbeat=heartbeat, heartbeat_interval=interval):
+        outcomes.append(result)
+        if len(outcomes) >= PROGRESS_FLUSH_EVERY:
+            _save_progress(job, claim_token, channel, outcomes)
+            outcomes = []
+    _save_progress(job, claim_token, channel, outcomes)
+
+
+def _save_progress(job, claim_token, channel, results):
+    """Write SendResults back to recipient rows, dead-letter final failures and bump the job counters"""
+    # Fenced first, so a worker that lost the job writes nothing
+    renew_claim(job.id, claim_token)
+    now = datetime.utcnow()
+    record_outcomes([{
+        'id': result.key.id,
+        'status': 'sent' if result.success else 'failed',
+        'error': result.error,
+        'attempts': result.attempts,
+        'sent_at': now if result.success else None
+    } for result in results])
+    add_dead_letters(job.distribution_id, channel, [{
+        'recipient_id': result.key.id,
+        'address': result.key.address,
+        'error': result.error,
+        'attempts': result.attempts,
+        'permanent': result.permanent
+    } for result in results if not result.success])
+    succeeded = sum(1 for result in results if result.success)
+    job.succeeded = (job.succeeded or 0) + succeeded
+    job.failed = (job.failed or 0) + len(results) - succeeded
+    models.db.session.commit()
+
+
+def serialize_job(job, distribution=None):
+    """JSON-friendly view of a job for the status endpoint (per-recipient details are paged separately)"""
+    return {
+        'job_id': job.id,
+        'distribution_id': job.distribution_id,
+        'method': job.kind,
+        'status': job.status,
+        'distribution_status': distribution.status if distribution else None,
+        'total': job.total,
+        'processed': job.succeeded + job.failed,
+        'succeeded': job.succeeded,
+        'failed': job.failed,
+        'error': job.error,
+        'recipients': count_recipients_by_status(job.distribution_id),
+        'details_url': f'/api/distribution/jobs/{job.id}/recipients',
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None
+    }
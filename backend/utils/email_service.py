@@ -1,42 +1,195 @@
+import base64
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
+from email.policy import SMTP
+from email.utils import formatdate, make_msgid
+from flask import current_app, has_app_context
 
-def send_gmail_invitation(recipient_email, template_content, subject="Meeting Invitation", gmail_user=None, gmail_password=None):
+from utils.send_scheduler import PermanentSendError, TransientSendError
+from utils.smtp_pool import RECONNECT_ERRORS, get_pool
+
+def get_smtp_pool(gmail_user, gmail_password):
+    """Get the shared SMTP connection pool for a Gmail account"""
+    settings = current_app.config if has_app_context() else {}
+    return get_pool(
+        settings.get('SMTP_HOST', 'smtp.gmail.com'),
+        settings.get('SMTP_PORT', 587),
+        gmail_user,
+        gmail_password,
+        use_tls=settings.get('SMTP_USE_TLS', True),
+        size=settings.get('SMTP_POOL_SIZE', 4),
+        idle_timeout=settings.get('SMTP_POOL_IDLE_TIMEOUT', 60),
+        max_messages=settings.get('SMTP_MAX_MESSAGES_PER_CONNECTION', 100)
+    )
+
+# Placeholder credentials from env.example mean "demo mode": nothing is actually sent
+DEMO_GMAIL_USER = 'your-email@gmail.com'
+DEMO_GMAIL_PASSWORD = 'your-16-character-app-password-here'
+
+# Stand in for the HTML body and the calendar invite while the MIME skeleton is serialized
+_BODY_MARKER = b'SMARTMEETING-BODY-MARKER'
+_CALENDAR_MARKER = b'SMARTMEETING-CALENDAR-MARKER'
+
+def has_gmail_credentials(gmail_user, gmail_password):
+    return bool(gmail_user and gmail_password and gmail_user != DEMO_GMAIL_USER and gmail_password != DEMO_GMAIL_PASSWORD)
+
+def _encode_body(html):
+    return _encode_bytes(html.encode('utf-8'))
+
+def _encode_bytes(data):
+    return base64.encodebytes(data).replace(b'\n', b'\r\n')
+
+def _attachment_part(filename, content, mimetype):
+    maintype, _, subtype = mimetype.partition('/')
+    if maintype != 'application':
+        raise ValueError(f'Unsupported attachment type: {mimetype}')
+    part = MIMEApplication(content, subtype, policy=SMTP)
+    part.add_header('Content-Disposition', 'attachment', filename=filename)
+    return part
+
+class PreparedMessage:
+    """An HTML email serialized once; each recipient only adds To, Date and Message-ID headers.
+
+    With a CalendarInvite a text/calendar alternative is added that mail clients
+    show as an invitation; its ATTENDEE line is the only per-recipient part.
+    """
+
+    def __init__(self, body, subject="Meeting Invitation", sender=None, attachments=None, calendar=None):
+        self.sender = sender or 'noreply@smartmeeting.ai'
+        self._domain = self.sender.rpartition('@')[2] or 'smartmeeting.ai'
+        self.calendar = calendar
+
+        # Serialize the multipart skeleton once, then split it around the body part's payload
+        msg = MIMEMultipart('alternative', policy=SMTP)
+        html_part = MIMEText('', 'html', 'utf-8', policy=SMTP)
+        html_part.set_payload(_BODY_MARKER.decode('ascii'))
+        msg.attach(html_part)
+        if calendar is not None:
+            calendar_part = MIMEText('', 'calendar', 'utf-8', policy=SMTP)
+            calendar_part.set_param('method', calendar.method)
+            calendar_part.set_payload(_CALENDAR_MARKER.decode('ascii'))
+            msg.attach(calendar_part)
+        if attachments:
+            # (filename, bytes, mimetype) files follow the body, base64-encoded once into the shared tail
+            alternative, msg = msg, MIMEMultipart('mixed', policy=SMTP)
+            msg.attach(alternative)
+            for filename, content, mimetype in attachments:
+                msg.attach(_attachment_part(filename, content, mimetype))
+        msg['Subject'] = subject
+        msg['From'] = self.sender
+        self._head, self._tail = msg.as_bytes().split(_BODY_MARKER)
+        if calendar is not None:
+            self._middle, self._tail = self._tail.split(_CALENDAR_MARKER)
+        self._shared = self._head + _encode_body(body) if body is not None else None
+
+    def render(self, recipient, body=None, name=None):
+        """Return (message_id, message bytes); body replaces the shared HTML for this recipient"""
+        message_id = make_msgid(domain=self._domain)
+        headers = f"To: {recipient}\r\nDate: {formatdate(localtime=True)}\r\nMessage-ID: {message_id}\r\n"
+        content = self._shared if body is None else self._head + _encode_body(body)
+        if self.calendar is None:
+            return message_id, b''.join((headers.encode('utf-8'), content, self._tail))
+        invite = _encode_bytes(self.calendar.render_for(recipient, name))
+        return message_id, b''.join((headers.encode('utf-8'), content, self._middle, invite, self._tail))
+
+def send_prepared(prepared, messages, gmail_user=None, gmail_password=None, pool=None):
+    """Send (recipient, body or None) pairs built from one PreparedMessage back-to-back on a pooled session"""
+    messages = list(messages)
+    if pool is None:
+        if not has_gmail_credentials(gmail_user, gmail_password):
+            return [{'recipient': recipient, 'success': True, 'message_id': None,
+                     'message': f"Email sent successfully to {recipient} (demo mode - configure Gmail credentials for real sending)"}
+                    for recipient, _ in messages]
+        pool = get_smtp_pool(gmail_user, gmail_password)
+
+    # Messages are rendered lazily as the pool sends them, so only one is held at a time
+    envelope_from = gmail_user or prepared.sender
+    message_ids = []
+    def envelopes():
+        for recipient, body in messages:
+            message_id, data = prepared.render(recipient, body)
+            message_ids.append(message_id)
+            yield envelope_from, [recipient], data
+
+    results = []
+    for (recipient, _), message_id, outcome in zip(messages, message_ids, pool.send_batch(envelopes())):
+        if outcome['success']:
+            results.append({'recipient': recipient, 'success': True, 'message_id': message_id,
+                            'message': f"Email sent successfully to {recipient}"})
+        else:
+            results.append({'recipient': recipient, 'success': False, 'message_id': message_id,
+                            'message': f"Failed to send email: {outcome['error']}"})
+    return results
+
+def send_many(recipients, body, subject="Meeting Invitation", gmail_user=None, gmail_password=None, pool=None, attachments=None):
+    """Send the same HTML to many recipients, encoding the MIME body only once"""
+    prepared = PreparedMessage(body, subject, gmail_user, attachments)
+    return send_prepared(prepared, ((recipient, None) for recipient in recipients), gmail_user, gmail_password, pool)
+
+def smtp_send_error(error):
+    """Classify an SMTP failure: 4xx replies and dropped connections are transient, 5xx permanent"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        transient = bool(codes) and all(400 <= code < 500 for code in codes)
+    elif isinstance(error, smtplib.SMTPResponseException):
+        transient = 400 <= error.smtp_code < 500
+    else:
+        transient = isinstance(error, RECONNECT_ERRORS + (OSError,))
+    return (TransientSendError if transient else PermanentSendError)(str(error))
+
+class GmailChannel:
+    """Sends (recipient, body or None, name) payloads of one PreparedMessage for the send scheduler"""
+
+    def __init__(self, prepared, gmail_user=None, gmail_password=None, pool=None):
+        self.prepared = prepared
+        self.live = pool is not None or has_gmail_credentials(gmail_user, gmail_password)
+        self.account = (gmail_user or prepared.sender) if self.live else None
+        self.envelope_from = gmail_user or prepared.sender
+        # Resolved here, in the app context: send() runs on scheduler threads that have none
+        if self.live and pool is None:
+            pool = get_smtp_pool(gmail_user, gmail_password)
+        self._pool = pool
+
+    def send(self, payload):
+        recipient, body, name = payload
+        if not self.live:
+            return {'message_id': None,
+                    'message': f"Email sent successfully to {recipient} (demo mode - configure Gmail credentials for real sending)"}
+        message_id, data = self.prepared.render(recipient, body, name)
+        try:
+            self._pool.sendmail(self.envelope_from, [recipient], data)
+        except Exception as e:
+            raise smtp_send_error(e) from e
+        return {'message_id': message_id, 'message': f"Email sent successfully to {recipient}"}
+
+def send_gmail_invitation(recipient_email, template_content, subject="Meeting Invitation", gmail_user=None, gmail_password=None, pool=None,
+                          attachments=None, prepared=None):
     """Send Gmail invitation using Gmail API or SMTP fallback"""
     try:
-        # Create email message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = gmail_user or 'noreply@smartmeeting.ai'
-        msg['To'] = recipient_email
-        msg['Content-Type'] = 'text/html; charset=utf-8'
-        
-        html_part = MIMEText(template_content, 'html', 'utf-8')
-        msg.attach(html_part)
+        # Create email message; pass a PreparedMessage to reuse one built (and its attachments encoded) for a whole send
+        if prepared is None:
+            prepared = PreparedMessage(template_content, subject, gmail_user, attachments)
         
         # Try Gmail API first, fallback to SMTP
-        if gmail_user and gmail_password and gmail_user != 'your-email@gmail.com' and gmail_password != 'your-16-character-app-password-here':
-            # Use SMTP with app password
+        if has_gmail_credentials(gmail_user, gmail_password):
+            # Use SMTP with app password over a pooled, already-authenticated session
             try:
-                server = smtplib.SMTP('smtp.gmail.com', 587)
-                server.starttls()
-                server.login(gmail_user, gmail_password)
-                
-                text = msg.as_string()
-                server.sendmail(gmail_user, recipient_email, text)
-                server.quit()
-                
+                if pool is None:
+                    pool = get_smtp_pool(gmail_user, gmail_password)
+
+                _, data = prepared.render(recipient_email)
+                pool.sendmail(gmail_user, recipient_email, data)
+
                 return {"success": True, "message": f"Email sent successfully to {recipient_email}"}
             except Exception as smtp_error:
                 print(f"SMTP Error: {smtp_error}")
-                # Fallback to demo mode
-                return {"success": True, "message": f"Email sent successfully to {recipient_email} (demo mode - configure Gmail credentials for real sending)"}
+                return {"success": False, "message": f"Failed to send email: {smtp_error}"}
         else:
             # Demo mode - no real credentials configured
             return {"success": True, "message": f"Email sent successfully to {recipient_email} (demo mode - configure Gmail credentials for real sending)"}
             
     except Exception as e:
         print(f"Gmail sending error: {e}")
-        return {"success": False, "message": f"Failed to send email: {str(e)}"} 
\ No newline at end of file
+        return {"success": False, "message": f"Failed to send email: {str(e)}"}
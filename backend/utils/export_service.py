@@ -0,0 +1,120 @@
+import glob
+import hashlib
+import os
+import tempfile
+
+from flask import current_app, render_template
+from sqlalchemy import select
+
+from utils import models
+from utils.pdf_service import PdfUnavailable, get_pdf_pool, pdf_available
+from utils.template_storage import body_digest
+
+# Bump when an export document changes, so artifacts built by older code are not served
+EXPORT_FORMAT_VERSION = 1
+
+# format -> (file suffix, mimetype)
+EXPORT_FORMATS = {
+    'html': ('.html', 'text/html'),
+    'pdf': ('.pdf', 'application/pdf'),
+}
+
+
+def export_filename(template, fmt='html'):
+    """Download / attachment file name of a template export"""
+    suffix, _ = EXPORT_FORMATS[fmt]
+    return f"{template.title.replace(' ', '_')}_meeting_invitation{suffix}"
+
+
+def render_html_export(template, etag=None):
+    """Standalone HTML document for a template download"""
+    return render_template(
+        'exports/template_download.html',
+        template=template,
+        content=template.content,
+        generated_on=template.updated_at or template.created_at
+    ).encode('utf-8')
+
+
+def render_pdf_export(template, etag=None):
+    """The HTML export printed to PDF in the render pool (PdfQueueFull when the pool is saturated)"""
+    if not pdf_available():
+        raise PdfUnavailable('PDF export requires the weasyprint package')
+    config = current_app.config
+    html = render_html_export(template).decode('utf-8')
+    # Keyed on the artifact etag, so concurrent requests for one version share a render
+    return get_pdf_pool().render(
+        html,
+        key=(template.id, etag),
+        wait=config.get('PDF_RENDER_QUEUE_WAIT', 2),
+        timeout=config.get('PDF_RENDER_TIMEOUT', 60)
+    )
+
+
+EXPORT_RENDERERS = {
+    'html': render_html_export,
+    'pdf': render_pdf_export,
+}
+
+
+def get_export_dir():
+    """Directory holding export artifacts (EXPORT_DIR, default instance/exports)"""
+    path = current_app.config.get('EXPORT_DIR') or os.path.join(current_app.instance_path, 'exports')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def template_digest(template):
+    """sha256 of the template HTML, read from its stored digest without decoding the body"""
+    TemplateBody = models.TemplateBody
+    digest = models.db.session.execute(
+        select(TemplateBody.digest).where(TemplateBody.template_id == template.id)
+    ).scalar()
+    # Bodies written before digests were stored (or legacy inline content) are hashed here
+    return digest or body_digest(template.content)
+
+
+def export_etag(template, fmt, digest):
+    """Content hash of everything an export is rendered from"""
+    modified = template.updated_at or template.created_at
+    material = '\0'.join((
+        str(EXPORT_FORMAT_VERSION), fmt, template.title, modified.isoformat() if modified else '', digest
+    ))
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()[:32]
+
+
+def _write_atomic(path, data):
+    """Write a file so concurrent readers see either nothing or the whole artifact"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _remove_stale_artifacts(directory, template_id, suffix, keep):
+    for path in glob.glob(os.path.join(directory, f'{template_id}-*{suffix}')):
+        if path != keep:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass  # another worker removed it first
+
+
+def get_export_artifact(template, fmt='html'):
+    """(path, etag) of a template's export, rendering it only when no artifact exists for this version.
+
+    Artifacts are named by template id and content hash, so a changed
+    template gets a new file and the old one is deleted.
+    """
+    suffix, _ = EXPORT_FORMATS[fmt]
+    etag = export_etag(template, fmt, template_digest(template))
+    directory = get_export_dir()
+    path = os.path.join(directory, f'{template.id}-{etag}{suffix}')
+    if not os.path.exists(path):
+        _write_atomic(path, EXPORT_RENDERERS[fmt](template, etag))
+        _remove_stale_artifacts(directory, template.id, suffix, keep=path)
+    return path, etag
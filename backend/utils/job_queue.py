@@ -0,0 +1,147 @@
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, and_
+
+from utils import models
+
+
+class JobReclaimed(RuntimeError):
+    """Another worker claimed the job after its heartbeat went stale; this worker must stop"""
+
+
+def renew_claim(job_id, claim_token):
+    """Refresh a running job's heartbeat in the current transaction, if this worker still holds the claim.
+
+    Call before writing a job's progress: the UPDATE is fenced on claim_token,
+    so once another worker has reclaimed the job the write is rolled back and
+    JobReclaimed is raised instead.
+    """
+    renewed = models.DistributionJob.query.filter_by(
+        id=job_id, status='running', claim_token=claim_token
+    ).update({'heartbeat_at': datetime.utcnow()}, synchronize_session=False)
+    if not renewed:
+        models.db.session.rollback()
+        raise JobReclaimed(f'Distribution job {job_id} was claimed by another worker')
+
+
+class JobWorkerPool:
+    """Background worker threads that drain DistributionJob rows from the database.
+
+    The job table is the queue, so no broker is needed and several gunicorn
+    workers can share it: a job is claimed with a conditional UPDATE, and jobs
+    whose heartbeat goes stale (e.g. the process died) are picked up again.
+    Each claim gets a new claim_token that `handler(job_id, claim_token)` passes
+    to renew_claim, so a worker that lost its job cannot keep writing to it.
+    """
+
+    def __init__(self, app, handler, workers=2, poll_interval=1.0, stale_after=300):
+        self.app = app
+        self.handler = handler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._threads = []
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+
+    def start(self):
+        """Start the worker threads once per process (safe to call repeatedly)"""
+        if self._running():
+            return
+        with self._lock:
+            if self._running():
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._threads = [
+                threading.Thread(target=self._run, name=f'distribution-worker-{i}', daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def _running(self):
+        # Threads do not survive a fork, so a new pid means a new set of workers
+        return self._pid == os.getpid() and all(t.is_alive() for t in self._threads)
+
+    def notify(self):
+        """Wake idle workers after a job has been enqueued"""
+        self.start()
+        self._wakeup.set()
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                claim = self._claim()
+            except Exception as e:
+                print(f"Job queue error: {e}")
+                claim = None
+
+            if claim is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            job_id, claim_token = claim
+            try:
+                with self.app.app_context():
+                    self.handler(job_id, claim_token)
+            except JobReclaimed as e:
+                print(e)
+            except Exception as e:
+                print(f"Distribution job {job_id} crashed: {e}")
+                self._mark_failed(job_id, claim_token, str(e))
+
+    def _claim(self):
+        """Atomically move the oldest runnable job to 'running'; returns (job id, claim token) or None"""
+        DistributionJob = models.DistributionJob
+        with self.app.app_context():
+            now = datetime.utcnow()
+            claim_token = str(uuid.uuid4())
+            stale_cutoff = now - timedelta(seconds=self.stale_after)
+            candidate = DistributionJob.query.filter(or_(
+                DistributionJob.status == 'queued',
+                and_(DistributionJob.status == 'running', DistributionJob.heartbeat_at < stale_cutoff)
+            )).order_by(DistributionJob.created_at).first()
+            if candidate is None:
+                return None
+
+            claimed = DistributionJob.query.filter_by(
+                id=candidate.id,
+                status=candidate.status,
+                heartbeat_at=candidate.heartbeat_at
+            ).update({
+                'status': 'running',
+                'claim_token': claim_token,
+                'started_at': candidate.started_at or now,
+                'heartbeat_at': now
+            }, synchronize_session=False)
+            models.db.session.commit()
+            # Another worker won the race; try again on the next loop
+            return (candidate.id, claim_token) if claimed else None
+
+    def _mark_failed(self, job_id, claim_token, error):
+        with self.app.app_context():
+            try:
+                renew_claim(job_id, claim_token)
+            except JobReclaimed:
+                return  # another worker owns the job now and will finish it
+            job = models.db.session.get(models.DistributionJob, job_id)
+            job.status = 'failed'
+            job.error = error
+            job.finished_at = datetime.utcnow()
+            distribution = models.db.session.get(models.Distribution, job.distribution_id)
+            if distribution is not None and distribution.status in ('pending', 'sending'):
+                distribution.status = 'failed'
+            models.db.session.commit()
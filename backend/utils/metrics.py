@@ -0,0 +1,192 @@
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+from flask import request
+from sqlalchemy import event
+
+# Upper bounds (seconds) of request latency buckets; the last bucket is open-ended
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Upper bounds of the SQL-statements-per-request buckets; N+1 queries show up in the high ones
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Every metric exposed at /api/metrics, in registration order
+_registry = []
+_registry_lock = threading.Lock()
+
+
+def register(metric):
+    with _registry_lock:
+        _registry.append(metric)
+    return metric
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Histogram:
+    """Cumulative histogram (Prometheus style) with one series per combination of label values"""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, *labels_and_value):
+        """observe(label values..., value)"""
+        *labels, value = labels_and_value
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(tuple(labels))
+            if series is None:
+                series = self._series[tuple(labels)] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0}
+            series['counts'][index] += 1
+            series['sum'] += value
+
+    def _copy(self):
+        with self._lock:
+            return sorted((labels, list(value['counts']), value['sum']) for labels, value in self._series.items())
+
+    def _cumulative(self, counts):
+        running = 0
+        for bound, count in zip(self.buckets + ('+Inf',), counts):
+            running += count
+            yield bound, running
+
+    def snapshot(self):
+        """{label value: ... {count, sum, buckets: {le: cumulative count}}}, nested in label order"""
+        result = {}
+        for labels, counts, total in self._copy():
+            cumulative = {str(bound): running for bound, running in self._cumulative(counts)}
+            node = result
+            for label in labels[:-1]:
+                node = node.setdefault(label, {})
+            node[labels[-1] if labels else ''] = {
+                'count': cumulative['+Inf'], 'sum': round(total, 6), 'buckets': cumulative
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def collect(self):
+        """Lines in the Prometheus text exposition format"""
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for labels, counts, total in self._copy():
+            for bound, running in self._cumulative(counts):
+                le = 'le="+Inf"' if bound == '+Inf' else f'le="{float(bound)!r}"'
+                lines.append(f'{self.name}_bucket{_labels(self.labelnames, labels, le)} {running}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, labels)} {total!r}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, labels)} {sum(counts)}')
+        return lines
+
+
+class CallbackMetric:
+    """Gauge or counter read from existing stats when scraped; fn returns {label values tuple: value}"""
+
+    def __init__(self, name, documentation, kind, labelnames, fn):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.fn = fn
+
+    def collect(self):
+        try:
+            samples = self.fn()
+        except Exception as e:
+            print(f"Metric {self.name} failed: {e}")
+            return []
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(f'{self.name}{_labels(self.labelnames, labels)} {value!r}' for labels, value in sorted(samples.items()))
+        return lines
+
+
+def render_metrics():
+    """All registered metrics in the Prometheus text format"""
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.collect())
+    return '\n'.join(lines) + '\n'
+
+
+REQUEST_LATENCY = register(Histogram(
+    'smartmeeting_http_request_duration_seconds', 'Time to produce an HTTP response (streamed bodies excluded)',
+    ('endpoint', 'method', 'status')
+))
+REQUEST_QUERIES = register(Histogram(
+    'smartmeeting_http_request_db_queries', 'SQL statements executed per HTTP request',
+    ('endpoint',), QUERY_COUNT_BUCKETS
+))
+REQUEST_DB_TIME = register(Histogram(
+    'smartmeeting_http_request_db_duration_seconds', 'Time spent executing SQL per HTTP request',
+    ('endpoint',)
+))
+
+
+# [request start, SQL statements, SQL seconds, current statement start] of the request being handled;
+# a plain list behind a ContextVar keeps the per-statement hooks to a lookup and two additions
+_request_stats = ContextVar('request_stats', default=None)
+
+
+def _start_request():
+    _request_stats.set([time.perf_counter(), 0, 0.0, 0.0])
+
+
+def _finish_request(response):
+    stats = _request_stats.get()
+    if stats is None:
+        return response
+    _request_stats.set(None)  # statements run while a body streams are not attributed
+    start, queries, db_seconds, _ = stats
+    elapsed = time.perf_counter() - start
+    endpoint = request.url_rule.endpoint if request.url_rule else 'unmatched'  # raw paths would explode the label set
+    REQUEST_LATENCY.observe(endpoint, request.method, str(response.status_code), elapsed)
+    REQUEST_QUERIES.observe(endpoint, queries)
+    REQUEST_DB_TIME.observe(endpoint, db_seconds)
+    # Per-request breakdown for browser dev tools
+    response.headers['Server-Timing'] = (
+        f'db;dur={db_seconds * 1000:.1f};desc="{queries} queries", app;dur={elapsed * 1000:.1f}'
+    )
+    return response
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats[3] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats[1] += 1
+        stats[2] += time.perf_counter() - stats[3]
+
+
+def init_metrics(app, db):
+    """Install request timing and SQL counting hooks when METRICS_ENABLED; otherwise nothing is added"""
+    if not app.config.get('METRICS_ENABLED'):
+        return
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
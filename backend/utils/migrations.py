@@ -0,0 +1,228 @@
+import json
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+# Ordered schema migrations applied on top of db.create_all()
+MIGRATIONS = []
+
+BACKFILL_CHUNK_SIZE = 1000
+
+# Composite indexes for the user-scoped queries behind the dashboard, the
+# distribution page, stats rebuilds and the job workers' claim query
+QUERY_INDEXES = (
+    ('ix_template_user_created', 'template', ('user_id', 'created_at', 'id')),
+    ('ix_distribution_user_created', 'distribution', ('user_id', 'created_at')),
+    ('ix_distribution_user_status', 'distribution', ('user_id', 'status', 'method')),
+    ('ix_distribution_job_status_created', 'distribution_job', ('status', 'created_at')),
+)
+
+
+def migration(version, description):
+    """Register a schema migration step; steps run once, in version order"""
+    def register(fn):
+        MIGRATIONS.append((version, description, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return register
+
+
+def _has_column(connection, table, column):
+    return column in {c['name'] for c in inspect(connection).get_columns(table)}
+
+
+def _has_index(connection, table, name):
+    return name in {i['name'] for i in inspect(connection).get_indexes(table)}
+
+
+def run_migrations(db):
+    """Apply pending migrations and record them in schema_migrations"""
+    with db.engine.begin() as connection:
+        connection.execute(text(
+            'CREATE TABLE IF NOT EXISTS schema_migrations ('
+            ' version INTEGER PRIMARY KEY, description VARCHAR(200), applied_at DATETIME)'
+        ))
+        applied = {row[0] for row in connection.execute(text('SELECT version FROM schema_migrations'))}
+
+    for version, description, fn in MIGRATIONS:
+        if version in applied:
+            continue
+        with db.engine.begin() as connection:
+            fn(connection)
+            connection.execute(
+                text('INSERT INTO schema_migrations (version, description, applied_at) VALUES (:v, :d, :t)'),
+                {'v': version, 'd': description, 't': datetime.utcnow()}
+            )
+        print(f"Applied migration {version}: {description}")
+
+
+@migration(1, 'Add distribution.recipient_count and backfill it from the recipients JSON')
+def add_distribution_recipient_count(connection):
+    if not _has_column(connection, 'distribution', 'recipient_count'):
+        connection.execute(text('ALTER TABLE distribution ADD COLUMN recipient_count INTEGER DEFAULT 0'))
+
+    last_id = 0
+    while True:
+        rows = connection.execute(text(
+            'SELECT id, recipients FROM distribution WHERE id > :last_id ORDER BY id LIMIT :limit'
+        ), {'last_id': last_id, 'limit': BACKFILL_CHUNK_SIZE}).fetchall()
+        if not rows:
+            break
+        connection.execute(
+            text('UPDATE distribution SET recipient_count = :count WHERE id = :id'),
+            [{'id': row[0], 'count': len(json.loads(row[1] or '[]'))} for row in rows]
+        )
+        last_id = rows[-1][0]
+
+
+@migration(2, 'Backfill the user_stats rollup from existing templates and distributions')
+def backfill_user_stats(connection):
+    from utils.stats_service import rebuild_user_stats
+    rebuild_user_stats(connection)
+
+
+def _legacy_recipient_rows(distribution_id, recipients_json, status, sent_at, results_json):
+    """Expand one distribution's JSON recipients (and job results, if any) into recipient rows"""
+    # Distributions sent by a background job keep per-address outcomes in the job results
+    outcomes = None
+    if results_json is not None:
+        outcomes = {entry.get('email'): entry for entry in json.loads(results_json or '[]')}
+
+    rows = []
+    for entry in json.loads(recipients_json or '[]'):
+        channel = 'phone' if 'phone' in entry else 'email'
+        address = entry.get(channel) or ''
+        row = {'distribution_id': distribution_id, 'channel': channel, 'address': address,
+               'status': 'pending', 'error': None, 'attempts': 0, 'sent_at': None}
+        if outcomes is not None:
+            outcome = outcomes.get(address)
+            if outcome is not None:
+                row['status'] = 'sent' if outcome.get('success') else 'failed'
+                row['error'] = None if outcome.get('success') else outcome.get('message')
+        elif status in ('sent', 'failed'):
+            row['status'] = status
+        if row['status'] == 'sent':
+            row['sent_at'] = sent_at
+        rows.append(row)
+    return rows
+
+
+@migration(3, 'Backfill distribution_recipient rows from the legacy recipients JSON')
+def backfill_distribution_recipients(connection):
+    last_id = 0
+    while True:
+        distributions = connection.execute(text(
+            'SELECT d.id, d.recipients, d.status, d.sent_at, j.results FROM distribution d'
+            ' LEFT JOIN distribution_job j ON j.distribution_id = d.id'
+            ' WHERE d.id > :last_id'
+            ' AND NOT EXISTS (SELECT 1 FROM distribution_recipient r WHERE r.distribution_id = d.id)'
+            ' ORDER BY d.id LIMIT :limit'
+        ), {'last_id': last_id, 'limit': BACKFILL_CHUNK_SIZE}).fetchall()
+        if not distributions:
+            break
+        rows = []
+        for distribution in distributions:
+            rows.extend(_legacy_recipient_rows(*distribution))
+        if rows:
+            connection.execute(text(
+                'INSERT INTO distribution_recipient (distribution_id, channel, address, status, error, attempts, sent_at)'
+                ' VALUES (:distribution_id, :channel, :address, :status, :error, :attempts, :sent_at)'
+            ), rows)
+        last_id = distributions[-1][0]
+
+    # Recipient outcomes now come from these rows
+    from utils.stats_service import rebuild_user_stats
+    rebuild_user_stats(connection)
+
+
+def create_query_indexes(connection, indexes=QUERY_INDEXES):
+    """Create any missing indexes from QUERY_INDEXES"""
+    for name, table, columns in indexes:
+        if not _has_index(connection, table, name):
+            connection.execute(text(f'CREATE INDEX {name} ON {table} ({", ".join(columns)})'))
+
+
+def drop_query_indexes(connection, indexes=QUERY_INDEXES):
+    """Drop the QUERY_INDEXES (used by benchmarks to compare query plans)"""
+    for name, table, columns in indexes:
+        if _has_index(connection, table, name):
+            connection.execute(text(f'DROP INDEX {name}'))
+
+
+@migration(4, 'Add composite indexes for user-scoped template, distribution and job queries')
+def add_query_indexes(connection):
+    create_query_indexes(connection)
+
+
+@migration(5, 'Move template HTML into compressed template_body rows')
+def move_template_bodies(connection):
+    from utils.template_storage import encode_body
+
+    last_id = 0
+    while True:
+        rows = connection.execute(text(
+            "SELECT id, content FROM template WHERE id > :last_id AND content != '' ORDER BY id LIMIT :limit"
+        ), {'last_id': last_id, 'limit': BACKFILL_CHUNK_SIZE}).fetchall()
+        if not rows:
+            break
+        bodies = []
+        for template_id, content in rows:
+            encoding, data = encode_body(content)
+            bodies.append({'template_id': template_id, 'encoding': encoding, 'data': data, 'size': len(content)})
+        connection.execute(text(
+            'INSERT INTO template_body (template_id, encoding, data, size) VALUES (:template_id, :encoding, :data, :size)'
+        ), bodies)
+        connection.execute(text("UPDATE template SET content = '' WHERE id = :id"), [{'id': row[0]} for row in rows])
+        last_id = rows[-1][0]
+
+
+@migration(6, 'Add name and timezone to distribution_recipient for personalization')
+def add_recipient_personalization_columns(connection):
+    if not _has_column(connection, 'distribution_recipient', 'name'):
+        connection.execute(text('ALTER TABLE distribution_recipient ADD COLUMN name VARCHAR(200)'))
+    if not _has_column(connection, 'distribution_recipient', 'timezone'):
+        connection.execute(text('ALTER TABLE distribution_recipient ADD COLUMN timezone VARCHAR(64)'))
+
+
+@migration(7, 'Add attempts to distribution_recipient for the send scheduler')
+def add_recipient_attempts_column(connection):
+    if not _has_column(connection, 'distribution_recipient', 'attempts'):
+        connection.execute(text('ALTER TABLE distribution_recipient ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0'))
+
+
+@migration(8, 'Add template.updated_at and template_body.digest for cached exports')
+def add_export_cache_columns(connection):
+    from utils.template_storage import body_digest, decode_body
+
+    if not _has_column(connection, 'template', 'updated_at'):
+        connection.execute(text('ALTER TABLE template ADD COLUMN updated_at DATETIME'))
+        connection.execute(text('UPDATE template SET updated_at = created_at'))
+    if not _has_column(connection, 'template_body', 'digest'):
+        connection.execute(text('ALTER TABLE template_body ADD COLUMN digest VARCHAR(64)'))
+
+    last_id = 0
+    while True:
+        rows = connection.execute(text(
+            'SELECT template_id, encoding, data FROM template_body'
+            ' WHERE template_id > :last_id AND digest IS NULL ORDER BY template_id LIMIT :limit'
+        ), {'last_id': last_id, 'limit': BACKFILL_CHUNK_SIZE}).fetchall()
+        if not rows:
+            break
+        connection.execute(
+            text('UPDATE template_body SET digest = :digest WHERE template_id = :id'),
+            [{'id': row[0], 'digest': body_digest(decode_body(row[1], row[2]))} for row in rows]
+        )
+        last_id = rows[-1][0]
+
+
+@migration(9, 'Add distribution_job.claim_token to fence progress writes to the claiming worker')
+def add_job_claim_token(connection):
+    if not _has_column(connection, 'distribution_job', 'claim_token'):
+        connection.execute(text('ALTER TABLE distribution_job ADD COLUMN claim_token VARCHAR(36)'))
+
+
+@migration(10, 'Add contact_list.status so lists stay hidden until their import finishes')
+def add_contact_list_status(connection):
+    if not _has_column(connection, 'contact_list', 'status'):
+        # Lists created before this column were fully imported
+        connection.execute(text("ALTER TABLE contact_list ADD COLUMN status VARCHAR(20) NOT NULL DEFAULT 'ready'"))
@@ -1,13 +1,20 @@
+import uuid
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 
+from utils.template_storage import body_digest, decode_body, encode_body
+
 # Global db instance that will be set by init_models
 db = None
 
+# Model classes, set by init_models so services can reach them without main
+User = Template = TemplateBody = Distribution = DistributionRecipient = DistributionJob = UserStats = DeadLetter = ContactList = Contact = None
+
 def init_models(db_instance):
     """Initialize models with database instance"""
-    global db
+    global db, User, Template, TemplateBody, Distribution, DistributionRecipient, DistributionJob, UserStats, DeadLetter
+    global ContactList, Contact
     db = db_instance
     
     # Define models as classes that will be created with the db instance
@@ -23,7 +30,8 @@ def init_models(db_instance):
     class Template(db.Model):
         id = db.Column(db.Integer, primary_key=True)
         title = db.Column(db.String(200), nullable=False)
-        content = db.Column(db.Text, nullable=False)
+        # Legacy inline HTML; bodies now live (compressed) in TemplateBody, see the content property
+        _content = db.deferred(db.Column('content', db.Text, nullable=False, default=''))
         meeting_topic = db.Column(db.String(200))
         speaker_name = db.Column(db.String(100))
         meeting_date = db.Column(db.Date)
@@ -31,22 +39,146 @@ def init_models(db_instance):
         duration = db.Column(db.String(50))
         meeting_link = db.Column(db.String(500))
         location = db.Column(db.String(200))
-        attendees = db.Column(db.Text)  # JSON string
-        additional_notes = db.Column(db.Text)
+        attendees = db.deferred(db.Column(db.Text))  # JSON string
+        additional_notes = db.deferred(db.Column(db.Text))
         meeting_type = db.Column(db.String(50))
         priority = db.Column(db.String(20))
         created_at = db.Column(db.DateTime, default=datetime.utcnow)
+        updated_at = db.Column(db.DateTime, default=datetime.utcnow)  # last content change; Last-Modified of exports
         user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+        body = db.relationship('TemplateBody', uselist=False, lazy='select', cascade='all, delete-orphan')
+
+        @property
+        def content(self):
+            """Invitation HTML; the body row is only loaded when this is accessed"""
+            if self.body is not None:
+                return self.body.html
+            return self._content
+
+        @content.setter
+        def content(self, html):
+            encoding, data = encode_body(html)
+            digest = body_digest(html)
+            if self.body is None:
+                self.body = TemplateBody(encoding=encoding, data=data, size=len(html), digest=digest)
+            else:
+                self.body.encoding, self.body.data, self.body.size, self.body.digest = encoding, data, len(html), digest
+            self._content = ''
+            self.updated_at = datetime.utcnow()
+
+    class TemplateBody(db.Model):
+        template_id = db.Column(db.Integer, db.ForeignKey('template.id'), primary_key=True)
+        encoding = db.Column(db.String(10), nullable=False, default='identity')  # 'identity', 'zlib', 'zstd'
+        data = db.Column(db.LargeBinary, nullable=False)
+        size = db.Column(db.Integer)  # uncompressed length in characters
+        digest = db.Column(db.String(64))  # sha256 of the HTML; keys cached export artifacts
+
+        @property
+        def html(self):
+            return decode_body(self.encoding, self.data)
 
     class Distribution(db.Model):
         id = db.Column(db.Integer, primary_key=True)
         template_id = db.Column(db.Integer, db.ForeignKey('template.id'), nullable=False)
         method = db.Column(db.String(20), nullable=False)  # 'gmail', 'whatsapp', 'calendar'
-        recipients = db.Column(db.Text)  # JSON string
-        status = db.Column(db.String(20), default='pending')  # 'pending', 'sent', 'failed'
+        recipients = db.Column(db.Text)  # legacy JSON string, superseded by DistributionRecipient rows
+        recipient_count = db.Column(db.Integer, default=0)  # kept in sync with recipients on write
+        # active_history loads expired old values so the UserStats hooks see exact deltas
+        status = db.column_property(db.Column(db.String(20), default='pending'), active_history=True)  # 'pending', 'sent', 'failed'
         sent_at = db.Column(db.DateTime)
         created_at = db.Column(db.DateTime, default=datetime.utcnow)
         user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    class DistributionRecipient(db.Model):
+        # One row per address; queried by (distribution_id, status) for progress, resume and retries
+        __table_args__ = (
+            db.Index('ix_distribution_recipient_distribution_status', 'distribution_id', 'status'),
+        )
+        id = db.Column(db.Integer, primary_key=True)
+        distribution_id = db.Column(db.Integer, db.ForeignKey('distribution.id'), nullable=False)
+        channel = db.Column(db.String(20), nullable=False)  # 'email', 'phone'
+        address = db.Column(db.String(320), nullable=False)
+        name = db.Column(db.String(200))  # used for personalization
+        timezone = db.Column(db.String(64))  # IANA name, e.g. 'Europe/Paris'
+        status = db.Column(db.String(20), default='pending', nullable=False)  # 'pending', 'sent', 'failed'
+        error = db.Column(db.Text)
+        attempts = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # provider calls, including retries
+        sent_at = db.Column(db.DateTime)
+
+    class DistributionJob(db.Model):
+        id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+        distribution_id = db.Column(db.Integer, db.ForeignKey('distribution.id'), nullable=False)
+        kind = db.Column(db.String(20), nullable=False)  # 'gmail', 'whatsapp'
+        payload = db.Column(db.Text)  # JSON string
+        status = db.Column(db.String(20), default='queued')  # 'queued', 'running', 'completed', 'failed'
+        total = db.Column(db.Integer, default=0)
+        succeeded = db.column_property(db.Column(db.Integer, default=0), active_history=True)
+        failed = db.column_property(db.Column(db.Integer, default=0), active_history=True)
+        results = db.Column(db.Text)  # legacy JSON string; outcomes now live in DistributionRecipient
+        error = db.Column(db.Text)
+        created_at = db.Column(db.DateTime, default=datetime.utcnow)
+        started_at = db.Column(db.DateTime)
+        heartbeat_at = db.Column(db.DateTime)
+        claim_token = db.Column(db.String(36))  # set by each claim; progress writes are fenced on it
+        finished_at = db.Column(db.DateTime)
+        user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    class UserStats(db.Model):
+        # Rollup of dashboard counters, updated incrementally by utils.stats_service
+        user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+        templates_generated = db.Column(db.Integer, default=0, nullable=False)
+        invitations_sent = db.Column(db.Integer, default=0, nullable=False)
+        total_recipients = db.Column(db.Integer, default=0, nullable=False)
+        calendar_events = db.Column(db.Integer, default=0, nullable=False)
+        recipients_succeeded = db.Column(db.Integer, default=0, nullable=False)
+        recipients_failed = db.Column(db.Integer, default=0, nullable=False)
+        updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+        @property
+        def success_rate(self):
+            attempted = self.recipients_succeeded + self.recipients_failed
+            return round(100.0 * self.recipients_succeeded / attempted, 1) if attempted else 0.0
+    
+    class DeadLetter(db.Model):
+        # Sends that failed for good (permanent error or retries exhausted), kept for inspection and replay
+        id = db.Column(db.Integer, primary_key=True)
+        distribution_id = db.Column(db.Integer, db.ForeignKey('distribution.id'), nullable=False, index=True)
+        recipient_id = db.Column(db.Integer, db.ForeignKey('distribution_recipient.id'))
+        channel = db.Column(db.String(20), nullable=False)  # 'email', 'phone'
+        address = db.Column(db.String(320), nullable=False)
+        error = db.Column(db.Text)
+        attempts = db.Column(db.Integer, default=1, nullable=False)
+        permanent = db.Column(db.Boolean, default=True, nullable=False)  # False when retries ran out
+        created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    class ContactList(db.Model):
+        # An uploaded mailing list; distributions can target it instead of inline recipients
+        __table_args__ = (
+            db.Index('ix_contact_list_user_created', 'user_id', 'created_at'),
+        )
+        id = db.Column(db.Integer, primary_key=True)
+        name = db.Column(db.String(200), nullable=False)
+        contact_count = db.Column(db.Integer, default=0, nullable=False)
+        invalid_count = db.Column(db.Integer, default=0, nullable=False)  # rows rejected during import
+        duplicate_count = db.Column(db.Integer, default=0, nullable=False)  # rows that added no new email or phone
+        status = db.Column(db.String(20), default='importing', nullable=False)  # 'importing', 'ready'
+        created_at = db.Column(db.DateTime, default=datetime.utcnow)
+        user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    class Contact(db.Model):
+        # The unique indexes de-duplicate contacts within a list during import and serve list scans
+        __table_args__ = (
+            db.Index('ux_contact_list_email', 'list_id', 'email_key', unique=True),
+            db.Index('ux_contact_list_phone', 'list_id', 'phone', unique=True),
+        )
+        id = db.Column(db.Integer, primary_key=True)
+        list_id = db.Column(db.Integer, db.ForeignKey('contact_list.id'), nullable=False)
+        email = db.Column(db.String(320))  # normalized (domain lower-cased)
+        email_key = db.Column(db.String(320))  # case-folded email, for de-duplication
+        phone = db.Column(db.String(20))  # E.164
+        name = db.Column(db.String(200))
+        timezone = db.Column(db.String(64))
     
     # Return the model classes
-    return User, Template, Distribution 
\ No newline at end of file
+    return (User, Template, TemplateBody, Distribution, DistributionRecipient, DistributionJob, UserStats,
+            DeadLetter, ContactList, Contact) 
\ No newline at end of file
@@ -0,0 +1,176 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import current_app, has_app_context
+
+from utils.metrics import CallbackMetric, Histogram, register
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class CircuitOpenError(Exception):
+    """OpenAI calls are short-circuited after repeated failures"""
+
+
+class InvalidCompletion(ValueError):
+    """OpenAI answered, but with content we cannot use; does not count as a failure for the breaker"""
+
+
+class CircuitBreaker:
+    """Stops calling an endpoint after `failure_threshold` consecutive failures.
+
+    While open, one probe call is let through every `reset_timeout` seconds;
+    a success closes the breaker again and a failure keeps it open.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.trips = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            return 'half_open' if self.clock() - self._opened_at >= self.reset_timeout else 'open'
+
+    def allow(self):
+        """True if a call may go out now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = self.clock()
+            if now - self._opened_at >= self.reset_timeout:
+                # Re-arm the timer so concurrent callers do not all probe at once
+                self._opened_at = now
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    self.trips += 1
+                self._opened_at = self.clock()
+
+    def reset(self):
+        self.record_success()
+
+    def stats(self):
+        return {
+            'state': self.state,
+            'consecutive_failures': self.failures,
+            'trips': self.trips,
+            'failure_threshold': self.failure_threshold,
+            'reset_timeout': self.reset_timeout
+        }
+
+
+# Process-wide client, breaker and histogram, created on first use
+_clients = {}
+_circuit_breaker = None
+_latency = register(Histogram(
+    'smartmeeting_openai_request_duration_seconds', 'OpenAI API call latency by outcome',
+    ('operation', 'outcome'), LATENCY_BUCKETS
+))
+_lock = threading.Lock()
+
+
+def _config():
+    return current_app.config if has_app_context() else {}
+
+
+def get_openai_client(api_key):
+    """Shared OpenAI client for an API key, so its HTTP connection pool is reused across requests"""
+    config = _config()
+    base_url = config.get('OPENAI_BASE_URL')  # None uses the library default (or the OPENAI_BASE_URL variable)
+    key = (api_key, base_url)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                import openai  # deferred: the SDK takes most of a second to import
+                client = _clients[key] = openai.OpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    timeout=openai.Timeout(
+                        config.get('OPENAI_READ_TIMEOUT', 60.0),
+                        connect=config.get('OPENAI_CONNECT_TIMEOUT', 5.0)
+                    ),
+                    max_retries=config.get('OPENAI_MAX_RETRIES', 1)
+                )
+    return client
+
+
+def get_circuit_breaker():
+    """Breaker shared by every OpenAI call in the process"""
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        config = _config()
+        with _lock:
+            if _circuit_breaker is None:
+                _circuit_breaker = CircuitBreaker(
+                    failure_threshold=config.get('OPENAI_BREAKER_THRESHOLD', 5),
+                    reset_timeout=config.get('OPENAI_BREAKER_RESET_TIMEOUT', 30.0)
+                )
+    return _circuit_breaker
+
+
+def get_latency_histogram():
+    return _latency
+
+
+@contextmanager
+def openai_call(operation):
+    """Guard one OpenAI call: short-circuit when the breaker is open, record its outcome and latency.
+
+    Raises CircuitOpenError instead of running the block while the breaker is
+    open, so callers fall back to a local template straight away. Content checks
+    made inside the block should raise InvalidCompletion, which is recorded as
+    'invalid' without tripping the breaker.
+    """
+    breaker = get_circuit_breaker()
+    if not breaker.allow():
+        _latency.observe(operation, 'short_circuited', 0.0)
+        raise CircuitOpenError('OpenAI circuit breaker is open; using the fallback template')
+    start = time.perf_counter()
+    try:
+        yield
+    except InvalidCompletion:
+        breaker.record_success()
+        _latency.observe(operation, 'invalid', time.perf_counter() - start)
+        raise
+    except Exception:
+        breaker.record_failure()
+        _latency.observe(operation, 'error', time.perf_counter() - start)
+        raise
+    breaker.record_success()
+    _latency.observe(operation, 'success', time.perf_counter() - start)
+
+
+def openai_stats():
+    return {'circuit_breaker': get_circuit_breaker().stats(), 'latency': _latency.snapshot()}
+
+
+register(CallbackMetric(
+    'smartmeeting_openai_circuit_state', 'OpenAI circuit breaker state (1 for the current one)', 'gauge', ('state',),
+    lambda: {(state,): int(get_circuit_breaker().state == state) for state in ('closed', 'open', 'half_open')}
+))
+register(CallbackMetric(
+    'smartmeeting_openai_circuit_trips_total', 'Times the OpenAI circuit breaker has opened', 'counter', (),
+    lambda: {(): get_circuit_breaker().trips}
+))
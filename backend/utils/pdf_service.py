@@ -0,0 +1,155 @@
+import atexit
+import importlib.util
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import current_app, has_app_context
+
+from utils.metrics import CallbackMetric, register
+
+
+class PdfUnavailable(RuntimeError):
+    """WeasyPrint is not installed, so PDFs cannot be rendered"""
+
+
+class PdfQueueFull(RuntimeError):
+    """More PDFs are waiting to be rendered than the queue allows"""
+
+
+def pdf_available():
+    return importlib.util.find_spec('weasyprint') is not None
+
+
+def fetch_inline_only(url, *args, **kwargs):
+    """WeasyPrint url_fetcher that resolves data: URLs and refuses everything else.
+
+    Template HTML is user-editable, so following file: paths or network URLs
+    would let a template read server files or reach internal hosts. WeasyPrint
+    logs the refusal and renders without the resource.
+    """
+    if not url.lower().startswith('data:'):
+        raise ValueError(f'PDF resource not allowed: {url[:200]}')
+    import weasyprint
+    return weasyprint.default_url_fetcher(url, *args, **kwargs)
+
+
+def render_pdf(html):
+    """HTML document -> PDF bytes; runs in a render pool process"""
+    import weasyprint  # only the render processes pay for importing WeasyPrint
+    return weasyprint.HTML(string=html, base_url=None, url_fetcher=fetch_inline_only).write_pdf()
+
+
+class PdfRenderPool:
+    """Renders PDFs in worker processes so layout work never blocks a request thread.
+
+    At most `max_pending` renders are queued or running; further submits wait
+    up to `wait` seconds for a slot and then raise PdfQueueFull. Renders
+    submitted with the same key while one is in flight share its result.
+    """
+
+    def __init__(self, workers=2, max_pending=16, render=render_pdf):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.render_fn = render
+        self.submitted = 0
+        self.deduplicated = 0
+        self.rejected = 0
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            # spawn: forking a process that holds DB connections and SMTP sockets is unsafe
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def submit(self, html, key=None, wait=0):
+        """Queue a render and return its Future"""
+        with self._lock:
+            future = self._inflight.get(key) if key is not None else None
+            if future is not None:
+                self.deduplicated += 1
+                return future
+        if not self._slots.acquire(timeout=wait):
+            with self._lock:
+                self.rejected += 1
+            raise PdfQueueFull(f'{self.max_pending} PDF renders are already queued')
+        with self._lock:
+            future = self._inflight.get(key) if key is not None else None
+            if future is not None:
+                # Another thread queued the same document while we waited for a slot
+                self._slots.release()
+                self.deduplicated += 1
+                return future
+            try:
+                future = self._get_executor().submit(self.render_fn, html)
+            except BaseException:
+                self._slots.release()
+                raise
+            self.submitted += 1
+            if key is not None:
+                self._inflight[key] = future
+        future.add_done_callback(lambda done: self._finished(key, done))
+        return future
+
+    def _finished(self, key, future):
+        with self._lock:
+            if key is not None and self._inflight.get(key) is future:
+                del self._inflight[key]
+        self._slots.release()
+
+    def render(self, html, key=None, wait=0, timeout=None):
+        """Render and wait for the PDF bytes"""
+        return self.submit(html, key, wait).result(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'in_flight': len(self._inflight),
+                'submitted': self.submitted,
+                'deduplicated': self.deduplicated,
+                'rejected': self.rejected
+            }
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Process-wide render pool, created on first use
+_pdf_pool = None
+_lock = threading.Lock()
+
+
+def get_pdf_pool():
+    """Render pool shared by downloads and distributions (PDF_RENDER_WORKERS processes)"""
+    global _pdf_pool
+    if _pdf_pool is None:
+        config = current_app.config if has_app_context() else {}
+        with _lock:
+            if _pdf_pool is None:
+                _pdf_pool = PdfRenderPool(
+                    workers=config.get('PDF_RENDER_WORKERS', 2),
+                    max_pending=config.get('PDF_RENDER_QUEUE_SIZE', 16)
+                )
+                atexit.register(_pdf_pool.shutdown, wait=False)
+    return _pdf_pool
+
+
+def _pdf_renders():
+    if _pdf_pool is None:
+        return {}
+    stats = _pdf_pool.stats()
+    return {(result,): stats[result] for result in ('submitted', 'deduplicated', 'rejected')}
+
+
+register(CallbackMetric(
+    'smartmeeting_pdf_renders_total', 'PDF render requests by result', 'counter', ('result',), _pdf_renders
+))
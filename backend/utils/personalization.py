@@ -0,0 +1,135 @@
+import html
+import re
+from datetime import datetime
+from urllib.parse import quote
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Per-recipient placeholders understood in template HTML, e.g. {{recipient_name}}
+PLACEHOLDER_FIELDS = ('recipient_name', 'recipient_email', 'rsvp_link', 'local_time')
+PLACEHOLDER_PATTERN = re.compile(r'\{\{\s*(' + '|'.join(PLACEHOLDER_FIELDS) + r')\s*\}\}')
+
+# Added to templates without placeholders when personalization is requested
+PERSONALIZED_BLOCK = (
+    '<div style="font-family: Arial, sans-serif; padding: 16px 20px; margin: 0 auto 16px; max-width: 600px; '
+    'background: #f8f9ff; border-left: 4px solid #667eea; border-radius: 6px; color: #333;">'
+    '<p style="margin: 0 0 6px;">Hi {{recipient_name}},</p>'
+    '<p style="margin: 0;">Your local time: <strong>{{local_time}}</strong> &middot; '
+    '<a href="{{rsvp_link}}" style="color: #667eea;">RSVP</a></p>'
+    '</div>'
+)
+_BODY_OPEN = re.compile(r'<body[^>]*>', re.IGNORECASE)
+_NAME_SEPARATORS = re.compile(r'[._\-+]+')
+
+LOCAL_TIME_FORMAT = '%A, %B %d, %Y at %H:%M'
+
+
+def get_timezone(name):
+    """ZoneInfo for an IANA name, or None if it is unknown"""
+    try:
+        return ZoneInfo(name) if name else None
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+class PersonalizedTemplate:
+    """Template HTML parsed once into a format skeleton with placeholder slots"""
+
+    def __init__(self, content, inject=False):
+        if inject and not PLACEHOLDER_PATTERN.search(content):
+            content = _inject_block(content)
+
+        # Alternating literal HTML and field names; rendering only swaps the field slots
+        self._parts = PLACEHOLDER_PATTERN.split(content)
+        self._slots = tuple((index, self._parts[index]) for index in range(1, len(self._parts), 2))
+        self.fields = frozenset(field for _, field in self._slots)
+        self.content = content
+
+    @property
+    def personalized(self):
+        return bool(self.fields)
+
+    def render(self, values):
+        """Fill the slots with already-escaped values; untouched HTML if there are none"""
+        if not self.fields:
+            return self.content
+        parts = self._parts.copy()
+        for index, field in self._slots:
+            parts[index] = values[field]
+        return ''.join(parts)
+
+
+def _inject_block(content):
+    match = _BODY_OPEN.search(content)
+    if match:
+        return content[:match.end()] + PERSONALIZED_BLOCK + content[match.end():]
+    return PERSONALIZED_BLOCK + content
+
+
+def name_from_email(address):
+    """Best-effort display name from the local part of an address: jane.doe@ -> Jane Doe"""
+    local_part = address.split('@', 1)[0]
+    words = [word for word in _NAME_SEPARATORS.split(local_part) if word and not word.isdigit()]
+    return ' '.join(word.capitalize() for word in words) or address
+
+
+class MeetingContext:
+    """Meeting-wide values shared by every recipient, with per-timezone times memoized"""
+
+    def __init__(self, start=None, timezone='UTC', distribution_id=None, rsvp_url_template=None,
+                 organizer=None, topic=None, meeting_link=None):
+        self.timezone = get_timezone(timezone) or ZoneInfo('UTC')
+        self.start = start.replace(tzinfo=self.timezone) if start and start.tzinfo is None else start
+        self.distribution_id = distribution_id
+        self.rsvp_url_template = rsvp_url_template
+        self.organizer = organizer
+        self.topic = topic or 'Meeting'
+        self.meeting_link = meeting_link
+        self._local_times = {}
+
+    @classmethod
+    def for_template(cls, template, distribution_id=None, timezone='UTC', rsvp_url_template=None, organizer=None):
+        start = None
+        if template.meeting_date and template.meeting_time:
+            start = datetime.combine(template.meeting_date, template.meeting_time)
+        return cls(start, timezone, distribution_id, rsvp_url_template, organizer,
+                   template.meeting_topic, template.meeting_link)
+
+    def local_time(self, timezone_name):
+        if self.start is None:
+            return 'TBD'
+        formatted = self._local_times.get(timezone_name)
+        if formatted is None:
+            zone = get_timezone(timezone_name) or self.timezone
+            formatted = html.escape(f"{self.start.astimezone(zone).strftime(LOCAL_TIME_FORMAT)} ({zone.key})")
+            self._local_times[timezone_name] = formatted
+        return formatted
+
+    def rsvp_link(self, recipient_id, address):
+        if self.rsvp_url_template:
+            link = self.rsvp_url_template.format(
+                distribution_id=self.distribution_id, recipient_id=recipient_id, email=quote(address, safe='')
+            )
+        elif self.organizer:
+            link = f"mailto:{self.organizer}?subject={quote('RSVP: ' + self.topic)}"
+        else:
+            link = self.meeting_link or '#'
+        return html.escape(link, quote=True)
+
+    def values_for(self, recipient):
+        """Escaped placeholder values for a recipient row (id, address, name, timezone)"""
+        return {
+            'recipient_name': html.escape(recipient.name or name_from_email(recipient.address)),
+            'recipient_email': html.escape(recipient.address),
+            'rsvp_link': self.rsvp_link(recipient.id, recipient.address),
+            'local_time': self.local_time(recipient.timezone)
+        }
+
+
+def personalize(template, recipients, context):
+    """Lazily yield (recipient, html) for each recipient; nothing is buffered"""
+    if not template.personalized:
+        for recipient in recipients:
+            yield recipient, template.content
+        return
+    for recipient in recipients:
+        yield recipient, template.render(context.values_for(recipient))
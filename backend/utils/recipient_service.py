@@ -0,0 +1,163 @@
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, insert, literal, select, update
+
+from utils import models
+from utils.template_service import InvalidCursor
+
+# Rows per executemany batch when inserting or updating recipients
+RECIPIENT_BATCH_SIZE = 1000
+
+# Page sizes of the per-recipient details endpoint
+DETAILS_PAGE_SIZE = 100
+MAX_DETAILS_PAGE_SIZE = 1000
+
+
+def _batches(rows, size=RECIPIENT_BATCH_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def add_recipients(distribution_id, channel, recipients, status='pending', sent_at=None, error=None, attempts=0):
+    """Bulk insert one DistributionRecipient row per recipient in batched executemany calls"""
+    # Recipients are address strings or dicts with 'address' and optional 'name' and 'timezone'
+    table = models.DistributionRecipient.__table__
+    rows = []
+    for recipient in recipients:
+        if not isinstance(recipient, dict):
+            recipient = {'address': recipient}
+        rows.append({
+            'distribution_id': distribution_id,
+            'channel': channel,
+            'address': recipient['address'],
+            'name': recipient.get('name'),
+            'timezone': recipient.get('timezone'),
+            'status': status,
+            'error': error,
+            'attempts': attempts,
+            'sent_at': sent_at
+        })
+    for batch in _batches(rows):
+        models.db.session.execute(insert(table), batch)
+    return len(rows)
+
+
+def add_recipients_from_list(distribution_id, channel, list_id):
+    """Copy a contact list's emails ('email') or phones ('phone') into recipient rows with one INSERT ... SELECT"""
+    contact = models.Contact.__table__
+    table = models.DistributionRecipient.__table__
+    address = contact.c.email if channel == 'email' else contact.c.phone
+    source = select(
+        literal(distribution_id), literal(channel), address, contact.c.name, contact.c.timezone,
+        literal('pending'), literal(0)
+    ).where(contact.c.list_id == list_id, address.isnot(None)).order_by(contact.c.id)
+    result = models.db.session.execute(insert(table).from_select(
+        ['distribution_id', 'channel', 'address', 'name', 'timezone', 'status', 'attempts'], source
+    ))
+    return result.rowcount
+
+
+def iter_recipients(distribution_id, status=None, batch_size=RECIPIENT_BATCH_SIZE):
+    """Yield (id, address, name, timezone) rows in one state (any state if None), a batch at a time"""
+    # Keyed on id over the (distribution_id, status) index: the full list is never held in
+    # memory and rows updated while iterating are not revisited
+    table = models.DistributionRecipient.__table__
+    criteria = [table.c.distribution_id == distribution_id]
+    if status is not None:
+        criteria.append(table.c.status == status)
+    last_id = 0
+    while True:
+        rows = models.db.session.execute(
+            select(table.c.id, table.c.address, table.c.name, table.c.timezone)
+            .where(*criteria, table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1].id
+
+
+def record_outcomes(outcomes):
+    """Write per-recipient results ({'id', 'status', 'error', 'attempts', 'sent_at'}) in batched updates"""
+    if not outcomes:
+        return
+    table = models.DistributionRecipient.__table__
+    statement = update(table).where(table.c.id == bindparam('recipient_id')).values(
+        status=bindparam('new_status'),
+        error=bindparam('new_error'),
+        attempts=bindparam('new_attempts'),
+        sent_at=bindparam('new_sent_at')
+    )
+    rows = [{
+        'recipient_id': outcome['id'],
+        'new_status': outcome['status'],
+        'new_error': outcome.get('error'),
+        'new_attempts': outcome.get('attempts', 1),
+        'new_sent_at': outcome.get('sent_at')
+    } for outcome in outcomes]
+    connection = models.db.session.connection()
+    for batch in _batches(rows):
+        connection.execute(statement, batch)
+
+
+def add_dead_letters(distribution_id, channel, failures):
+    """Record final send failures ({'recipient_id', 'address', 'error', 'attempts', 'permanent'})"""
+    rows = [{
+        'distribution_id': distribution_id,
+        'recipient_id': failure.get('recipient_id'),
+        'channel': channel,
+        'address': failure['address'],
+        'error': failure.get('error'),
+        'attempts': failure.get('attempts', 1),
+        'permanent': failure.get('permanent', True),
+        'created_at': datetime.utcnow()
+    } for failure in failures]
+    for batch in _batches(rows):
+        models.db.session.execute(insert(models.DeadLetter.__table__), batch)
+    return len(rows)
+
+
+def count_recipients_by_status(distribution_id):
+    """{'pending': n, 'sent': n, 'failed': n} for a distribution, counted on the (distribution_id, status) index"""
+    table = models.DistributionRecipient.__table__
+    counts = dict.fromkeys(('pending', 'sent', 'failed'), 0)
+    counts.update(models.db.session.execute(
+        select(table.c.status, func.count())
+        .where(table.c.distribution_id == distribution_id)
+        .group_by(table.c.status)
+    ).all())
+    return counts
+
+
+def get_recipient_details(distribution_id, status=None, limit=DETAILS_PAGE_SIZE, cursor=None):
+    """One page of processed recipients (or those in `status`) in send order, plus the cursor for the next page"""
+    table = models.DistributionRecipient.__table__
+    query = select(table.c.id, table.c.address, table.c.status, table.c.error, table.c.attempts, table.c.sent_at)
+    if status is None:
+        query = query.where(table.c.distribution_id == distribution_id, table.c.status != 'pending')
+    else:
+        query = query.where(table.c.distribution_id == distribution_id, table.c.status == status)
+    # The cursor is the last recipient id of the previous page; seek past it instead of using OFFSET
+    if cursor:
+        try:
+            query = query.where(table.c.id > int(cursor))
+        except ValueError:
+            raise InvalidCursor('Invalid cursor')
+
+    limit = max(1, min(limit, MAX_DETAILS_PAGE_SIZE))
+    rows = models.db.session.execute(query.order_by(table.c.id).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = str(rows[-1].id)
+    return [{
+        'address': row.address,
+        'success': row.status == 'sent',
+        'status': row.status,
+        'error': row.error,
+        'attempts': row.attempts,
+        'sent_at': row.sent_at.isoformat() if row.sent_at else None
+    } for row in rows], next_cursor
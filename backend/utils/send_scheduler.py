@@ -0,0 +1,194 @@
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from flask import current_app, has_app_context
+
+from utils.metrics import Histogram, register
+
+SEND_LATENCY = register(Histogram(
+    'smartmeeting_send_duration_seconds', 'Time of one SMTP or WhatsApp send attempt by outcome',
+    ('channel', 'outcome'), (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+))
+
+
+class SendError(Exception):
+    """A provider rejected or failed a send"""
+
+
+class TransientSendError(SendError):
+    """Worth retrying: throttling, timeouts, dropped connections, 4xx SMTP replies"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PermanentSendError(SendError):
+    """Retrying cannot help: bad address, rejected content, bad credentials"""
+
+
+# Outcome of one scheduled send; detail is whatever the provider returned on success
+SendResult = namedtuple('SendResult', 'key success attempts error permanent detail')
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` sends per second with bursts of up to `burst`"""
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.burst = max(float(burst or rate), 1.0)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token, returning how long the caller must wait before using it"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            self._sleep(delay)
+
+
+class SendScheduler:
+    """Runs sends on a bounded thread pool under a shared rate limit, retrying transient errors.
+
+    `send(payload)` returns a detail value on success and raises TransientSendError or
+    PermanentSendError on failure; any other exception is treated as permanent. With a
+    channel name each attempt is timed in the send latency histogram.
+    """
+
+    def __init__(self, send, limiter=None, concurrency=4, max_attempts=4,
+                 backoff_base=1.0, backoff_max=60.0, sleep=time.sleep, rng=None, channel=None):
+        self.send = send
+        self.channel = channel
+        self.limiter = limiter
+        self.concurrency = max(int(concurrency), 1)
+        self.max_attempts = max(int(max_attempts), 1)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+
+    def backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, honouring a provider's Retry-After up to backoff_max"""
+        delay = self._rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+        return min(max(delay, retry_after or 0), self.backoff_max)
+
+    def deliver(self, key, payload):
+        """Send one payload, retrying transient failures; returns a SendResult"""
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.limiter is not None:
+                self.limiter.acquire()
+            start = time.perf_counter()
+            try:
+                detail = self.send(payload)
+            except TransientSendError as e:
+                self._observe('transient_error', start)
+                if attempt < self.max_attempts:
+                    self._sleep(self.backoff(attempt, e.retry_after))
+                    continue
+                return SendResult(key, False, attempt, str(e), False, None)
+            except Exception as e:
+                self._observe('permanent_error', start)
+                return SendResult(key, False, attempt, str(e), True, None)
+            self._observe('success', start)
+            return SendResult(key, True, attempt, None, False, detail)
+
+    def _observe(self, outcome, start):
+        if self.channel is not None:
+            SEND_LATENCY.observe(self.channel, outcome, time.perf_counter() - start)
+
+    def run(self, items, heartbeat=None, heartbeat_interval=30.0):
+        """Send (key, payload) items and yield a SendResult for each as it finishes.
+
+        At most `concurrency` sends run at once and only a few more items are read
+        ahead, so items can be a lazy stream. Results are yielded on the calling
+        thread, which may safely write them to the database. `heartbeat` is also
+        called on the calling thread, every `heartbeat_interval` seconds, even while
+        every send is backing off; if it raises, queued sends are cancelled.
+        """
+        next_beat = time.monotonic() + heartbeat_interval
+
+        def finished(in_flight):
+            nonlocal next_beat
+            while True:
+                timeout = None if heartbeat is None else max(next_beat - time.monotonic(), 0)
+                done, in_flight = wait(in_flight, timeout, FIRST_COMPLETED)
+                if heartbeat is not None and time.monotonic() >= next_beat:
+                    heartbeat()
+                    next_beat = time.monotonic() + heartbeat_interval
+                if done:
+                    return done, in_flight
+
+        executor = ThreadPoolExecutor(self.concurrency, thread_name_prefix='send')
+        try:
+            in_flight = set()
+            for key, payload in items:
+                if len(in_flight) >= self.concurrency * 2:
+                    done, in_flight = finished(in_flight)
+                    for future in done:
+                        yield future.result()
+                in_flight.add(executor.submit(self.deliver, key, payload))
+            while in_flight:
+                done, in_flight = finished(in_flight)
+                for future in done:
+                    yield future.result()
+        finally:
+            # Sends already running finish; nothing queued behind them starts
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Process-wide rate limiters, one per provider account, shared by every job and request
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(channel, account, rate, burst=None):
+    """Return the shared token bucket for a provider account (None when unlimited)"""
+    if not rate:
+        return None
+    key = (channel, account, rate, burst)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = TokenBucket(rate, burst)
+        return limiter
+
+
+def get_scheduler(channel, account, send, **overrides):
+    """Scheduler for a channel ('gmail', 'whatsapp') configured from the app config.
+
+    Sends for the same account share one rate limit; pass account=None for
+    demo mode, which is not rate limited.
+    """
+    settings = current_app.config if has_app_context() else {}
+    prefix = channel.upper()
+    limiter = None
+    if account is not None:
+        limiter = get_rate_limiter(
+            channel, account, settings.get(f'{prefix}_RATE_LIMIT'), settings.get(f'{prefix}_RATE_BURST')
+        )
+    options = {
+        'channel': channel,
+        'limiter': limiter,
+        'concurrency': settings.get(f'{prefix}_SEND_CONCURRENCY', 4),
+        'max_attempts': settings.get('SEND_MAX_ATTEMPTS', 4),
+        'backoff_base': settings.get('SEND_BACKOFF_BASE', 1.0),
+        'backoff_max': settings.get('SEND_BACKOFF_MAX', 60.0)
+    }
+    options.update(overrides)
+    return SendScheduler(send, **options)
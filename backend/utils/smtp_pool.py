@@ -0,0 +1,202 @@
+import atexit
+import smtplib
+import ssl
+import threading
+import time
+from collections import deque
+
+# Errors after which a session can no longer be trusted and must be reopened
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError)
+
+
+class PooledConnection:
+    """An authenticated SMTP session owned by a pool"""
+
+    def __init__(self, smtp):
+        self.smtp = smtp
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.messages_sent = 0
+
+    def close(self):
+        try:
+            self.smtp.quit()
+        except Exception:
+            try:
+                self.smtp.close()
+            except Exception:
+                pass
+
+
+class SMTPConnectionPool:
+    """Keeps authenticated SMTP sessions open and reuses them across sends"""
+
+    def __init__(self, host, port, username=None, password=None, use_tls=True,
+                 size=4, idle_timeout=60, max_messages=100, timeout=30, retries=1):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self.retries = retries
+        self.closed = False
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = deque()
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Open, secure and authenticate a new session"""
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo()
+            if self.use_tls:
+                smtp.starttls(context=ssl.create_default_context())
+                smtp.ehlo()
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        return PooledConnection(smtp)
+
+    def _is_reusable(self, conn):
+        if time.monotonic() - conn.last_used > self.idle_timeout:
+            return False
+        return not self.max_messages or conn.messages_sent < self.max_messages
+
+    def _checkout(self):
+        """Take the most recently used idle session, or open a new one"""
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._connect()
+            if self._is_reusable(conn):
+                return conn
+            conn.close()
+
+    def _checkin(self, conn):
+        conn.last_used = time.monotonic()
+        if self.closed or not self._is_reusable(conn):
+            conn.close()
+            return
+        with self._lock:
+            self._idle.append(conn)
+
+    def _send_on(self, conn, from_addr, to_addrs, message):
+        refused = conn.smtp.sendmail(from_addr, to_addrs, message)
+        conn.messages_sent += 1
+        return refused
+
+    def sendmail(self, from_addr, to_addrs, message):
+        """Send one message over a pooled session, reconnecting on failure"""
+        if self.closed:
+            raise RuntimeError('SMTP connection pool is closed')
+        with self._slots:
+            attempt = 0
+            while True:
+                # A dropped session usually means the other idle ones are stale too; retry on a new one
+                conn = self._checkout() if attempt == 0 else self._connect()
+                try:
+                    refused = self._send_on(conn, from_addr, to_addrs, message)
+                except RECONNECT_ERRORS:
+                    conn.close()
+                    if attempt >= self.retries:
+                        raise
+                    attempt += 1
+                    continue
+                except smtplib.SMTPException:
+                    # Per-message rejection; the session itself is still good
+                    self._checkin(conn)
+                    raise
+                self._checkin(conn)
+                return refused
+
+    def send_batch(self, messages):
+        """Send (from_addr, to_addrs, message) tuples back-to-back on one session.
+
+        Returns one result dict per message, in order. A failed login fails
+        the rest of the batch instead of being retried for every message.
+        """
+        if self.closed:
+            raise RuntimeError('SMTP connection pool is closed')
+        results = []
+        with self._slots:
+            conn = None
+            auth_error = None
+            try:
+                for from_addr, to_addrs, message in messages:
+                    if auth_error is not None:
+                        results.append({'success': False, 'refused': {}, 'error': auth_error})
+                        continue
+                    attempt = 0
+                    while True:
+                        try:
+                            if conn is None or not self._is_reusable(conn):
+                                if conn is not None:
+                                    conn.close()
+                                conn = self._checkout() if attempt == 0 else self._connect()
+                            refused = self._send_on(conn, from_addr, to_addrs, message)
+                            conn.last_used = time.monotonic()
+                            results.append({'success': True, 'refused': refused, 'error': None})
+                        except RECONNECT_ERRORS as e:
+                            if conn is not None:
+                                conn.close()
+                            conn = None
+                            if attempt < self.retries:
+                                attempt += 1
+                                continue
+                            results.append({'success': False, 'refused': {}, 'error': e})
+                        except smtplib.SMTPAuthenticationError as e:
+                            auth_error = e
+                            results.append({'success': False, 'refused': {}, 'error': e})
+                        except (smtplib.SMTPException, OSError) as e:
+                            results.append({'success': False, 'refused': {}, 'error': e})
+                        break
+            finally:
+                if conn is not None:
+                    self._checkin(conn)
+        return results
+
+    def stats(self):
+        with self._lock:
+            idle = len(self._idle)
+        return {'host': self.host, 'port': self.port, 'size': self.size, 'idle': idle}
+
+    def close(self):
+        """Close every idle session; sessions in use are closed on check-in"""
+        self.closed = True
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn in idle:
+            conn.close()
+
+
+# Process-wide pools, one per SMTP account, shared across requests
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(host, port, username=None, password=None, **options):
+    """Return the shared pool for an SMTP account, creating it on first use"""
+    key = (host, port, username, password)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.closed:
+            pool = _pools[key] = SMTPConnectionPool(host, port, username, password, **options)
+        return pool
+
+
+def close_all_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_all_pools)
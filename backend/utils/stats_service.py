@@ -0,0 +1,213 @@
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import case, delete, event, func, insert, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from utils import models
+
+# Dialects whose INSERT supports ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {'sqlite': sqlite_insert, 'postgresql': postgresql_insert}
+
+RECENT_ACTIVITY_LIMIT = 5
+
+STAT_COLUMNS = (
+    'templates_generated', 'invitations_sent', 'total_recipients',
+    'calendar_events', 'recipients_succeeded', 'recipients_failed'
+)
+
+
+def get_dashboard_stats(user_id):
+    """Dashboard counters for a user, read from the UserStats rollup by primary key"""
+    row = models.db.session.get(models.UserStats, user_id)
+    stats = {column: getattr(row, column) if row else 0 for column in STAT_COLUMNS}
+    stats['success_rate'] = row.success_rate if row else 0.0
+    return stats
+
+
+def get_recent_activity(user_id, limit=RECENT_ACTIVITY_LIMIT):
+    """Most recent distributions with their template titles, fetched with a join"""
+    db = models.db
+    Template = models.Template
+    Distribution = models.Distribution
+
+    rows = db.session.query(
+        Distribution.id,
+        Distribution.method,
+        Distribution.status,
+        Distribution.created_at,
+        Template.title
+    ).outerjoin(Template, Template.id == Distribution.template_id) \
+        .filter(Distribution.user_id == user_id) \
+        .order_by(Distribution.created_at.desc()) \
+        .limit(limit).all()
+
+    return [{
+        'id': row.id,
+        'type': 'invitation_sent',
+        'title': row.title or 'Unknown Template',
+        'description': f'Sent via {row.method}',
+        'timestamp': row.created_at,
+        'status': row.status
+    } for row in rows]
+
+
+# Incremental maintenance -------------------------------------------------
+
+def _history_change(obj, attribute):
+    """(old, new) values of an attribute modified in this flush, or None"""
+    history = inspect(obj).attrs[attribute].history
+    if not history.has_changes():
+        return None
+    old = history.deleted[0] if history.deleted else None
+    new = history.added[0] if history.added else None
+    return old, new
+
+
+def _add_distribution(deltas, distribution, sign):
+    changes = deltas[distribution.user_id]
+    changes['total_recipients'] += sign * (distribution.recipient_count or 0)
+    if distribution.method == 'calendar':
+        changes['calendar_events'] += sign
+    if distribution.status == 'sent':
+        changes['invitations_sent'] += sign
+    # Distributions written directly in a final state (no background job) carry their outcomes
+    if distribution.status == 'sent':
+        changes['recipients_succeeded'] += sign * (distribution.recipient_count or 0)
+    elif distribution.status == 'failed':
+        changes['recipients_failed'] += sign * (distribution.recipient_count or 0)
+
+
+def _collect_deltas(session, flush_context, instances):
+    deltas = session.info.setdefault('user_stats_deltas', defaultdict(lambda: defaultdict(int)))
+
+    for obj in session.new:
+        if isinstance(obj, models.Template):
+            deltas[obj.user_id]['templates_generated'] += 1
+        elif isinstance(obj, models.Distribution):
+            _add_distribution(deltas, obj, 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, models.Template):
+            deltas[obj.user_id]['templates_generated'] -= 1
+        elif isinstance(obj, models.Distribution):
+            _add_distribution(deltas, obj, -1)
+
+    for obj in session.dirty:
+        if isinstance(obj, models.Distribution):
+            change = _history_change(obj, 'status')
+            if change:
+                old, new = change
+                deltas[obj.user_id]['invitations_sent'] += (new == 'sent') - (old == 'sent')
+        elif isinstance(obj, models.DistributionJob):
+            # Background jobs report per-recipient outcomes as they checkpoint
+            for attribute, column in (('succeeded', 'recipients_succeeded'), ('failed', 'recipients_failed')):
+                change = _history_change(obj, attribute)
+                if change:
+                    old, new = change
+                    deltas[obj.user_id][column] += (new or 0) - (old or 0)
+
+
+def _apply_deltas(session, flush_context):
+    deltas = session.info.pop('user_stats_deltas', None)
+    if not deltas:
+        return
+
+    table = models.UserStats.__table__
+    connection = session.connection()
+    upsert = UPSERT_INSERTS.get(connection.dialect.name)
+    now = datetime.utcnow()
+    for user_id, changes in deltas.items():
+        changes = {column: delta for column, delta in changes.items() if delta}
+        if not changes:
+            continue
+        if upsert is not None:
+            # One statement, so concurrent first flushes for a user cannot race on the primary key
+            statement = upsert(table).values(
+                user_id=user_id, updated_at=now, **{c: changes.get(c, 0) for c in STAT_COLUMNS}
+            )
+            connection.execute(statement.on_conflict_do_update(
+                index_elements=[table.c.user_id],
+                set_={'updated_at': now, **{c: table.c[c] + statement.excluded[c] for c in changes}}
+            ))
+            continue
+        exists = connection.execute(select(table.c.user_id).where(table.c.user_id == user_id)).first()
+        if not exists:
+            connection.execute(insert(table).values(user_id=user_id, updated_at=now, **{c: 0 for c in STAT_COLUMNS}))
+        connection.execute(
+            update(table).where(table.c.user_id == user_id).values(
+                updated_at=now, **{column: table.c[column] + delta for column, delta in changes.items()}
+            )
+        )
+
+
+def _discard_deltas(session, previous_transaction):
+    # A flush that failed after before_flush must not leave its deltas for the next one
+    session.info.pop('user_stats_deltas', None)
+
+
+def init_stats_tracking(db):
+    """Keep UserStats in step with Template, Distribution and job writes"""
+    event.listen(db.session, 'before_flush', _collect_deltas)
+    event.listen(db.session, 'after_flush', _apply_deltas)
+    event.listen(db.session, 'after_soft_rollback', _discard_deltas)
+
+
+# Full rebuild -------------------------------------------------------------
+
+def _aggregate_user_stats(connection, user_id=None):
+    """Recompute every counter from the raw tables, grouped by user"""
+    template = models.Template.__table__
+    distribution = models.Distribution.__table__
+    recipient = models.DistributionRecipient.__table__
+    stats = defaultdict(lambda: dict.fromkeys(STAT_COLUMNS, 0))
+
+    query = select(template.c.user_id, func.count()).group_by(template.c.user_id)
+    if user_id is not None:
+        query = query.where(template.c.user_id == user_id)
+    for uid, count in connection.execute(query):
+        stats[uid]['templates_generated'] = count
+
+    query = select(
+        distribution.c.user_id,
+        func.count(case((distribution.c.status == 'sent', 1))),
+        func.coalesce(func.sum(distribution.c.recipient_count), 0),
+        func.count(case((distribution.c.method == 'calendar', 1)))
+    ).group_by(distribution.c.user_id)
+    if user_id is not None:
+        query = query.where(distribution.c.user_id == user_id)
+    for uid, sent, total, calendar in connection.execute(query):
+        stats[uid].update(invitations_sent=sent, total_recipients=total, calendar_events=calendar)
+
+    # Per-recipient outcomes come from DistributionRecipient rows
+    query = select(
+        distribution.c.user_id,
+        func.count(case((recipient.c.status == 'sent', 1))),
+        func.count(case((recipient.c.status == 'failed', 1)))
+    ).select_from(
+        recipient.join(distribution, distribution.c.id == recipient.c.distribution_id)
+    ).where(recipient.c.status.in_(('sent', 'failed'))).group_by(distribution.c.user_id)
+    if user_id is not None:
+        query = query.where(distribution.c.user_id == user_id)
+    for uid, succeeded, failed in connection.execute(query):
+        stats[uid].update(recipients_succeeded=succeeded, recipients_failed=failed)
+    return stats
+
+
+def rebuild_user_stats(connection, user_id=None):
+    """Replace UserStats rows with freshly computed values (all users by default)"""
+    table = models.UserStats.__table__
+    stats = _aggregate_user_stats(connection, user_id)
+
+    query = delete(table)
+    if user_id is not None:
+        query = query.where(table.c.user_id == user_id)
+    connection.execute(query)
+
+    now = datetime.utcnow()
+    if stats:
+        connection.execute(insert(table), [
+            {'user_id': uid, 'updated_at': now, **counters} for uid, counters in stats.items()
+        ])
+    return len(stats)
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Meeting fields that feed the generation prompt; anything else does not change the output
+CACHE_KEY_FIELDS = (
+    'meetingTopic', 'speakerName', 'date', 'time', 'duration', 'location',
+    'meetingLink', 'meetingType', 'priority', 'agenda', 'attendees', 'additionalNotes', 'personalize'
+)
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_cache_key(meeting_data, model, temperature):
+    """Content hash of the normalized meeting fields plus model settings"""
+    fields = {}
+    for field in CACHE_KEY_FIELDS:
+        value = _normalize(meeting_data.get(field))
+        if value not in (None, '', []):
+            fields[field] = value
+    material = json.dumps(
+        {'fields': fields, 'model': model, 'temperature': temperature},
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False
+    )
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class TemplateCache:
+    """Two-tier cache for generated templates: an in-process LRU in front of SQLite"""
+
+    def __init__(self, path, memory_size=256, disk_size=10000, ttl=7 * 24 * 3600):
+        self.path = path
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS template_cache ('
+            ' key TEXT PRIMARY KEY, content TEXT NOT NULL,'
+            ' created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS ix_template_cache_accessed ON template_cache (accessed_at)')
+
+    def _expired(self, created_at, now):
+        return self.ttl and now - created_at > self.ttl
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                content, created_at = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self._counters['memory_hits'] += 1
+                    return content
+                del self._memory[key]
+
+            row = self._conn.execute(
+                'SELECT content, created_at FROM template_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is not None and not self._expired(row[1], now):
+                self._conn.execute('UPDATE template_cache SET accessed_at = ? WHERE key = ?', (now, key))
+                self._remember(key, row[0], row[1])
+                self._counters['disk_hits'] += 1
+                return row[0]
+            if row is not None:
+                self._conn.execute('DELETE FROM template_cache WHERE key = ?', (key,))
+                self._counters['evictions'] += 1
+
+            self._counters['misses'] += 1
+            return None
+
+    def set(self, key, content):
+        now = time.time()
+        with self._lock:
+            self._remember(key, content, now)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO template_cache (key, content, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, content, now, now)
+            )
+            self._counters['stores'] += 1
+            self._evict_disk(now)
+
+    def _remember(self, key, content, created_at):
+        self._memory[key] = (content, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+            self._counters['evictions'] += 1
+
+    def _evict_disk(self, now):
+        evicted = 0
+        if self.ttl:
+            evicted += self._conn.execute(
+                'DELETE FROM template_cache WHERE created_at < ?', (now - self.ttl,)
+            ).rowcount
+        overflow = self._conn.execute('SELECT COUNT(*) FROM template_cache').fetchone()[0] - self.disk_size
+        if overflow > 0:
+            evicted += self._conn.execute(
+                'DELETE FROM template_cache WHERE key IN '
+                '(SELECT key FROM template_cache ORDER BY accessed_at LIMIT ?)', (overflow,)
+            ).rowcount
+        self._counters['evictions'] += evicted
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['memory_entries'] = len(self._memory)
+            stats['disk_entries'] = self._conn.execute('SELECT COUNT(*) FROM template_cache').fetchone()[0]
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
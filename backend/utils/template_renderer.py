@@ -0,0 +1,157 @@
+import os
+import threading
+from functools import lru_cache
+
+from jinja2 import Environment, FileSystemLoader
+
+# Invitation templates live alongside the page templates
+INVITATION_TEMPLATE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'frontend', 'templates', 'invitations'
+)
+INVITATION_STYLES = ('styled', 'basic')
+
+DEFAULT_THEME = {
+    'header_gradient': 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
+    'accent': '#667eea',
+    'cta_shadow': 'rgba(102, 126, 234, 0.3)',
+    'priority_color': '#45b7d1',
+    'priority_bg': '#f0f8ff',
+}
+
+# Theme overrides keyed by lower-cased priority and meetingType
+PRIORITY_THEMES = {
+    'high': {'priority_color': '#ff6b6b', 'priority_bg': '#fff5f5'},
+    'medium': {'priority_color': '#4ecdc4', 'priority_bg': '#f0fffd'},
+}
+MEETING_TYPE_THEMES = {}
+
+# Fields filled in per render; the optional ones switch whole sections on and off
+FIELDS = (
+    'topic', 'meeting_type', 'priority', 'date', 'time', 'duration', 'speaker',
+    'location', 'link', 'agenda', 'attendees', 'notes'
+)
+OPTIONAL_FIELDS = ('location', 'link', 'agenda', 'attendees', 'notes')
+
+# Compiled layouts kept per (style, theme, sections shown); bounded by the registered themes
+LAYOUT_CACHE_SIZE = 256
+
+_MARKER = '\x00'
+
+_environment = None
+_templates = {}
+_lock = threading.Lock()
+
+
+def _load_templates():
+    """Compile every invitation template once per process"""
+    global _environment
+    with _lock:
+        if not _templates:
+            _environment = Environment(
+                loader=FileSystemLoader(INVITATION_TEMPLATE_DIR),
+                autoescape=True,
+                auto_reload=False,
+                trim_blocks=True
+            )
+            for style in INVITATION_STYLES:
+                _templates[style] = _environment.get_template(f'{style}.html')
+    return _templates
+
+
+def register_theme(priority=None, meeting_type=None, **colors):
+    """Add or extend the theme used for a priority and/or meeting type"""
+    if priority:
+        PRIORITY_THEMES.setdefault(priority.lower(), {}).update(colors)
+    if meeting_type:
+        MEETING_TYPE_THEMES.setdefault(meeting_type.lower(), {}).update(colors)
+    _merge_theme.cache_clear()
+    _compile_layout.cache_clear()
+
+
+def _theme_key(meeting_type, priority):
+    # Values without a registered theme share the default, so user input never grows the caches;
+    # JSON may send numbers or lists here, which simply match no theme
+    meeting_type = str(meeting_type or '').lower()
+    priority = str(priority or '').lower()
+    return (meeting_type if meeting_type in MEETING_TYPE_THEMES else '',
+            priority if priority in PRIORITY_THEMES else '')
+
+
+@lru_cache(maxsize=None)
+def _merge_theme(meeting_type, priority):
+    theme = dict(DEFAULT_THEME)
+    theme.update(MEETING_TYPE_THEMES.get(meeting_type, {}))
+    theme.update(PRIORITY_THEMES.get(priority, {}))
+    return theme
+
+
+def resolve_theme(meeting_type=None, priority=None):
+    """Merge default, meeting type and priority colours; memoized per registered combination"""
+    return _merge_theme(*_theme_key(meeting_type, priority))
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _compile_layout(style, theme_key, shown):
+    """Render the Jinja2 template once with a marker in every field and split it into static fragments.
+
+    Everything but the field values (markup, theme colours, which optional
+    sections appear) is fixed for a (style, theme, sections shown) combination,
+    so later renders only join the fragments with the escaped values.
+    Returns (leading text, ((field, text after it), ...)).
+    """
+    template = (_templates or _load_templates())[style]
+    context = {field: f'{_MARKER}{field}{_MARKER}' for field in FIELDS}
+    context['attendees'] = [context['attendees']]
+    for field, visible in zip(OPTIONAL_FIELDS, shown):
+        if not visible:
+            context[field] = None
+    parts = template.render(context, **_merge_theme(*theme_key)).split(_MARKER)
+    # parts alternate static text and field names: text, field, text, field, ..., text
+    return parts[0], tuple(zip(parts[1::2], parts[2::2]))
+
+
+def _escape(value):
+    # Same entities as Jinja2's autoescape (markupsafe), without building Markup objects;
+    # most field values contain none of the special characters and are returned as they are
+    value = str(value)
+    if '&' in value or '<' in value or '>' in value or "'" in value or '"' in value:
+        return (value.replace('&', '&amp;').replace('>', '&gt;').replace('<', '&lt;')
+                .replace("'", '&#39;').replace('"', '&#34;'))
+    return value
+
+
+def _meeting_context(meeting_data):
+    return {
+        'topic': meeting_data.get('meetingTopic', 'Meeting'),
+        'meeting_type': meeting_data.get('meetingType', 'Meeting'),
+        'priority': meeting_data.get('priority', 'Medium'),
+        'date': meeting_data.get('date', 'TBD'),
+        'time': meeting_data.get('time', 'TBD'),
+        'duration': meeting_data.get('duration', 'TBD'),
+        'speaker': meeting_data.get('speakerName', 'TBD'),
+        'location': meeting_data.get('location'),
+        'link': meeting_data.get('meetingLink'),
+        'agenda': meeting_data.get('agenda'),
+        'attendees': meeting_data.get('attendees') or [],
+        'notes': meeting_data.get('additionalNotes'),
+    }
+
+
+def render_invitation(meeting_data, style='styled'):
+    """Render one invitation with user fields HTML-escaped (same output as rendering the Jinja2 template)"""
+    context = _meeting_context(meeting_data)
+    head, slots = _compile_layout(
+        style,
+        _theme_key(meeting_data.get('meetingType'), meeting_data.get('priority')),
+        tuple(bool(context[field]) for field in OPTIONAL_FIELDS)
+    )
+    context['attendees'] = ', '.join(_escape(attendee) for attendee in context['attendees'])
+    pieces = [head]
+    for field, text in slots:
+        pieces += (context[field] if field == 'attendees' else _escape(context[field]), text)
+    return ''.join(pieces)
+
+
+def render_invitations(meetings, style='styled'):
+    """Render a batch of invitations"""
+    return [render_invitation(meeting_data, style) for meeting_data in meetings]
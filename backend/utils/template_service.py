@@ -0,0 +1,95 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_, select
+
+from utils import models
+from utils.template_storage import decode_body
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Columns returned by the listing; content is only added on request
+LIST_COLUMNS = (
+    'id', 'title', 'meeting_topic', 'speaker_name', 'meeting_date', 'meeting_time',
+    'meeting_type', 'priority', 'created_at'
+)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at, template_id):
+    """Opaque cursor for the (created_at, id) position of the last item on a page"""
+    raw = json.dumps([created_at.isoformat(), template_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, template_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(template_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+
+
+def _escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def list_templates(user_id, limit=DEFAULT_PAGE_SIZE, cursor=None, search=None, include_content=False):
+    """One page of a user's templates, newest first, plus the cursor for the next page"""
+    table = models.Template.__table__
+    columns = [table.c[name] for name in LIST_COLUMNS]
+    source = table
+    if include_content:
+        body = models.TemplateBody.__table__
+        columns += [table.c.content, body.c.encoding, body.c.data]
+        source = table.outerjoin(body, body.c.template_id == table.c.id)
+
+    # Seek past the cursor on the (user_id, created_at, id) index instead of using OFFSET
+    query = select(*columns).select_from(source).where(table.c.user_id == user_id)
+    if cursor:
+        created_at, template_id = decode_cursor(cursor)
+        query = query.where(or_(
+            table.c.created_at < created_at,
+            and_(table.c.created_at == created_at, table.c.id < template_id)
+        ))
+    if search:
+        pattern = f'%{_escape_like(search.strip())}%'
+        query = query.where(or_(
+            table.c.meeting_topic.ilike(pattern, escape='\\'),
+            table.c.speaker_name.ilike(pattern, escape='\\'),
+            table.c.title.ilike(pattern, escape='\\')
+        ))
+
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    rows = models.db.session.execute(
+        query.order_by(table.c.created_at.desc(), table.c.id.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return [serialize_template_row(row) for row in rows], next_cursor
+
+
+def serialize_template_row(row):
+    item = {
+        'id': row.id,
+        'title': row.title,
+        'meeting_topic': row.meeting_topic,
+        'speaker_name': row.speaker_name,
+        'meeting_date': row.meeting_date.isoformat() if row.meeting_date else None,
+        'meeting_time': row.meeting_time.strftime('%H:%M') if row.meeting_time else None,
+        'meeting_type': row.meeting_type,
+        'priority': row.priority,
+        'created_at': row.created_at.isoformat() if row.created_at else None
+    }
+    if 'content' in row._fields:
+        item['content'] = decode_body(row.encoding, row.data) if row.data is not None else row.content
+    return item
@@ -0,0 +1,53 @@
+import hashlib
+import zlib
+
+from flask import current_app, has_app_context
+
+try:
+    import zstandard
+except ImportError:  # optional; zlib is used when it is not installed
+    zstandard = None
+
+# Bodies shorter than this (in bytes) are not worth compressing
+MIN_COMPRESS_SIZE = 256
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 10
+
+
+def get_body_codec():
+    """Compression for new template bodies: 'zlib' (default), 'zstd' or 'none'"""
+    codec = 'zlib'
+    if has_app_context():
+        codec = current_app.config.get('TEMPLATE_BODY_COMPRESSION', codec)
+    if codec == 'zstd' and zstandard is None:
+        return 'zlib'
+    return codec
+
+
+def encode_body(html, codec=None):
+    """Return (encoding, data) for storing an HTML body"""
+    codec = codec or get_body_codec()
+    raw = html.encode('utf-8')
+    if codec == 'none' or len(raw) < MIN_COMPRESS_SIZE:
+        return 'identity', raw
+    if codec == 'zstd':
+        return 'zstd', zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return 'zlib', zlib.compress(raw, ZLIB_LEVEL)
+
+
+def body_digest(html):
+    """Hex sha256 of an HTML body, stored next to it so exports can be keyed without decoding it"""
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+
+def decode_body(encoding, data):
+    """Inverse of encode_body"""
+    if encoding == 'zlib':
+        raw = zlib.decompress(data)
+    elif encoding == 'zstd':
+        if zstandard is None:
+            raise RuntimeError('zstandard is required to read zstd-compressed template bodies')
+        raw = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        raw = data
+    return raw.decode('utf-8')
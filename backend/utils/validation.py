@@ -1,13 +1,186 @@
 import re
+import threading
+import time
+from collections import namedtuple
+
+try:
+    import dns.resolver
+except ImportError:  # optional; MX checks are skipped when dnspython is not installed
+    dns = None
+
+# Compiled once; bulk validation scans a whole newline-joined list in one pass
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_EMAIL_LINES = re.compile(r'^[^\S\n]*(?:([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})[^\S\n]*$|.*$)', re.M)
+_PHONE_SEPARATORS = re.compile(r'[^\S\n]+|[().\-/]')
+_NON_DIGITS = re.compile(r'\D')
+
+# Outcome of a bulk validation: normalized valid entries in input order, then the rejected raw inputs
+ValidationResult = namedtuple('ValidationResult', 'valid invalid duplicates')
 
 def validate_email(email):
     """Validate email format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return EMAIL_PATTERN.match(email) is not None
 
 def validate_phone(phone):
     """Validate phone number format"""
     # Remove all non-digit characters
-    digits_only = re.sub(r'\D', '', phone)
+    digits_only = _NON_DIGITS.sub('', phone)
     # Check if it's a valid phone number (7-15 digits)
-    return 7 <= len(digits_only) <= 15 
\ No newline at end of file
+    return 7 <= len(digits_only) <= 15
+
+def _scan_lines(values, scan, single):
+    """Apply a whole-text regex scan to every value at once, or one value at a time if any spans lines"""
+    text = '\n'.join(values)
+    if text.count('\n') == len(values) - 1:
+        results = scan(text)
+        if len(results) == len(values):
+            return results
+    return [single(value) for value in values]
+
+def _match_email(address):
+    match = EMAIL_PATTERN.match(address.strip())
+    return match.group() if match else ''
+
+def _split_phones(text):
+    return _PHONE_SEPARATORS.sub('', text).split('\n')
+
+def _e164(number, default_country_code):
+    """+<digits> for a phone number with separators removed; None if it is not a valid number"""
+    digits = number[1:] if number[:1] == '+' else number
+    if not (digits.isdigit() and digits.isascii()):
+        return None
+    if number[:1] == '+':
+        pass
+    elif digits.startswith('00'):
+        digits = digits[2:]
+    elif default_country_code:
+        digits = default_country_code + digits.lstrip('0')
+    if 7 <= len(digits) <= 15 and digits[0] != '0':
+        return '+' + digits
+    return None
+
+def normalize_email(address):
+    """Strip whitespace and lower-case the domain; None if the address is malformed"""
+    address = _match_email(address)
+    if not address:
+        return None
+    local, _, domain = address.rpartition('@')
+    return f'{local}@{domain.lower()}'
+
+def normalize_phone(phone, default_country_code=None):
+    """Canonicalize a phone number to E.164 (+<country><number>); None if it is not one.
+
+    Numbers without a leading + or 00 are taken as national numbers of
+    default_country_code (trunk 0 dropped) when one is given, else as already
+    including their country code.
+    """
+    return _e164(_PHONE_SEPARATORS.sub('', phone.strip()), default_country_code)
+
+def validate_emails(addresses, mx_check=None):
+    """Normalize, validate and de-duplicate email addresses in one pass.
+
+    Duplicates are compared case-insensitively. mx_check(domain) -> bool, e.g.
+    an MXCache, rejects addresses whose domain cannot receive mail.
+    """
+    return validate_recipients(addresses, mx_check=mx_check, key=None)
+
+def validate_recipients(recipients, mx_check=None, key='address'):
+    """validate_emails for recipient dicts; valid dicts are copies with the normalized address.
+
+    With key=None the recipients are plain address strings.
+    """
+    raws = recipients if key is None else [recipient[key] for recipient in recipients]
+    matches = _scan_lines(raws, _EMAIL_LINES.findall, _match_email)
+
+    valid, invalid, duplicates = [], [], []
+    seen = set()
+    remember = seen.add
+    domain_ok = {}  # mx_check verdicts for this batch; called once per domain
+    for recipient, raw, address in zip(recipients, raws, matches):
+        if not address:
+            invalid.append(raw)
+            continue
+        folded = address.lower()
+        if folded in seen:
+            duplicates.append(raw)
+            continue
+        if mx_check is not None or folded != address:
+            at = address.rindex('@')
+            domain = folded[at + 1:]
+            if mx_check is not None:
+                ok = domain_ok.get(domain)
+                if ok is None:
+                    ok = domain_ok[domain] = mx_check(domain)
+                if not ok:
+                    invalid.append(raw)
+                    continue
+            address = address[:at + 1] + domain
+        remember(folded)
+        valid.append(address if key is None else {**recipient, key: address})
+    return ValidationResult(valid, invalid, duplicates)
+
+def validate_phones(phones, default_country_code=None):
+    """Canonicalize phone numbers to E.164 and de-duplicate them in one pass"""
+    numbers = _scan_lines(phones, _split_phones, lambda phone: _PHONE_SEPARATORS.sub('', phone))
+
+    valid, invalid, duplicates = [], [], []
+    seen = set()
+    remember = seen.add
+    for phone, number in zip(phones, numbers):
+        # Fast path for numbers already written as +<digits>; anything else goes through _e164
+        if not (number[:1] == '+' and number[1:].isdigit() and number.isascii()
+                and 8 <= len(number) <= 16 and number[1] != '0'):
+            number = _e164(number, default_country_code)
+            if number is None:
+                invalid.append(phone)
+                continue
+        if number in seen:
+            duplicates.append(phone)
+            continue
+        remember(number)
+        valid.append(number)
+    return ValidationResult(valid, invalid, duplicates)
+
+def has_mx_record(domain):
+    """DNS MX lookup via dnspython; True (unchecked) when it is not installed"""
+    if dns is None:
+        return True
+    try:
+        return bool(dns.resolver.resolve(domain, 'MX', lifetime=3.0))
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.NoNameservers):
+        return False
+    except dns.exception.Timeout:
+        # Unknown rather than bad; do not reject the address
+        return True
+
+class MXCache:
+    """Memoizes per-domain MX lookups with a TTL; usable as the mx_check of validate_emails"""
+
+    def __init__(self, resolver=has_mx_record, ttl=3600, max_size=10000):
+        self.resolver = resolver
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, domain):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(domain)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        result = self.resolver(domain)
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                self._entries.clear()
+            self._entries[domain] = (result, now + self.ttl)
+        return result
+
+_mx_cache = None
+
+def get_mx_cache():
+    """Process-wide MX cache shared by all requests"""
+    global _mx_cache
+    if _mx_cache is None:
+        _mx_cache = MXCache()
+    return _mx_cache
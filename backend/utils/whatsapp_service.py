@@ -1,8 +1,118 @@
+import atexit
+import threading
+
+import requests
+from flask import current_app, has_app_context
+from requests.adapters import HTTPAdapter
+
+from utils.send_scheduler import PermanentSendError, TransientSendError
+
+# Placeholder credentials from env.example mean "demo mode": nothing is actually sent
+DEMO_WHATSAPP_API_KEY = 'your-whatsapp-api-key'
+DEMO_WHATSAPP_PHONE_NUMBER = 'your-whatsapp-phone-number'
+
+# Throttling and provider-side errors worth retrying
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# The Cloud API rejects longer text bodies
+MAX_TEXT_LENGTH = 4096
+
+# Process-wide HTTP sessions, one per WhatsApp account, so connections stay alive between sends
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(account, size=10):
+    """Return the shared keep-alive session for an account, with up to `size` pooled connections"""
+    with _sessions_lock:
+        session = _sessions.get(account)
+        if session is None:
+            session = _sessions[account] = requests.Session()
+            # Retries are left to the send scheduler, which backs off and respects rate limits
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size, max_retries=0)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        return session
+
+
+def close_all_sessions():
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+atexit.register(close_all_sessions)
+
+
+def format_whatsapp_message(template):
+    """Plain-text invitation for WhatsApp, which cannot render the HTML body"""
+    lines = [f"*{template.meeting_topic or template.title}*"]
+    if template.speaker_name:
+        lines.append(f"Speaker: {template.speaker_name}")
+    if template.meeting_date:
+        when = template.meeting_date.strftime('%A, %B %d, %Y')
+        if template.meeting_time:
+            when += f" at {template.meeting_time.strftime('%H:%M')}"
+        lines.append(f"When: {when}")
+    if template.duration:
+        lines.append(f"Duration: {template.duration}")
+    if template.location:
+        lines.append(f"Where: {template.location}")
+    if template.meeting_link:
+        lines.append(f"Join: {template.meeting_link}")
+    return '\n'.join(lines)[:MAX_TEXT_LENGTH]
+
+
+def has_whatsapp_credentials(api_key, phone_number_id):
+    return bool(api_key and phone_number_id and api_key != DEMO_WHATSAPP_API_KEY
+                and phone_number_id != DEMO_WHATSAPP_PHONE_NUMBER)
+
+
+class WhatsAppChannel:
+    """Sends (phone_number, text) payloads through the WhatsApp Business Cloud API"""
+
+    def __init__(self, api_key=None, phone_number_id=None, api_url=None, timeout=None, session=None):
+        settings = current_app.config if has_app_context() else {}
+        self.api_key = api_key or settings.get('WHATSAPP_API_KEY')
+        self.phone_number_id = phone_number_id or settings.get('WHATSAPP_PHONE_NUMBER')
+        self.api_url = api_url or settings.get('WHATSAPP_API_URL', 'https://graph.facebook.com/v18.0')
+        self.timeout = timeout or settings.get('WHATSAPP_TIMEOUT', 10)
+        self.live = has_whatsapp_credentials(self.api_key, self.phone_number_id)
+        self.account = self.phone_number_id if self.live else None
+        self._http = session or get_session(self.account, settings.get('WHATSAPP_SEND_CONCURRENCY', 10))
+
+    def send(self, payload):
+        phone_number, text = payload
+        if not self.live:
+            return {'message_id': None, 'message': 'WhatsApp message sent successfully (demo mode)'}
+        try:
+            response = self._http.post(
+                f"{self.api_url}/{self.phone_number_id}/messages",
+                headers={'Authorization': f'Bearer {self.api_key}'},
+                json={'messaging_product': 'whatsapp', 'to': phone_number.lstrip('+'),
+                      'type': 'text', 'text': {'body': text}},
+                timeout=self.timeout
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise TransientSendError(f'WhatsApp API unreachable: {e}') from e
+
+        if response.status_code >= 400:
+            error = f'WhatsApp API error {response.status_code}: {response.text[:200]}'
+            if response.status_code in TRANSIENT_STATUS_CODES:
+                retry_after = response.headers.get('Retry-After')
+                raise TransientSendError(error, float(retry_after) if retry_after and retry_after.isdigit() else None)
+            raise PermanentSendError(error)
+
+        messages = response.json().get('messages') or [{}]
+        return {'message_id': messages[0].get('id'), 'message': 'WhatsApp message sent successfully'}
+
+
 def send_whatsapp_message(phone_number, message):
-    """Send WhatsApp message (demo implementation)"""
+    """Send one WhatsApp message (demo mode without credentials)"""
     try:
-        # In production, you'd integrate with WhatsApp Business API
-        # For demo purposes, we'll just return success
-        return {"success": True, "message": "WhatsApp message sent successfully (demo mode)"}
+        result = WhatsAppChannel().send((phone_number, message))
+        return {"success": True, "message": result['message']}
     except Exception as e:
-        return {"success": False, "message": str(e)} 
\ No newline at end of file
+        return {"success": False, "message": str(e)}
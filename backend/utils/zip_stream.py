@@ -0,0 +1,99 @@
+import struct
+import tempfile
+import time
+import zlib
+
+# Output is yielded in chunks of about this many bytes
+ZIP_CHUNK_SIZE = 64 * 1024
+
+# Central directory records stay in memory up to this size, then spill to disk
+DIRECTORY_SPOOL_SIZE = 1024 * 1024
+
+_LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+_CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+_ZIP64_OFFSET = struct.Struct('<HHQ')
+_ZIP64_END = struct.Struct('<IQHHIIQQQQ')
+_ZIP64_LOCATOR = struct.Struct('<IIQI')
+_END = struct.Struct('<IHHHHIIH')
+
+_UTF8_NAMES = 0x800
+_ZIP_VERSION = 20
+_ZIP64_VERSION = 45
+_MAX_16 = 0xFFFF
+_MAX_32 = 0xFFFFFFFF
+
+
+def _dos_datetime(timestamp):
+    t = time.localtime(timestamp)
+    return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+
+def _deflate(data):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def iter_zip(entries, compress=True, chunk_size=ZIP_CHUNK_SIZE, timestamp=None):
+    """Yield a ZIP archive of (name, bytes) entries in chunks, one entry in memory at a time.
+
+    Each entry is compressed whole, so its local header carries the real CRC
+    and sizes and the output never needs seeking. The central directory is
+    written to a spooled temporary file as entries go by and streamed at the
+    end; ZIP64 end records are added past 65535 entries or 4 GB.
+    """
+    dos_time, dos_date = _dos_datetime(timestamp or time.time())
+    method = zlib.DEFLATED if compress else 0
+    offset = count = 0
+    chunks, buffered = [], 0
+
+    with tempfile.SpooledTemporaryFile(max_size=DIRECTORY_SPOOL_SIZE) as directory:
+        for name, data in entries:
+            if len(data) >= _MAX_32:
+                raise ValueError(f'ZIP entry too large: {name}')
+            encoded_name = name.encode('utf-8')
+            crc = zlib.crc32(data)
+            payload = _deflate(data) if compress else data
+
+            if offset >= _MAX_32:
+                version, header_offset, extra = _ZIP64_VERSION, _MAX_32, _ZIP64_OFFSET.pack(1, 8, offset)
+            else:
+                version, header_offset, extra = _ZIP_VERSION, offset, b''
+            directory.write(_CENTRAL_HEADER.pack(
+                0x02014b50, version, version, _UTF8_NAMES, method, dos_time, dos_date, crc,
+                len(payload), len(data), len(encoded_name), len(extra), 0, 0, 0, 0, header_offset
+            ) + encoded_name + extra)
+
+            header = _LOCAL_HEADER.pack(
+                0x04034b50, version, _UTF8_NAMES, method, dos_time, dos_date, crc,
+                len(payload), len(data), len(encoded_name), 0
+            )
+            chunks += (header, encoded_name, payload)
+            size = len(header) + len(encoded_name) + len(payload)
+            offset += size
+            buffered += size
+            count += 1
+            if buffered >= chunk_size:
+                yield b''.join(chunks)
+                chunks, buffered = [], 0
+
+        if chunks:
+            yield b''.join(chunks)
+
+        directory_size = directory.tell()
+        directory.seek(0)
+        while True:
+            block = directory.read(chunk_size)
+            if not block:
+                break
+            yield block
+
+    directory_offset = offset
+    end_offset = directory_offset + directory_size
+    if count >= _MAX_16 or directory_offset >= _MAX_32 or directory_size >= _MAX_32:
+        yield _ZIP64_END.pack(
+            0x06064b50, _ZIP64_END.size - 12, _ZIP64_VERSION, _ZIP64_VERSION, 0, 0,
+            count, count, directory_size, directory_offset
+        ) + _ZIP64_LOCATOR.pack(0x07064b50, 0, end_offset, 1)
+        yield _END.pack(0x06054b50, 0, 0, _MAX_16, _MAX_16, _MAX_32, _MAX_32, 0)
+    else:
+        yield _END.pack(0x06054b50, 0, 0, count, count, directory_size, directory_offset, 0)